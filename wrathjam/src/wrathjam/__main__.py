@@ -1,4 +1,20 @@
-from wrathjam.app import main
+import sys
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["bench"]:
+        from wrathjam import bench
+
+        bench.main(sys.argv[2:])
+    elif sys.argv[1:2] == ["sweep"]:
+        from wrathjam import sweep
+
+        sweep.main(sys.argv[2:])
+    else:
+        if "--profile-startup" in sys.argv:
+            # Before anything else is imported, so it's all timed.
+            from wrathjam import startup
+
+            startup.begin()
+        from wrathjam.app import main
+
+        main(sys.argv[1:])
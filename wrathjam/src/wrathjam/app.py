@@ -2,24 +2,101 @@
 A top down shooter about using your anger.
 """
 
+import argparse
 import os
 import sys
 
-try:
-    from importlib import metadata as importlib_metadata
-except ImportError:
-    # Backwards compatibility - importlib.metadata was added in Python 3.8
-    import importlib_metadata
-
 import ppb
 import pathunstrom_splash as splash
+from ppb.assetlib import AssetLoadingSystem
+from ppb.systems import EventPoller
+from ppb.systems import SoundController
 
+# Only what the splash screen needs is imported here. Everything else is
+# named, and imported once the first frame is up (see
+# `systems.startup.StartupSystem`).
 from wrathjam.scenes import main_menu
-from wrathjam.systems import controller
-from wrathjam import controls
+from wrathjam.systems import particles
+from wrathjam.systems import simulation
+from wrathjam.systems import startup
+from wrathjam import assets
+
+DEFERRED_SYSTEMS = [
+    "wrathjam.systems.profiler:ProfilerSystem",
+    "wrathjam.systems.clock:ClockSystem",
+    "wrathjam.systems.controller:ControllerSystem",
+    "wrathjam.systems.world:WorldSystem",
+    "wrathjam.systems.navigation:NavigationSystem",
+    "wrathjam.systems.ai:AISystem",
+    "wrathjam.systems.attacks:AttackSystem",
+    "wrathjam.systems.hurtboxes:HurtboxSystem",
+    "wrathjam.systems.collision:CollisionSystem",
+    "wrathjam.systems.ledger:LedgerSystem",
+    "wrathjam.systems.routing:RoutingSystem",
+    "wrathjam.systems.culling:CullingSystem",
+    "wrathjam.systems.coalescing:CoalescingSystem",
+]
+DEFERRED_KWARGS = {
+    "inputs": "wrathjam.controls:inputs",
+    "ai_target_kind": "wrathjam.player:Sprite",
+    "world_focus_kind": "wrathjam.player:Sprite",
+}
 
 
-def main():
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m wrathjam")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        metavar="OUTPUT",
+        help="Report import and start up times up to the first frame, on "
+        "stderr or as JSON to OUTPUT.",
+    )
+    parser.add_argument(
+        "--quit-after-startup",
+        action="store_true",
+        help="Quit as soon as the game has started.",
+    )
+    parser.add_argument(
+        "--load-eagerly",
+        action="store_true",
+        help="Load every system before the first frame.",
+    )
+    parser.add_argument(
+        "--simulation-rate",
+        type=float,
+        default=60,
+        metavar="HZ",
+        help="Simulation steps per second, however fast frames are drawn.",
+    )
+    parser.add_argument(
+        "--threaded-simulation",
+        action="store_true",
+        help="Step the simulation on its own thread, so slow frames don't "
+        "hold it up.",
+    )
+    parser.add_argument(
+        "--no-interpolation",
+        dest="interpolate",
+        action="store_false",
+        help="Draw the latest simulation step as is.",
+    )
+    parser.add_argument(
+        "--record-inputs",
+        metavar="PATH",
+        help="Record every physical input to PATH (see wrathjam.replay).",
+    )
+    parser.add_argument(
+        "--replay-inputs",
+        metavar="PATH",
+        help="Play back the inputs recorded in PATH.",
+    )
+    return parser
+
+
+def main(argv=None):
+    options = parser().parse_args(argv)
     # Linux desktop environments use app's .desktop file to integrate the app
     # to their application menus. The .desktop file of this app will include
     # StartupWMClass key, set to app's formal name, which helps associate
@@ -29,17 +106,49 @@ def main():
     # property set to match the value set in app's desktop file. For PPB this
     # is set using environment variable.
 
-    # Find the name of the module that was used to start the app
-    app_module = sys.modules["__main__"].__package__
-    # Retrieve the app's metadata
-    metadata = importlib_metadata.metadata(app_module)
+    # Only X11 reads it, so other platforms skip the (slow to import)
+    # metadata lookup.
+    if sys.platform.startswith("linux") and "SDL_VIDEO_X11_WMCLASS" not in os.environ:
+        try:
+            from importlib import metadata as importlib_metadata
+        except ImportError:
+            # Backwards compatibility - importlib.metadata was added in Python 3.8
+            import importlib_metadata
+
+        # Find the name of the module that was used to start the app
+        app_module = sys.modules["__main__"].__package__
+        # Retrieve the app's metadata
+        metadata = importlib_metadata.metadata(app_module)
 
-    os.environ["SDL_VIDEO_X11_WMCLASS"] = metadata["Formal-Name"]
+        os.environ["SDL_VIDEO_X11_WMCLASS"] = metadata["Formal-Name"]
 
     ppb.run(
         starting_scene=splash.Splash(next_scene=main_menu.Scene),
         title="Wrath Jam",
         resolution=(1600, 900),
-        systems=[controller.ControllerSystem],
-        inputs=controls.inputs,
+        # ppb's defaults, with a renderer that draws hurtboxes in batches
+        # and an updater that steps at a fixed rate.
+        basic_systems=(
+            particles.ParticleRenderer,
+            simulation.FixedStepUpdater,
+            EventPoller,
+            SoundController,
+            AssetLoadingSystem,
+        ),
+        systems=[assets.AssetSystem, startup.StartupSystem],
+        deferred_systems=DEFERRED_SYSTEMS,
+        deferred_kwargs=DEFERRED_KWARGS,
+        load_eagerly=options.load_eagerly,
+        splash_scenes=(splash.Splash,),
+        startup_report=options.profile_startup,
+        quit_after_startup=options.quit_after_startup,
+        preload_scenes=[main_menu.Scene, "wrathjam.scenes.sandbox:Scene"],
+        particle_rendering=True,
+        simulation_rate=options.simulation_rate,
+        threaded_simulation=options.threaded_simulation,
+        interpolate_rendering=options.interpolate,
+        record_inputs=options.record_inputs,
+        replay_inputs=options.replay_inputs,
+        # Set WRATHJAM_PROFILE to a file name to record dispatch timings.
+        profile_output=os.environ.get("WRATHJAM_PROFILE"),
     )
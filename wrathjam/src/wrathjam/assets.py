@@ -0,0 +1,196 @@
+"""
+The game's assets, declared in one place and loaded on demand.
+
+Nothing is built at import time. `registry.asset(name)` builds an asset the
+first time it's asked for, `AssetSystem` preloads everything scenes
+declare in their `assets` attribute on a background thread while the
+splash screen runs, and keeps assets referenced while a scene that
+declared them is running.
+"""
+
+import io
+import logging
+import threading
+from time import perf_counter
+from typing import Callable, Iterable
+
+import ppb
+from ppb import events
+from ppb import vfs
+from ppb.systemslib import System
+
+from wrathjam import startup
+
+__all__ = ["AssetRegistry", "AssetSystem", "Lazy", "registry"]
+
+FONT = "wrathjam/resources/EvilEmpire-4BBVK.ttf"
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_bytes(asset) -> int:
+    """
+    Rough memory held by a loaded asset: pixel data for images, file size for
+    fonts.
+    """
+    if isinstance(asset, ppb.Font):
+        with vfs.open(asset.name) as file:
+            return file.seek(0, io.SEEK_END)
+    loaded = asset.load()
+    contents = getattr(loaded, "contents", None)
+    if contents is not None and hasattr(contents, "pitch"):
+        return contents.pitch * contents.h
+    if isinstance(loaded, (bytes, bytearray)):
+        return len(loaded)
+    return 0
+
+
+class AssetRegistry:
+    """
+    Named asset factories with lazily built, reference counted instances.
+    """
+
+    def __init__(self):
+        self.factories: dict[str, Callable] = {}
+        self.instances: dict = {}
+        self.references: dict[str, int] = {}
+        self.load_seconds: dict[str, float] = {}
+        self.lock = threading.RLock()
+
+    def declare(self, name: str, factory: Callable) -> None:
+        self.factories[name] = factory
+
+    def asset(self, name: str):
+        """
+        The asset called name, building it if needed. Doesn't wait for it to
+        finish loading.
+        """
+        try:
+            return self.instances[name]
+        except KeyError:
+            pass
+        with self.lock:
+            if name not in self.instances:
+                self.instances[name] = self.factories[name]()
+            return self.instances[name]
+
+    def load(self, name: str):
+        """
+        The asset called name, waiting until it's ready to use.
+        """
+        asset = self.asset(name)
+        if name not in self.load_seconds:
+            start = perf_counter()
+            asset.load()
+            self.load_seconds.setdefault(name, perf_counter() - start)
+        return asset
+
+    def acquire(self, names: Iterable[str]) -> None:
+        with self.lock:
+            for name in names:
+                self.references[name] = self.references.get(name, 0) + 1
+                self.asset(name)
+
+    def release(self, names: Iterable[str]) -> None:
+        """
+        Drop a reference. Assets nobody references are forgotten, so ppb can
+        free them once nothing else holds them.
+        """
+        with self.lock:
+            for name in names:
+                count = self.references[name] - 1
+                if count:
+                    self.references[name] = count
+                else:
+                    del self.references[name]
+                    self.instances.pop(name, None)
+                    self.load_seconds.pop(name, None)
+
+    def preload(self, names: Iterable[str]) -> threading.Thread:
+        """
+        Build and load the named assets on a background thread.
+
+        names is only iterated on the thread, so it can be a lazy iterable
+        that does slow work of its own. Once they're loaded, `report()` is
+        logged at debug level.
+        """
+
+        def work():
+            for name in dict.fromkeys(names):
+                self.load(name)
+            if logger.isEnabledFor(logging.DEBUG):
+                for line in self.report():
+                    logger.debug("Asset %s: %s", line["name"], line)
+
+        thread = threading.Thread(target=work, name="asset-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> list[dict]:
+        return [
+            {
+                "name": name,
+                "references": self.references.get(name, 0),
+                "load_seconds": self.load_seconds.get(name),
+                "bytes": estimate_bytes(asset) if asset.is_loaded() else None,
+            }
+            for name, asset in list(self.instances.items())
+        ]
+
+
+registry = AssetRegistry()
+registry.declare("title_font", lambda: ppb.Font(FONT, size=256))
+registry.declare("ui_font", lambda: ppb.Font(FONT, size=64))
+registry.declare(
+    "title_text",
+    lambda: ppb.Text("WRATH", font=registry.asset("title_font"), color=(14, 0, 51)),
+)
+registry.declare("player", lambda: ppb.Circle(100, 175, 50))
+registry.declare("hurtbox", lambda: ppb.Square(200, 50, 50))
+registry.declare("enemy", lambda: ppb.Circle(200, 80, 40))
+
+
+class Lazy:
+    """
+    A class attribute that resolves to a registry asset on first access.
+
+    Instances can still override it by assignment.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        return registry.asset(self.name)
+
+
+class AssetSystem(System):
+    """
+    Loads the assets scenes declare in their `assets` attribute.
+
+    On the first scene (the splash) it preloads the assets of every scene in
+    `preload_scenes`. Afterwards each scene holds a reference to its assets
+    while it is running.
+
+    Preload scenes can be named as ``"package.module:Class"`` (see
+    `startup.resolve`), in which case they're imported on the preload
+    thread rather than before the first frame.
+    """
+
+    def __init__(self, *, preload_scenes: Iterable = (), **kwargs):
+        super().__init__(**kwargs)
+        self.preload_scenes = list(preload_scenes)
+        self.preloading = None
+
+    def on_scene_started(self, event: events.SceneStarted, signal):
+        if self.preloading is None:
+            names = (
+                name
+                for scene in self.preload_scenes
+                for name in startup.resolve(scene).assets
+            )
+            self.preloading = registry.preload(names)
+        registry.acquire(getattr(event.scene, "assets", ()))
+
+    def on_scene_stopped(self, event: events.SceneStopped, signal):
+        registry.release(getattr(event.scene, "assets", ()))
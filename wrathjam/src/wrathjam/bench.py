@@ -0,0 +1,288 @@
+"""
+Headless benchmark of the game loop.
+
+Runs `scenes.sandbox.Scene` without a window or renderer, stepping a fixed
+number of Updates as fast as possible, and prints a JSON report::
+
+    python -m wrathjam bench --frames 600 --attackers 20 --hurtboxes 1000
+
+The game's systems run in the game's fixed order, so a run is reproducible
+from its seed, and replaying an input log with `--replay` reproduces the
+session it was recorded in. `--check-determinism` runs twice and fails if
+the runs end in different states.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+import ppb
+from ppb import events
+from ppb.assetlib import AssetLoadingSystem
+
+from wrathjam import app
+from wrathjam import assets
+from wrathjam import clock as simulation_clock
+from wrathjam import damage
+from wrathjam import enemies
+from wrathjam import ledger as damage_ledger
+from wrathjam import player
+from wrathjam import pools
+from wrathjam import snapshot
+from wrathjam.scenes import sandbox
+from wrathjam.systems import ai
+from wrathjam.systems import attacks
+from wrathjam.systems import coalescing
+from wrathjam.systems import profiler
+from wrathjam.systems import startup
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows.
+    resource = None
+
+ARENA = 25
+
+
+class Turret(ppb.Sprite):
+    """
+    A stationary attacker that sweeps around and fires as often as it can.
+
+    Firing is left to its auto firing slot in the scene's attack table.
+    """
+
+    image = None
+    turn_rate = 90
+    attack = damage.RapidFire(-26, 26, 2)
+
+    def on_update(self, event, signal):
+        self.rotate(self.turn_rate * event.time_delta)
+
+
+class Dummy(damage.Damageable, ppb.Sprite):
+    """
+    A target that stands still and takes hits.
+    """
+
+    image = None
+
+
+def get_system(engine: ppb.GameEngine, kind: type):
+    """
+    The game system of type kind, run by the engine's `StartupSystem`.
+    """
+    (starter,) = (
+        child for child in engine.children if isinstance(child, startup.StartupSystem)
+    )
+    (system,) = (child for child in starter.systems if isinstance(child, kind))
+    return system
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def populate(scene: ppb.Scene, options: argparse.Namespace) -> None:
+    def anywhere():
+        return ppb.Vector(random.uniform(-ARENA, ARENA), random.uniform(-ARENA, ARENA))
+
+    # The sandbox already has one player.
+    for _ in range(options.players - 1):
+        scene.add(player.Sprite(position=anywhere()))
+    table = attacks.get_table(scene)
+    for _ in range(options.attackers):
+        turret = scene.add(Turret(position=anywhere(), rotation=random.uniform(0, 360)))
+        table.add(turret, turret.attack, auto_fire=True)
+    for _ in range(options.enemies):
+        enemies.spawn(scene, position=anywhere())
+    for _ in range(options.targets):
+        scene.add(Dummy(position=anywhere(), size=1))
+    source = ppb.Sprite()
+    attack = damage.RapidFire(-26, 26, 2)
+    life_span = options.frames * options.time_step * options.time_scale * 2
+    for _ in range(options.hurtboxes):
+        attack.spawn_hurtbox(
+            source,
+            scene,
+            position=anywhere(),
+            final_position=anywhere(),
+            life_span=life_span,
+            size=0.5,
+            grow_end=0.6,
+        )
+
+
+def run(options: argparse.Namespace) -> dict:
+    random.seed(options.seed)
+    # The firing log would dominate the timings.
+    damage.DEBUG = False
+
+    first_scene = sandbox.Scene
+    if options.snapshot:
+        first_scene = snapshot.load(options.snapshot)
+    engine = ppb.GameEngine(
+        first_scene,
+        # Assets still load (and must, or their loader threads never finish),
+        # but nothing opens a window or draws.
+        basic_systems=(AssetLoadingSystem,),
+        # The game's systems, in the game's fixed order: ppb keeps its own
+        # systems in a set, so their order would change from run to run.
+        systems=[assets.AssetSystem, startup.StartupSystem],
+        deferred_systems=app.DEFERRED_SYSTEMS,
+        deferred_kwargs=app.DEFERRED_KWARGS,
+        load_eagerly=True,
+        replay_inputs=options.replay,
+        ai_budget=options.ai_budget / 1000,
+        profile=True,
+        profile_output=options.profile,
+        profile_overlay=False,
+    )
+    frame_times = []
+    with engine:
+        profiling = get_system(engine, profiler.ProfilerSystem).profiler
+        coalescer = get_system(engine, coalescing.CoalescingSystem)
+        ai_system = get_system(engine, ai.AISystem)
+        engine.start()
+        while engine.events:
+            engine.publish()
+        simulation_clock.get_clock(engine.current_scene).time_scale = options.time_scale
+        if not options.snapshot:
+            populate(engine.current_scene, options)
+        if options.save_snapshot:
+            snapshot.save(engine.current_scene, options.save_snapshot)
+        # Finish background loading before timing anything. It also keeps
+        # ppb from cancelling the font load on exit, which would leave its
+        # loader thread waiting forever.
+        for name in sandbox.Scene.assets:
+            assets.registry.load(name)
+        profiling.clear()
+
+        if options.trace_memory:
+            tracemalloc.start()
+        for _ in range(options.frames):
+            start = perf_counter()
+            engine.signal(events.Update(options.time_step))
+            while engine.events:
+                engine.publish()
+            frame_times.append(perf_counter() - start)
+        if options.trace_memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        now = simulation_clock.get_clock(engine.current_scene).now
+        final_state = snapshot.capture(engine.current_scene).to_bytes()
+
+    ordered = sorted(frame_times)
+    timings = profiling.totals()
+    report = {
+        "config": vars(options),
+        "frames": len(frame_times),
+        "frame_ms": {
+            "mean": sum(frame_times) / len(frame_times) * 1000,
+            "p50": percentile(ordered, 0.50) * 1000,
+            "p95": percentile(ordered, 0.95) * 1000,
+            "p99": percentile(ordered, 0.99) * 1000,
+            "max": ordered[-1] * 1000,
+        },
+        "events_ms": {
+            name: totals["total_seconds"] * 1000
+            for name, totals in timings["events"].items()
+        },
+        "handlers": {
+            name: {
+                "calls": totals["calls"],
+                "total_ms": totals["total_seconds"] * 1000,
+                "mean_us": totals["total_seconds"] / totals["calls"] * 1e6,
+                "max_us": totals["max_seconds"] * 1e6,
+            }
+            for name, totals in timings["handlers"].items()
+        },
+        "live_objects": len(engine.current_scene.children),
+        "pools": pools.report(engine.current_scene),
+        "coalesced_events": coalescer.stats(),
+        "ai": ai_system.stats(now),
+        "world": engine.current_scene.world.stats(),
+        "damage": damage_ledger.get_ledger(engine.current_scene).stats(),
+        # Equal for runs that end in the same state.
+        "state_digest": hashlib.sha256(final_state).hexdigest(),
+    }
+    if resource is not None:
+        # ru_maxrss is kilobytes on Linux and bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        report["peak_rss_bytes"] = (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        )
+    if options.trace_memory:
+        report["peak_traced_bytes"] = peak_traced
+    return report
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m wrathjam bench", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--time-step", type=float, default=0.016)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1,
+        help="Simulated seconds per second of time step.",
+    )
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--attackers", type=int, default=0)
+    parser.add_argument("--hurtboxes", type=int, default=0)
+    parser.add_argument("--targets", type=int, default=0)
+    parser.add_argument("--enemies", type=int, default=0)
+    parser.add_argument(
+        "--ai-budget",
+        type=float,
+        default=2,
+        help="Milliseconds per frame for ticking enemy behaviour trees.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", help="An input log to play back.")
+    parser.add_argument(
+        "--check-determinism",
+        action="store_true",
+        help="Run twice and fail unless both runs end in the same state.",
+    )
+    parser.add_argument(
+        "--snapshot", help="Start from this snapshot instead of populating."
+    )
+    parser.add_argument(
+        "--save-snapshot", help="Write a snapshot of the starting state here."
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure peak Python allocations with tracemalloc (slower).",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Also write the dispatch samples here (.json for a Chrome trace).",
+    )
+    parser.add_argument("--output", help="Write the report here instead of stdout.")
+    return parser
+
+
+def main(argv=None):
+    options = parser().parse_args(argv)
+    report = run(options)
+    if options.check_determinism:
+        again = run(options)
+        compared = ("state_digest", "damage", "live_objects")
+        differ = [key for key in compared if report[key] != again[key]]
+        if differ:
+            sys.exit(f"Two runs ended differently: {', '.join(differ)} differ.")
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,112 @@
+"""
+Compare dispatching Update and PreRender to every object with culling the
+ones off camera through `systems.culling.CullingSystem`, as a scene of
+drifting sprites grows.
+
+The sprites are spread over an arena ARENA units across, viewed by a
+camera as wide as the sandbox's. Half of them opt in to updating less
+often off screen.
+
+Run with ``python -m wrathjam.benchmarks.culling``.
+"""
+
+import random
+import timeit
+
+import ppb
+from ppb import events
+from ppb.camera import Camera
+
+from wrathjam import culling
+from wrathjam import routing
+from wrathjam.systems.clock import ClockSystem
+from wrathjam.systems.culling import CullingSystem
+
+OBJECT_COUNTS = (100, 1_000, 10_000)
+ARENA = 200
+CAMERA_WIDTH = 50
+FRAMES = 30
+REPEAT = 3
+TIME_STEP = 1 / 60
+
+
+class Drifter(ppb.Sprite):
+    image = None
+    velocity = ppb.Vector(0, 0)
+    facing = ppb.Vector(0, 1)
+
+    def on_update(self, event, signal):
+        self.position += self.velocity * culling.elapsed(self, event)
+
+    def on_pre_render(self, event, signal):
+        if self.velocity:
+            self.facing = self.velocity.normalize()
+
+
+class LazyDrifter(Drifter):
+    off_screen_update_interval = 0.25
+
+
+def build_engine(objects: int, systems) -> ppb.GameEngine:
+    engine = ppb.GameEngine(
+        routing.RoutedScene, basic_systems=(), systems=systems, scene_kwargs={}
+    )
+    engine.__enter__()
+    engine.start()
+    while engine.events:
+        engine.publish()
+    scene = engine.current_scene
+    scene.main_camera = Camera(None, CAMERA_WIDTH, (1600, 900))
+    rng = random.Random(objects)
+    for index in range(objects):
+        kind = LazyDrifter if index % 2 else Drifter
+        scene.add(
+            kind(
+                position=ppb.Vector(
+                    rng.uniform(-ARENA / 2, ARENA / 2),
+                    rng.uniform(-ARENA / 2, ARENA / 2),
+                ),
+                velocity=ppb.Vector(0, 1).rotate(rng.uniform(0, 360)),
+            )
+        )
+    return engine
+
+
+def best_per_frame(engine: ppb.GameEngine) -> float:
+    def frames():
+        for _ in range(FRAMES):
+            engine.signal(events.Update(TIME_STEP))
+            engine.signal(events.PreRender(TIME_STEP))
+            while engine.events:
+                engine.publish()
+
+    return min(timeit.repeat(frames, number=1, repeat=REPEAT)) / FRAMES
+
+
+def main():
+    print(
+        f"{'objects':>8}{'everything':>14}{'culled':>14}{'speedup':>10}"
+        f"{'visible':>10}{'culled':>10}{'deferred':>10}"
+    )
+    for objects in OBJECT_COUNTS:
+        everything = build_engine(objects, systems=(ClockSystem,))
+        culled = build_engine(objects, systems=(ClockSystem, CullingSystem))
+        everything_seconds = best_per_frame(everything)
+        culled_seconds = best_per_frame(culled)
+        visibility = culling.get_visibility(culled.current_scene)
+        stats = visibility.stats()
+        for engine in (everything, culled):
+            engine.__exit__(None, None, None)
+        print(
+            f"{objects:>8}"
+            f"{everything_seconds * 1e3:>11.2f} ms"
+            f"{culled_seconds * 1e3:>11.2f} ms"
+            f"{everything_seconds / culled_seconds:>9.1f}x"
+            f"{stats['visible_per_frame']:>10.0f}"
+            f"{stats['culled_per_frame']:>10.0f}"
+            f"{stats['deferred_updates'] / stats['frames']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the ways of evaluating easing curves: the `partial` chains from
+`wrathjam.utils`, their compiled lookup tables, and both over arrays.
+
+Run with ``python -m wrathjam.benchmarks.easing``.
+"""
+
+import random
+import timeit
+from functools import partial
+
+import numpy as np
+
+from wrathjam import easing, utils
+
+SAMPLES = 10_000
+REPEAT = 5
+
+
+def best_per_sample(statement, number=1):
+    seconds = min(timeit.repeat(statement, number=number, repeat=REPEAT))
+    return seconds / (number * SAMPLES)
+
+
+CURVES = {
+    "smoother_step": utils.smoother_step,
+    "mixed crossfades": partial(
+        utils.mix,
+        utils.smoother_step,
+        partial(utils.crossfade, utils.smooth_start_2, utils.smooth_stop_2),
+        0.3,
+    ),
+}
+
+
+def run(name, curve, times, time_array):
+    lookup = easing.compile_ease(curve)
+    results = {
+        "partial chain, scalar": best_per_sample(lambda: [curve(t) for t in times]),
+        "lookup table, scalar": best_per_sample(lambda: [lookup(t) for t in times]),
+        "partial chain, array": best_per_sample(
+            lambda: easing.evaluate(curve, time_array), number=100
+        ),
+        "lookup table, array": best_per_sample(
+            lambda: easing.evaluate(lookup, time_array), number=100
+        ),
+    }
+
+    print(name)
+    for label, seconds in results.items():
+        print(f"  {label:<24}{seconds * 1e9:>10.1f} ns/sample")
+    error = np.abs(lookup(time_array) - curve(time_array)).max()
+    print(f"  max lookup table error: {error:.2e}")
+
+
+def main():
+    times = [random.random() for _ in range(SAMPLES)]
+    time_array = np.asarray(times)
+    for name, curve in CURVES.items():
+        run(name, curve, times, time_array)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Compare sending every hit to its target as its own event with buffering a
+frame's hits in a `ledger.DamageLedger` and sending each target one
+`events.DamageTaken`, as the hits per target per frame grow.
+
+Each source fires a spread of pellets from one attack, like RapidFire, so
+pellets landing on the same target in the same frame also collapse into
+one contact in the ledger.
+
+Run with ``python -m wrathjam.benchmarks.ledger``.
+"""
+
+import timeit
+from dataclasses import dataclass
+
+import ppb
+
+from wrathjam import damage
+from wrathjam import events
+from wrathjam import ledger
+from wrathjam.systems.ledger import LedgerSystem
+
+TARGETS = 200
+SOURCES_PER_TARGET = 2
+HITS_PER_TARGET = (1, 4, 16)
+FRAMES = 30
+REPEAT = 3
+
+
+@dataclass
+class Hit:
+    """
+    One hurtbox touching one target, sent straight to the target.
+    """
+
+    damage: float
+    wrath: float
+    scene: ppb.Scene = None
+
+
+@dataclass
+class Pellet:
+    attack: damage.Attack
+    source: object
+
+
+class Target(damage.Damageable, ppb.Sprite):
+    image = None
+    damage_taken = 0
+    events_handled = 0
+
+    def on_hit(self, event, signal):
+        self.damage_taken += event.damage
+        self.events_handled += 1
+
+    def on_damage_taken(self, event, signal):
+        self.damage_taken += event.damage
+        self.events_handled += 1
+
+
+def build(hits_per_target: int):
+    engine = ppb.GameEngine(
+        ppb.Scene, basic_systems=(), systems=(LedgerSystem,), scene_kwargs={}
+    )
+    engine.__enter__()
+    engine.start()
+    while engine.events:
+        engine.publish()
+    scene = engine.current_scene
+    attack = damage.RapidFire(-26, 26, 2)
+    targets = [scene.add(Target()) for _ in range(TARGETS)]
+    sources = [object() for _ in range(SOURCES_PER_TARGET)]
+    contacts = [
+        (Pellet(attack, sources[index % SOURCES_PER_TARGET]), target)
+        for target in targets
+        for index in range(hits_per_target)
+    ]
+    return engine, contacts, targets
+
+
+def per_hit(engine, contacts):
+    signal = engine.signal
+    for _ in range(FRAMES):
+        for pellet, target in contacts:
+            signal(
+                Hit(pellet.attack.damage, pellet.attack.wrath_gain), targets=[target]
+            )
+        while engine.events:
+            engine.publish()
+
+
+def batched(engine, contacts):
+    signal = engine.signal
+    damage_ledger = ledger.get_ledger(engine.current_scene)
+    for _ in range(FRAMES):
+        for pellet, target in contacts:
+            damage_ledger.record(pellet, target, signal)
+        while engine.events:
+            engine.publish()
+
+
+def best_per_frame(run, engine, contacts) -> float:
+    return (
+        min(timeit.repeat(lambda: run(engine, contacts), number=1, repeat=REPEAT))
+        / FRAMES
+    )
+
+
+def main():
+    print(
+        f"{'hits/target':>12}{'per hit':>12}{'ledger':>12}{'speedup':>10}"
+        f"{'events (per hit)':>18}{'(ledger)':>10}"
+    )
+    for hits_per_target in HITS_PER_TARGET:
+        results = []
+        for run in (per_hit, batched):
+            engine, contacts, targets = build(hits_per_target)
+            seconds = best_per_frame(run, engine, contacts)
+            handled = sum(target.events_handled for target in targets)
+            results.append((seconds, handled / (FRAMES * REPEAT)))
+            engine.__exit__(None, None, None)
+        (per_hit_seconds, per_hit_events), (ledger_seconds, ledger_events) = results
+        print(
+            f"{hits_per_target:>12}"
+            f"{per_hit_seconds * 1e3:>9.2f} ms"
+            f"{ledger_seconds * 1e3:>9.2f} ms"
+            f"{per_hit_seconds / ledger_seconds:>9.1f}x"
+            f"{per_hit_events:>18.0f}"
+            f"{ledger_events:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Measure flow field pathfinding for crowds of 100, 1,000 and 10,000 agents
+chasing one target around an arena with scattered walls.
+
+For each crowd size it reports the cost of keeping the field current as
+the target walks (incremental rebuilds, plus one full rebuild for
+reference) and of every agent sampling its direction, one at a time and
+as one array lookup. For comparison it times a per-agent A* search on a
+few agents and scales that to the crowd.
+
+Run with ``python -m wrathjam.benchmarks.navigation``.
+"""
+
+import heapq
+import random
+import timeit
+
+import numpy as np
+import ppb
+
+from wrathjam import navigation
+
+AGENT_COUNTS = (100, 1_000, 10_000)
+SIZE = 100
+WALLS = 0.2
+STEPS = 200
+SEARCH_SAMPLE = 20
+REPEAT = 3
+
+
+def arena(rng: np.random.Generator) -> np.ndarray:
+    blocked = rng.random((SIZE, SIZE)) < WALLS
+    blocked[SIZE // 2 - 2 : SIZE // 2 + 2, :] = False
+    blocked[:, SIZE // 2 - 2 : SIZE // 2 + 2] = False
+    return blocked
+
+
+def walk(field: navigation.FlowField, start: ppb.Vector) -> list[ppb.Vector]:
+    """
+    A path for the target that wanders through open cells.
+    """
+    path = [start]
+    position = start
+    while len(path) < STEPS:
+        step = ppb.Vector(random.choice((-0.5, 0, 0.5)), random.choice((-0.5, 0, 0.5)))
+        moved = position + step
+        cell = field.cell(moved.x, moved.y)
+        if cell is not None and not field.blocked[cell]:
+            position = moved
+            path.append(position)
+    return path
+
+
+def a_star(field: navigation.FlowField, start: int, goal: int) -> int:
+    """
+    Steps from start to goal, the way a per-agent search would find them.
+    """
+    width = field.width
+    goal_row, goal_column = divmod(goal, width)
+    seen = {start: 0}
+    queue = [(0, 0, start)]
+    while queue:
+        _, steps, cell = heapq.heappop(queue)
+        if cell == goal:
+            return steps
+        for offset in (1, -1, width, -width):
+            neighbour = cell + offset
+            if field.blocked[neighbour] or seen.get(neighbour, steps + 2) <= steps + 1:
+                continue
+            seen[neighbour] = steps + 1
+            row, column = divmod(neighbour, width)
+            estimate = abs(row - goal_row) + abs(column - goal_column)
+            heapq.heappush(queue, (steps + 1 + estimate, steps + 1, neighbour))
+    return -1
+
+
+def best(statement, number=1) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=REPEAT)) / number
+
+
+def main():
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    blocked = arena(rng)
+
+    def new_field():
+        return navigation.FlowField(-SIZE / 2, -SIZE / 2, SIZE, SIZE, 1, blocked)
+
+    field = new_field()
+    path = walk(field, ppb.Vector(0.5, 0.5))
+    full = best(lambda: new_field().update(path[0]))
+
+    def follow():
+        field = new_field()
+        for target in path:
+            field.update(target)
+        return field
+
+    field = follow()
+    per_path = best(follow)
+    rebuilds = field.incremental_rebuilds + field.full_rebuilds
+
+    # Incremental updates must agree with building from scratch.
+    reference = new_field()
+    reference.update(path[-1])
+    assert np.array_equal(field.distance, reference.distance)
+    assert np.array_equal(field.directions, reference.directions)
+
+    print(f"grid {SIZE}x{SIZE}, {WALLS:.0%} walls")
+    print(f"  full rebuild: {full * 1000:.2f} ms")
+    print(
+        f"  following the target for {len(path)} frames: {rebuilds} rebuilds, "
+        f"{(per_path - full) / max(1, rebuilds - 1) * 1000:.2f} ms each"
+    )
+    print(
+        f"{'agents':>8}{'sample loop':>14}{'sample array':>14}"
+        f"{'A* per agent (est.)':>22}"
+    )
+    for agents in AGENT_COUNTS:
+        open_cells = np.flatnonzero(~field.blocked)
+        cells = rng.choice(open_cells, agents)
+        rows, columns = np.divmod(cells, field.width)
+        positions = np.column_stack(
+            (columns - 1 - SIZE / 2 + 0.5, rows - 1 - SIZE / 2 + 0.5)
+        )
+        vectors = [ppb.Vector(x, y) for x, y in positions.tolist()]
+        loop = best(lambda: [field.direction_at(vector) for vector in vectors])
+        array = best(lambda: field.directions_at(positions), number=10)
+        sample = cells[:SEARCH_SAMPLE].tolist()
+        search = best(lambda: [a_star(field, cell, field.goal) for cell in sample])
+        search *= agents / len(sample)
+        print(
+            f"{agents:>8}"
+            f"{loop * 1000:>11.2f} ms"
+            f"{array * 1000:>11.3f} ms"
+            f"{search * 1000:>19.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
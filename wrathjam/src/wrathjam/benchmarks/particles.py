@@ -0,0 +1,129 @@
+"""
+Compare drawing hurtboxes as one sprite each with drawing them as a batched
+particle layer through `systems.particles.ParticleRenderer`.
+
+Runs on SDL's dummy video driver and software renderer unless
+SDL_VIDEODRIVER says otherwise, so it works headless. Frame times there are
+mostly CPU rasterisation of the game sized projectiles, so each count is
+also run with one pixel projectiles: that frame time is what's left when
+filling costs nothing, the per sprite overhead a GPU renderer still pays.
+
+Run with ``python -m wrathjam.benchmarks.particles``.
+"""
+
+import os
+import random
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import ppb  # noqa: E402
+from ppb import events  # noqa: E402
+from ppb.assetlib import AssetLoadingSystem  # noqa: E402
+
+from wrathjam import assets  # noqa: E402
+from wrathjam import damage  # noqa: E402
+from wrathjam.systems.hurtboxes import HurtboxBatch  # noqa: E402
+from wrathjam.systems.particles import ParticleRenderer  # noqa: E402
+
+PROJECTILE_COUNTS = (100, 1_000, 5_000)
+FRAMES = 10
+REPEAT = 3
+RESOLUTION = (1600, 900)
+GAME_SIZE = 0.5
+
+
+def build_scene(
+    renderer: ParticleRenderer, projectiles: int, particles: bool, size: float
+):
+    scene = ppb.Scene()
+    renderer.on_scene_started(events.SceneStarted(scene=scene), None)
+    camera = scene.main_camera
+    batch = scene.hurtbox_batch = HurtboxBatch(particles=particles)
+    rng = random.Random(projectiles)
+    for _ in range(projectiles):
+        start = ppb.Vector(
+            rng.uniform(camera.left, camera.right),
+            rng.uniform(camera.bottom, camera.top),
+        )
+        hurtbox = scene.add(
+            damage.Hurtbox(
+                position=start,
+                final_position=start + ppb.Vector(0, 4).rotate(rng.uniform(0, 360)),
+                rotation=rng.uniform(0, 360),
+                size=size,
+                life_span=1e9,
+                visual="hurtbox",
+            )
+        )
+        batch.add(hurtbox)
+        hurtbox.on_pre_render(None, None)
+    return scene
+
+
+def measure(renderer: ParticleRenderer, projectiles: int, particles: bool, size: float):
+    scene = build_scene(renderer, projectiles, particles, size)
+    render = events.Render()
+    render.scene = scene
+    now = 0.0
+
+    def frames():
+        nonlocal now
+        for _ in range(FRAMES):
+            now += 1 / 60
+            scene.hurtbox_batch.update(now, scene)
+            renderer.on_render(render, None)
+
+    frames()
+    sprite_draws = renderer.sprite_draws
+    batch_draws = renderer.batch_draws
+    seconds = min(timeit.repeat(frames, number=1, repeat=REPEAT)) / FRAMES
+    draws = (
+        renderer.sprite_draws - sprite_draws + renderer.batch_draws - batch_draws
+    ) / (FRAMES * REPEAT)
+    renderer.on_scene_stopped(events.SceneStopped(scene=scene), None)
+    return draws, seconds
+
+
+def main():
+    engine = ppb.GameEngine(
+        ppb.Scene,
+        basic_systems=(ParticleRenderer, AssetLoadingSystem),
+        resolution=RESOLUTION,
+    )
+    with engine:
+        assets.registry.load("hurtbox")
+        renderer = next(
+            child for child in engine.children if isinstance(child, ParticleRenderer)
+        )
+        pixel = 1 / pixel_ratio(renderer)
+        print(f"{'':>12}{'one sprite each':>32}{'batched':>32}")
+        print(
+            f"{'projectiles':>12}{'draws':>8}{'frame':>12}{'1px frame':>12}"
+            f"{'draws':>8}{'frame':>12}{'1px frame':>12}"
+        )
+        for projectiles in PROJECTILE_COUNTS:
+            row = f"{projectiles:>12}"
+            for particles in (False, True):
+                draws, seconds = measure(renderer, projectiles, particles, GAME_SIZE)
+                _, fill_free = measure(renderer, projectiles, particles, pixel)
+                row += (
+                    f"{draws:>8.0f}"
+                    f"{seconds * 1000:>9.2f} ms"
+                    f"{fill_free * 1000:>9.2f} ms"
+                )
+            print(row)
+
+
+def pixel_ratio(renderer: ParticleRenderer) -> float:
+    """
+    Pixels per game unit for the renderer's cameras.
+    """
+    scene = ppb.Scene()
+    renderer.on_scene_started(events.SceneStarted(scene=scene), None)
+    renderer.on_scene_stopped(events.SceneStopped(scene=scene), None)
+    return scene.main_camera.pixel_ratio
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare broadcasting the routed game events with targeting them through
+`systems.routing.RoutingSystem`, as the number of uninterested objects in
+the scene grows.
+
+Run with ``python -m wrathjam.benchmarks.routing``.
+"""
+
+import timeit
+
+import ppb
+
+from wrathjam import events
+from wrathjam import routing
+from wrathjam.systems.routing import RoutingSystem
+
+OBJECT_COUNTS = (10, 100, 1_000, 10_000)
+SUBSCRIBERS = 3
+EVENTS = 100
+REPEAT = 5
+
+
+class Listener(ppb.Sprite):
+    image = None
+    wrath = 0
+
+    def on_wrath_changed(self, event, signal):
+        self.wrath = event.wrath
+
+
+class Bystander(ppb.Sprite):
+    image = None
+
+
+def build_engine(objects: int, systems) -> ppb.GameEngine:
+    def setup(scene):
+        for _ in range(SUBSCRIBERS):
+            scene.add(Listener())
+        for _ in range(objects):
+            scene.add(Bystander())
+
+    engine = ppb.GameEngine(
+        routing.RoutedScene, basic_systems=(), systems=systems, scene_kwargs={}
+    )
+    engine.__enter__()
+    engine.start()
+    setup(engine.current_scene)
+    while engine.events:
+        engine.publish()
+    return engine
+
+
+def best_per_event(engine: ppb.GameEngine) -> float:
+    def dispatch():
+        for wrath in range(EVENTS):
+            engine.signal(events.WrathChanged(wrath))
+        while engine.events:
+            engine.publish()
+
+    return min(timeit.repeat(dispatch, number=1, repeat=REPEAT)) / EVENTS
+
+
+def main():
+    print(f"{'objects':>8}{'broadcast':>14}{'routed':>14}{'speedup':>10}")
+    for objects in OBJECT_COUNTS:
+        broadcast = build_engine(objects, systems=())
+        routed = build_engine(objects, systems=(RoutingSystem,))
+        broadcast_seconds = best_per_event(broadcast)
+        routed_seconds = best_per_event(routed)
+        for engine in (broadcast, routed):
+            assert all(
+                listener.wrath == EVENTS - 1
+                for listener in engine.current_scene.get(kind=Listener)
+            )
+            engine.__exit__(None, None, None)
+        print(
+            f"{objects:>8}"
+            f"{broadcast_seconds * 1e6:>11.1f} us"
+            f"{routed_seconds * 1e6:>11.1f} us"
+            f"{broadcast_seconds / routed_seconds:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
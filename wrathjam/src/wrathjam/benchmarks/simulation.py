@@ -0,0 +1,143 @@
+"""
+Compare ppb's Updater with `systems.simulation.FixedStepUpdater`, on the
+main thread and on its own, with and without slow frames.
+
+Each run draws a sprite moving at a constant speed for a few seconds, with
+SDL's dummy video driver so no window opens. Frames are drawn faster than
+the simulation steps. The stalled runs hold up presenting every
+`STALL_EVERY`th frame for `STALL` seconds, like a driver that blocks
+presenting.
+
+Reported per run: frames and steps per second, the longest wall time
+between two steps, and judder, the standard deviation of where the sprite
+was drawn against where a constant speed would put it, in pixels.
+
+Run with ``python -m wrathjam.benchmarks.simulation``.
+"""
+
+import os
+import statistics
+import time
+
+import ppb
+from ppb import events
+from ppb.assetlib import AssetLoadingSystem
+from ppb.systems import Updater
+
+from wrathjam import interpolation
+from wrathjam.systems import particles
+from wrathjam.systems import simulation
+
+DURATION = 3
+SIMULATION_RATE = 60
+FRAME_RATE = 90
+SPEED = 4
+STALL = 0.1
+STALL_EVERY = 30
+
+
+class StallingRenderer(particles.ParticleRenderer):
+    def __init__(self, *, stall_frames: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.stall = stall_frames
+
+    def present(self) -> None:
+        super().present()
+        if self.stall and not self.frames % STALL_EVERY:
+            time.sleep(STALL)
+
+
+class Mover(ppb.Sprite):
+    image = ppb.Square(200, 60, 60)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.steps = []
+        self.frames = []
+        self.start = None
+
+    def on_update(self, event, signal):
+        now = ppb.get_time()
+        if self.start is None:
+            self.start = now
+        elif now - self.start >= DURATION:
+            signal(events.Quit())
+        self.steps.append(now)
+        self.position += ppb.Vector(SPEED * event.time_delta, 0)
+
+    def on_render(self, event, signal):
+        if self.start is None:
+            return
+        drawn = self
+        updater = getattr(event, "simulation", None)
+        if updater is not None and updater.interpolate:
+            drawn = (
+                interpolation.get_poses(event.scene).pose(self, updater.interpolation)
+                or self
+            )
+        pixel_ratio = event.scene.main_camera.pixel_ratio
+        self.frames.append(
+            (ppb.get_time(), drawn.position.x * pixel_ratio, SPEED * pixel_ratio)
+        )
+
+
+def run(updater: type, stall: bool, **kwargs) -> dict:
+    mover = Mover()
+
+    def setup(scene):
+        scene.add(mover)
+
+    engine = ppb.GameEngine(
+        ppb.Scene,
+        basic_systems=(StallingRenderer, updater, AssetLoadingSystem),
+        scene_kwargs={"set_up": setup},
+        resolution=(640, 360),
+        target_frame_rate=FRAME_RATE,
+        time_step=1 / SIMULATION_RATE,
+        simulation_rate=SIMULATION_RATE,
+        stall_frames=stall,
+        **kwargs,
+    )
+    engine.run()
+
+    steps = mover.steps
+    gaps = [later - earlier for earlier, later in zip(steps, steps[1:])]
+    # Where a constant speed would have drawn it, less a constant lag.
+    errors = [x - speed * at for at, x, speed in mover.frames]
+    elapsed = steps[-1] - steps[0]
+    return {
+        "frames": len(mover.frames) / elapsed,
+        "steps": len(steps) / elapsed,
+        "longest_gap": max(gaps) * 1000,
+        "judder": statistics.pstdev(errors),
+    }
+
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    print(
+        f"{'':>22}{'stalls':>8}{'frames/s':>10}{'steps/s':>9}"
+        f"{'longest gap':>13}{'judder':>10}"
+    )
+    for name, updater, kwargs in (
+        ("ppb Updater", Updater, {}),
+        ("fixed step", simulation.FixedStepUpdater, {}),
+        (
+            "fixed step, threaded",
+            simulation.FixedStepUpdater,
+            {"threaded_simulation": True},
+        ),
+    ):
+        for stall in (False, True):
+            result = run(updater, stall, **kwargs)
+            print(
+                f"{name:>22}{'yes' if stall else 'no':>8}"
+                f"{result['frames']:>10.1f}{result['steps']:>9.1f}"
+                f"{result['longest_gap']:>10.1f} ms"
+                f"{result['judder']:>7.2f} px"
+            )
+
+
+if __name__ == "__main__":
+    main()
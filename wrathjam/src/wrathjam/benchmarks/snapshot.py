@@ -0,0 +1,91 @@
+"""
+Time capturing, writing, memory mapping and restoring `snapshot`s of a
+heavy sandbox scene: a player at wrath level 3, enemies and hurtboxes in
+flight, one enemy for every nine hurtboxes.
+
+Restoring is split into reading the file, which is a memory map, and
+rebuilding the scene, which creates a sprite for every object.
+
+Run with ``python -m wrathjam.benchmarks.snapshot``.
+"""
+
+import os
+import random
+import tempfile
+import timeit
+
+import ppb
+
+from wrathjam import damage
+from wrathjam import enemies
+from wrathjam import player
+from wrathjam import snapshot
+from wrathjam.scenes import sandbox
+from wrathjam.systems.hurtboxes import HurtboxBatch
+
+OBJECT_COUNTS = (1_000, 10_000)
+ARENA = 25
+REPEAT = 5
+
+
+def build_scene(objects: int) -> ppb.Scene:
+    rng = random.Random(objects)
+
+    def anywhere():
+        return ppb.Vector(rng.uniform(-ARENA, ARENA), rng.uniform(-ARENA, ARENA))
+
+    scene = sandbox.Scene()
+    scene.hurtbox_batch = HurtboxBatch()
+    (hero,) = scene.get(kind=player.Sprite)
+    hero.debug_wrath_level = 3
+    hero.wrath = 250
+    attack = hero.primary_attacks[3]
+    for index in range(objects):
+        if index % 10 == 0:
+            enemies.spawn(scene, position=anywhere())
+        else:
+            attack.spawn_hurtbox(
+                hero,
+                scene,
+                position=anywhere(),
+                final_position=anywhere(),
+                life_span=5,
+                size=0.5,
+                grow_end=0.6,
+            )
+    return scene
+
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def main():
+    # The firing log would dominate the timings.
+    damage.DEBUG = False
+    print(
+        f"{'objects':>8}{'bytes':>10}{'capture':>11}{'write':>11}"
+        f"{'map':>11}{'rebuild':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scene.wjsnap")
+        for objects in OBJECT_COUNTS:
+            scene = build_scene(objects)
+            captured = snapshot.capture(scene)
+            capture_seconds = best(lambda: snapshot.capture(scene))
+            write_seconds = best(lambda: captured.write(path))
+            map_seconds = best(lambda: snapshot.Snapshot.open(path))
+            opened = snapshot.Snapshot.open(path)
+            rebuild_seconds = best(lambda: snapshot.restore(opened))
+            print(
+                f"{objects:>8}"
+                f"{os.path.getsize(path):>10}"
+                f"{capture_seconds * 1000:>8.2f} ms"
+                f"{write_seconds * 1000:>8.2f} ms"
+                f"{map_seconds * 1000:>8.2f} ms"
+                f"{rebuild_seconds * 1000:>8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
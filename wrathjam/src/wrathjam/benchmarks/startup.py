@@ -0,0 +1,116 @@
+"""
+Time to first frame, loading the gameplay systems before it (eagerly) and
+after it (deferred, the default).
+
+Each run is a cold ``python -m wrathjam --profile-startup`` that quits as
+soon as the deferred systems are running, with SDL's dummy video and audio
+drivers so no window opens. The window class is set up front so the runs
+don't depend on the app's metadata being installed.
+
+Also lists any gameplay module the main thread imported before the first
+frame in the deferred runs, which means something made the splash wait for
+it again. (The asset preload thread importing the sandbox scene for its
+asset list while the splash is up is fine.)
+
+Run with ``python -m wrathjam.benchmarks.startup``.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from wrathjam import app
+
+RUNS = 5
+# Modules the splash has no business waiting for.
+GAMEPLAY = ("wrathjam.player", "wrathjam.damage", "wrathjam.scenes.sandbox") + tuple(
+    name.partition(":")[0] for name in app.DEFERRED_SYSTEMS
+)
+
+
+def launch(*flags: str) -> dict:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env.setdefault("SDL_VIDEO_X11_WMCLASS", "Wrath Jam")
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "startup.json")
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "wrathjam",
+                "--profile-startup",
+                output,
+                "--quit-after-startup",
+                *flags,
+            ],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=60,
+        )
+        with open(output) as file:
+            return json.load(file)
+
+
+def before_first_frame(report: dict) -> list[dict]:
+    """
+    The modules the main thread imported before the first frame.
+    """
+    first_frame = report["marks"]["first frame"]
+    return [
+        module
+        for module in report["modules"]
+        if module["at"] < first_frame and module["thread"] == "MainThread"
+    ]
+
+
+def summarize(reports: list[dict]) -> dict:
+    def median(values):
+        return statistics.median(values) * 1000
+
+    first_frames = [report["marks"]["first frame"] for report in reports]
+    return {
+        "first_frame": median(first_frames),
+        "started": median(
+            [report["marks"]["deferred systems started"] for report in reports]
+        ),
+        "modules": statistics.median(
+            [len(before_first_frame(report)) for report in reports]
+        ),
+    }
+
+
+def main():
+    print(f"{'':>10}{'first frame':>14}{'all systems':>14}{'modules':>10}")
+    deferred = []
+    for name, flags in (("eager", ("--load-eagerly",)), ("deferred", ())):
+        reports = [launch(*flags) for _ in range(RUNS)]
+        if not flags:
+            deferred = reports
+        summary = summarize(reports)
+        print(
+            f"{name:>10}"
+            f"{summary['first_frame']:>11.1f} ms"
+            f"{summary['started']:>11.1f} ms"
+            f"{summary['modules']:>10.0f}"
+        )
+
+    early = sorted(
+        {
+            module["name"]
+            for report in deferred
+            for module in before_first_frame(report)
+            if module["name"] in GAMEPLAY
+        }
+    )
+    if early:
+        print(f"Imported before the first frame: {', '.join(early)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compare a map with every enemy live in the scene against the same map
+streamed a chunk at a time through `world.ChunkedWorld`, as the map grows.
+
+A focus sprite walks across the map while the enemies run their behaviour
+trees. Streamed, the live enemy count depends on the chunks around the
+focus, not on the size of the map.
+
+Run with ``python -m wrathjam.benchmarks.world``.
+"""
+
+import random
+from time import perf_counter
+
+import ppb
+from ppb import events
+
+from wrathjam import damage
+from wrathjam import enemies
+from wrathjam import routing
+from wrathjam import world
+from wrathjam.systems.ai import AISystem
+from wrathjam.systems.attacks import AttackSystem
+from wrathjam.systems.clock import ClockSystem
+from wrathjam.systems.world import WorldSystem
+
+MAP_CHUNKS = (4, 8, 16)
+ENEMIES_PER_CHUNK = 8
+CHUNK_SIZE = 25
+FRAMES = 600
+TIME_STEP = 1 / 60
+
+
+class Walker(ppb.Sprite):
+    image = None
+    velocity = ppb.Vector(20, 8)
+
+    def on_update(self, event, signal):
+        self.position += self.velocity * event.time_delta
+
+
+def generator(map_chunks: int):
+    def generate(chunk):
+        x, y = chunk
+        if not (0 <= x < map_chunks and 0 <= y < map_chunks):
+            return []
+        rng = random.Random(hash(chunk))
+        return [
+            (
+                "enemy",
+                {
+                    "position": (
+                        (x + rng.random()) * CHUNK_SIZE,
+                        (y + rng.random()) * CHUNK_SIZE,
+                    ),
+                    "heading": (0, 0),
+                    "facing": (0, 1),
+                    "wander_until": float("-inf"),
+                },
+            )
+            for _ in range(ENEMIES_PER_CHUNK)
+        ]
+
+    return generate
+
+
+def run(map_chunks: int, streamed: bool) -> dict:
+    engine = ppb.GameEngine(
+        routing.RoutedScene,
+        basic_systems=(),
+        systems=(ClockSystem, WorldSystem, AISystem, AttackSystem),
+        scene_kwargs={},
+        ai_target_kind=Walker,
+        world_focus_kind=Walker,
+    )
+    generate = generator(map_chunks)
+    with engine:
+        engine.start()
+        while engine.events:
+            engine.publish()
+        scene = engine.current_scene
+        scene.add(Walker(position=ppb.Vector(CHUNK_SIZE / 2, CHUNK_SIZE / 2)))
+        if streamed:
+            scene.world = world.ChunkedWorld(chunk_size=CHUNK_SIZE, generate=generate)
+        else:
+            for x in range(map_chunks):
+                for y in range(map_chunks):
+                    for _, record in generate((x, y)):
+                        enemies.restore(scene, record)
+        peak_live = 0
+        start = perf_counter()
+        for _ in range(FRAMES):
+            engine.signal(events.Update(TIME_STEP))
+            while engine.events:
+                engine.publish()
+            peak_live = max(peak_live, len(scene.children))
+        seconds = perf_counter() - start
+        report = {"frame_ms": seconds / FRAMES * 1000, "peak_live": peak_live}
+        if streamed:
+            report.update(scene.world.stats())
+    return report
+
+
+def main():
+    # The firing log would dominate the timings.
+    damage.DEBUG = False
+    print(
+        f"{'map':>8}{'enemies':>9}{'live':>8}{'frame':>12}"
+        f"{'live':>8}{'frame':>12}{'saved':>8}{'spawned':>9}"
+    )
+    for map_chunks in MAP_CHUNKS:
+        everything = run(map_chunks, streamed=False)
+        streamed = run(map_chunks, streamed=True)
+        print(
+            f"{map_chunks:>5}x{map_chunks:<2}"
+            f"{map_chunks * map_chunks * ENEMIES_PER_CHUNK:>9}"
+            f"{everything['peak_live']:>8}"
+            f"{everything['frame_ms']:>9.2f} ms"
+            f"{streamed['peak_live']:>8}"
+            f"{streamed['frame_ms']:>9.2f} ms"
+            f"{streamed['objects_saved']:>8}"
+            f"{streamed['objects_spawned']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
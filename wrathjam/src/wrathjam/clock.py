@@ -0,0 +1,56 @@
+import ppb
+
+__all__ = ["SimulationClock", "get_clock"]
+
+
+class SimulationClock:
+    """
+    Simulation time for a scene.
+
+    Advanced once per Update by `systems.clock.ClockSystem`, scaled by
+    `time_scale`. While paused the clock only moves when `step` is asked
+    to advance it.
+    """
+
+    def __init__(self, time_scale: float = 1):
+        self.now = 0.0
+        self.frame = 0
+        self.time_scale = time_scale
+        self.paused = False
+        self.pending_steps = 0
+
+    def advance(self, time_delta: float) -> float:
+        """
+        Move the clock forward for one Update.
+
+        Returns the simulated time that passed.
+        """
+        if self.paused:
+            if not self.pending_steps:
+                return 0.0
+            self.pending_steps -= 1
+        scaled = time_delta * self.time_scale
+        self.now += scaled
+        self.frame += 1
+        return scaled
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self.pending_steps = 0
+
+    def step(self, frames: int = 1):
+        """
+        Let a paused clock advance for the next frames Updates.
+        """
+        self.pending_steps += frames
+
+
+def get_clock(scene: ppb.Scene) -> SimulationClock:
+    try:
+        return scene.clock
+    except AttributeError:
+        clock = scene.clock = SimulationClock()
+        return clock
@@ -0,0 +1,188 @@
+from collections import defaultdict
+from math import floor
+from typing import Hashable, Iterable, Iterator
+
+import numpy as np
+import ppb
+
+__all__ = ["SpatialHash", "TargetIndex", "swept_circle_hits"]
+
+Cell = tuple[int, int]
+
+
+class SpatialHash:
+    """
+    A uniform grid of buckets keyed by cell coordinate.
+
+    Objects are bucketed by their center. `update` only moves an object
+    between buckets when it crosses a cell boundary, so a frame where most
+    objects stay put costs one cell computation each.
+    """
+
+    def __init__(self, cell_size: float = 2):
+        self.cell_size = cell_size
+        self.cells: defaultdict[Cell, set] = defaultdict(set)
+        self.members: dict[Hashable, Cell] = {}
+        self.rebucketed = 0
+
+    def __contains__(self, item) -> bool:
+        return item in self.members
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def cell(self, position: ppb.Vector) -> Cell:
+        size = self.cell_size
+        return floor(position.x / size), floor(position.y / size)
+
+    def update(self, item: Hashable, position: ppb.Vector) -> None:
+        cell = self.cell(position)
+        old_cell = self.members.get(item)
+        if cell == old_cell:
+            return
+        if old_cell is not None:
+            self._discard(item, old_cell)
+        self.cells[cell].add(item)
+        self.members[item] = cell
+        self.rebucketed += 1
+
+    def remove(self, item: Hashable) -> None:
+        self._discard(item, self.members.pop(item))
+
+    def _discard(self, item, cell):
+        bucket = self.cells[cell]
+        bucket.discard(item)
+        if not bucket:
+            del self.cells[cell]
+
+    def query(self, position: ppb.Vector, radius: float) -> Iterator:
+        """
+        Iterate over everything bucketed in a cell touched by the square
+        bounding the given circle.
+        """
+        x, y = position
+        return self.query_box(x - radius, y - radius, x + radius, y + radius)
+
+    def query_box(
+        self, left: float, bottom: float, right: float, top: float
+    ) -> Iterator:
+        """
+        Iterate over everything bucketed in a cell touched by the box.
+        """
+        size = self.cell_size
+        cells = self.cells
+        min_y = floor(bottom / size)
+        max_y = floor(top / size)
+        for x in range(floor(left / size), floor(right / size) + 1):
+            for y in range(min_y, max_y + 1):
+                bucket = cells.get((x, y))
+                if bucket:
+                    yield from bucket
+
+
+class TargetIndex:
+    """
+    A scene's targets bucketed in a `SpatialHash`, with the largest of
+    their `hit_radius`.
+
+    Targets are `add`ed and `remove`d as they enter and leave the scene.
+    `refresh` rebuckets only the targets whose position changed since the
+    last one. Scenes that can't report their children coming and going
+    are brought up to date with `sync` instead.
+    """
+
+    def __init__(self, cell_size: float = 2):
+        self.grid = SpatialHash(cell_size)
+        # The position each target was last bucketed at, and its radius.
+        self.positions: dict = {}
+        self.radii: dict = {}
+        self.max_radius = 0.0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def add(self, target) -> None:
+        position = self.positions[target] = target.position
+        self.grid.update(target, position)
+        radius = self.radii[target] = target.hit_radius
+        if radius > self.max_radius:
+            self.max_radius = radius
+
+    def remove(self, target) -> None:
+        if target not in self.positions:
+            return
+        del self.positions[target]
+        self.grid.remove(target)
+        if self.radii.pop(target) >= self.max_radius:
+            self.max_radius = max(self.radii.values(), default=0.0)
+
+    def refresh(self) -> None:
+        """
+        Rebucket the targets that moved.
+        """
+        positions = self.positions
+        # Positions are replaced, never changed in place, so a target
+        # that moved holds a different vector.
+        moved = [
+            target
+            for target, position in positions.items()
+            if target.position is not position
+        ]
+        for target in moved:
+            position = positions[target] = target.position
+            self.grid.update(target, position)
+            radius = self.radii[target] = target.hit_radius
+            if radius > self.max_radius:
+                self.max_radius = radius
+
+    def sync(self, targets: Iterable) -> None:
+        """
+        Make the index hold exactly targets.
+        """
+        targets = set(targets)
+        for gone in [target for target in self.positions if target not in targets]:
+            self.remove(gone)
+        for target in targets:
+            if target not in self.positions:
+                self.add(target)
+        self.refresh()
+
+
+def swept_circle_hits(
+    start: np.ndarray,
+    end: np.ndarray,
+    start_radius: np.ndarray,
+    end_radius: np.ndarray,
+    centers: np.ndarray,
+    radii: np.ndarray,
+) -> np.ndarray:
+    """
+    Test many moving circles against static circles in one pass.
+
+    Row i is a circle that moved from start[i] to end[i] while its radius
+    changed from start_radius[i] to end_radius[i], paired with a static
+    circle at centers[i] with radius radii[i]. Positions are (n, 2) arrays,
+    radii are length n.
+
+    The moving circle is tested at its closest approach along the segment,
+    with the radius interpolated to that point, and at the end of the
+    segment. Returns a boolean array of hits.
+    """
+    travel = end - start
+    to_center = centers - start
+    length_squared = np.einsum("ij,ij->i", travel, travel)
+    along = np.einsum("ij,ij->i", to_center, travel)
+    t = np.divide(
+        along, length_squared, out=np.zeros_like(along), where=length_squared > 0
+    )
+    np.clip(t, 0, 1, out=t)
+
+    closest = start + t[:, None] * travel
+    offset = centers - closest
+    reach = start_radius + t * (end_radius - start_radius) + radii
+    hit = np.einsum("ij,ij->i", offset, offset) <= reach * reach
+
+    offset = centers - end
+    reach = end_radius + radii
+    hit |= np.einsum("ij,ij->i", offset, offset) <= reach * reach
+    return hit
@@ -0,0 +1,106 @@
+"""
+Which objects the camera can see.
+
+A scene's `Visibility` is refreshed from its main camera once per frame by
+`systems.culling.CullingSystem`, which then leaves off screen objects out
+of `PreRender` and, for objects that opt in, most `Update`s.
+
+Objects are culled by their `position`, padded by half their `size`.
+Objects without a position, or with `cull = False` (like UI that places
+itself relative to the camera), are always visible.
+
+Objects opt in to updating less often off screen by setting
+`off_screen_update_interval` to the seconds of scene time between their
+Updates there. Those objects should advance by `elapsed(self, event)`
+rather than the event's `time_delta`.
+"""
+
+from itertools import compress
+from typing import Iterable
+
+import numpy as np
+import ppb
+
+__all__ = ["Visibility", "elapsed", "get_visibility"]
+
+
+class Visibility:
+    """
+    The objects outside the camera as of the last `refresh`.
+
+    Objects the last refresh didn't look at count as visible. Counters
+    cover every refresh since the visibility was made.
+    """
+
+    def __init__(self, margin: float = 1):
+        self.margin = margin
+        self.off_screen: set = set()
+        self.frames = 0
+        self.visible = 0
+        self.culled = 0
+        self.total_visible = 0
+        self.total_culled = 0
+        self.skipped_pre_renders = 0
+        self.deferred_updates = 0
+
+    def refresh(self, objects: Iterable, camera) -> None:
+        objects = [
+            obj
+            for obj in objects
+            if getattr(obj, "cull", True) and hasattr(obj, "position")
+        ]
+        bounds = np.array(
+            [
+                (obj.position.x, obj.position.y, getattr(obj, "size", 0))
+                for obj in objects
+            ]
+        ).reshape(-1, 3)
+        x = bounds[:, 0]
+        y = bounds[:, 1]
+        half = bounds[:, 2] / 2 + self.margin
+        outside = (
+            (x + half < camera.left)
+            | (x - half > camera.right)
+            | (y + half < camera.bottom)
+            | (y - half > camera.top)
+        )
+        self.off_screen = set(compress(objects, outside.tolist()))
+        self.frames += 1
+        self.culled = len(self.off_screen)
+        self.visible = len(objects) - self.culled
+        self.total_culled += self.culled
+        self.total_visible += self.visible
+
+    def is_visible(self, obj) -> bool:
+        return obj not in self.off_screen
+
+    def stats(self) -> dict:
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "visible": self.visible,
+            "culled": self.culled,
+            "visible_per_frame": self.total_visible / frames,
+            "culled_per_frame": self.total_culled / frames,
+            "skipped_pre_renders": self.skipped_pre_renders,
+            "deferred_updates": self.deferred_updates,
+        }
+
+
+def get_visibility(scene: ppb.Scene) -> Visibility:
+    """
+    The scene's visibility, creating it if needed.
+    """
+    visibility = getattr(scene, "visibility", None)
+    if visibility is None:
+        visibility = scene.visibility = Visibility()
+    return visibility
+
+
+def elapsed(obj, event) -> float:
+    """
+    Scene time since obj's last Update, which is more than the event's
+    time_delta when it was skipped off screen.
+    """
+    update_elapsed = getattr(obj, "update_elapsed", None)
+    return event.time_delta if update_elapsed is None else update_elapsed
@@ -1,17 +1,34 @@
 from random import randrange
-from time import monotonic
-from typing import Callable, Union
+from typing import Callable, Optional
 
 import ppb
 
-from wrathjam import config, utils
+from wrathjam import assets, clock, config, pools, utils
+from wrathjam.systems import hurtboxes
 
 DEBUG = config.DEBUG
 
 
 class Attack:
-    last_used: Union[float, int] = 0
-    cool_down: Union[float, int] = 1
+    """
+    An attack's definition, shared by everything that uses it.
+
+    Cool down is tracked per owner by the scene's `attacks.AttackTable`,
+    never on the definition.
+    """
+
+    cool_down: float = 1
+    pool_prewarm: int = 0
+    # The hurtbox each use spawns: how far ahead of the source it travels,
+    # how long it lives, and the size it starts at and grows to.
+    reach: float = 1
+    life_span: float = 0.25
+    size: float = 1
+    grow_end: Optional[float] = None
+    # What each hit is worth, totalled per target by the scene's
+    # `ledger.DamageLedger`.
+    damage: float = 1
+    wrath_gain: float = 1
 
     def __call__(
         self,
@@ -20,13 +37,15 @@ class Attack:
         signal_function: Callable[[type], None],
         tags: list = None,
     ) -> bool:
-        now = monotonic()
-        if now <= self.last_used + self.cool_down:
+        # attacks imports this module.
+        from wrathjam.systems import attacks
+
+        now = clock.get_clock(scene).now
+        if not attacks.get_table(scene).use(source, self, now):
             return False
         if DEBUG:
             print(f"{self.name} fired at {now}.")
         self.initiate(source, scene, signal_function)
-        self.last_used = now
         return True
 
     def initiate(
@@ -37,11 +56,6 @@ class Attack:
     ) -> None:
         pass
 
-    def apply(
-        self, hit: ppb.Sprite, scene: ppb.Scene, signal_function: Callable[[type], None]
-    ) -> None:
-        pass
-
     def end(self):
         pass
 
@@ -49,9 +63,42 @@ class Attack:
     def name(self):
         return type(self).__name__
 
+    def hurtbox_pool(self, scene: ppb.Scene) -> pools.Pool["Hurtbox"]:
+        return pools.get_pool(scene, self.name, Hurtbox, self.pool_prewarm)
+
+    def spawn_hurtbox(self, source: ppb.Sprite, scene: ppb.Scene, **kwargs):
+        hurtbox = self.hurtbox_pool(scene).acquire(
+            scene,
+            source=source,
+            attack=self,
+            spawn_time=clock.get_clock(scene).now,
+            **kwargs,
+        )
+        hurtboxes.track(scene, hurtbox)
+        return hurtbox
+
+
+class Damageable:
+    """
+    Mixin for sprites that hurtboxes can hit.
+
+    Collision treats the sprite as a circle of `hit_radius` around its
+    position. A sprite that was hit gets one `events.DamageTaken` per
+    frame, totalling the frame's hits.
+    """
+
+    @property
+    def hit_radius(self) -> float:
+        return self.size / 2
+
 
 class Punch(Attack):
     cool_down = 0.75
+    pool_prewarm = 2
+    reach = 1
+    life_span = 0.30
+    size = 0.5
+    grow_end = 1.5
 
     def initiate(
         self,
@@ -59,19 +106,23 @@ class Punch(Attack):
         scene: ppb.Scene,
         signal_function: Callable[[type], None],
     ) -> None:
-        scene.add(
-            Hurtbox(
-                final_position=source.position + (source.facing * 1),
-                life_span=0.30,
-                position=source.position + (source.facing * 0.5),
-                size=0.5,
-                grow_end=1.5,
-            )
+        self.spawn_hurtbox(
+            source,
+            scene,
+            final_position=source.position + (source.facing * self.reach),
+            life_span=self.life_span,
+            position=source.position + (source.facing * 0.5),
+            size=self.size,
+            grow_end=self.grow_end,
         )
 
 
 class Kick(Attack):
     cool_down = 0.4
+    pool_prewarm = 2
+    reach = 3
+    life_span = 0.3
+    size = 1
 
     def initiate(
         self,
@@ -79,20 +130,24 @@ class Kick(Attack):
         scene: ppb.Scene,
         signal_function: Callable[[type], None],
     ) -> None:
-        scene.add(
-            Hurtbox(
-                final_position=source.position + (source.facing * 3),
-                life_span=0.3,
-                position=source.position + (source.facing * 0.5),
-                size=1,
-                source=source,
-                attack=self,
-            )
+        self.spawn_hurtbox(
+            source,
+            scene,
+            final_position=source.position + (source.facing * self.reach),
+            life_span=self.life_span,
+            position=source.position + (source.facing * 0.5),
+            size=self.size,
+            grow_end=self.grow_end,
         )
 
 
 class RapidFire(Attack):
     cool_down = 0.12
+    pool_prewarm = 8
+    reach = 8
+    life_span = 0.6
+    size = 0.5
+    grow_end = 0.6
 
     def __init__(self, min, max, step):
         self.min = min
@@ -106,14 +161,14 @@ class RapidFire(Attack):
         signal_function: Callable[[type], None],
     ) -> None:
         drifted_rotation: ppb.Vector = source.facing.rotate(self.random_degrees())
-        scene.add(
-            Hurtbox(
-                final_position=source.position + (drifted_rotation * 8),
-                position=source.position + (source.facing * 0.5),
-                life_span=0.6,
-                size=0.5,
-                grow_end=0.6,
-            )
+        self.spawn_hurtbox(
+            source,
+            scene,
+            final_position=source.position + (drifted_rotation * self.reach),
+            position=source.position + (source.facing * 0.5),
+            life_span=self.life_span,
+            size=self.size,
+            grow_end=self.grow_end,
         )
 
     def random_degrees(self):
@@ -122,6 +177,10 @@ class RapidFire(Attack):
 
 class Hurtbox(ppb.Sprite):
     image = None
+    # The name of the asset to draw with, see `drawn_as`.
+    visual = None
+    # In scene clock time, see `clock.SimulationClock`.
+    spawn_time = 0
     life_span = 0.25
     final_position = None
     movement_ease = utils.smoother_step
@@ -130,8 +189,13 @@ class Hurtbox(ppb.Sprite):
     grow_time = None
     growth_ease = utils.smoother_step
     layer = -1
+    # Off screen, see `culling`. Movement is by clock time, so skipped
+    # Updates don't change where a hurtbox ends up.
+    off_screen_update_interval = 0.1
     attack = None
     source = None
+    pool = None
+    batch = None
 
     _spawn_time = None
     _end_time = None
@@ -139,25 +203,84 @@ class Hurtbox(ppb.Sprite):
     _start_position = None
     _grow_start_time = None
     _grow_end_time = None
+    _slot = None
+    hits = None
+    previous_position = None
+    previous_size = None
+
+    # Everything a spawn is allowed to customize. Cleared on reset so a
+    # recycled hurtbox falls back to the class defaults.
+    _reset_fields = (
+        "spawn_time",
+        "position",
+        "size",
+        "rotation",
+        "life_span",
+        "final_position",
+        "movement_ease",
+        "grow_end",
+        "grow_start",
+        "grow_time",
+        "growth_ease",
+        "attack",
+        "source",
+        "visual",
+        "last_update_time",
+        "update_elapsed",
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._spawn_time = monotonic()
+        self._start()
+
+    def reset(self, **kwargs):
+        instance_values = vars(self)
+        for field in self._reset_fields:
+            instance_values.pop(field, None)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        self._start()
+
+    def expire(self, scene: ppb.Scene):
+        if self.batch is not None:
+            self.batch.remove(self._slot)
+        if self.pool is not None:
+            self.pool.release(scene, self)
+        else:
+            scene.remove(self)
+
+    def _start(self):
+        if self.hits is None:
+            self.hits = set()
+        else:
+            self.hits.clear()
+        self._spawn_time = self.spawn_time
         self._end_time = self._spawn_time + self.life_span
         self._starting_size = self.size
         self._start_position = self.position
+        self.previous_position = self.position
+        self.previous_size = self.size
         if self.grow_end is not None:
             self.grow_time = (
                 self.grow_time if self.grow_time is not None else self.life_span
             )
             self._grow_start_time = self._spawn_time + self.grow_start
             self._grow_end_time = self._grow_start_time + self.grow_time
+        else:
+            self._grow_start_time = None
+            self._grow_end_time = None
 
     def on_update(self, event, signal):
-        now = monotonic()
+        if self.batch is not None:
+            # The scene's HurtboxSystem batch moves this one.
+            return
+        now = clock.get_clock(event.scene).now
         run_time = now - self._spawn_time
         if run_time >= self.life_span:
-            event.scene.remove(self)
+            self.expire(event.scene)
+            return
+        self.previous_position = self.position
+        self.previous_size = self.size
 
         # move
         if self.final_position is not None:
@@ -183,6 +306,20 @@ class Hurtbox(ppb.Sprite):
                 t * (self.grow_end - self._starting_size)
             ) + self._starting_size
 
+    def drawn_as(self) -> Optional[str]:
+        """
+        The asset this hurtbox is drawn with: its visual, or the debug
+        square in debug mode.
+        """
+        if self.visual is not None:
+            return self.visual
+        return "hurtbox" if DEBUG else None
+
     def on_pre_render(self, event, signal):
-        if self.image is None and config.DEBUG:
-            self.image = ppb.Square(200, 50, 50)
+        if self.batch is not None and self.batch.particles:
+            # Drawn with the rest of the batch.
+            return
+        if self.image is None:
+            name = self.drawn_as()
+            if name is not None:
+                self.image = assets.registry.asset(name)
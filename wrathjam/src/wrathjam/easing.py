@@ -0,0 +1,74 @@
+"""
+Precompiled easing curves.
+
+The curves in `wrathjam.utils` compose through `partial`, `mix` and
+`crossfade`, so every evaluation walks the whole call chain. `compile_ease`
+samples any such composition once into a lookup table and evaluates it by
+linear interpolation. `evaluate` runs a curve over a whole array of times.
+"""
+
+from typing import Callable, Union
+
+import numpy as np
+
+from wrathjam import utils
+
+__all__ = ["LookupEase", "compile_ease", "evaluate", "smoother_step"]
+
+Ease = Callable[[float], float]
+Times = Union[float, np.ndarray]
+
+
+class LookupEase:
+    """
+    An easing curve sampled at `resolution` even steps over [0, 1].
+
+    Call it with a float for the scalar API, or with an ndarray to evaluate
+    every element at once. Times outside [0, 1] are clamped.
+    """
+
+    def __init__(self, ease: Ease, resolution: int = 256):
+        self.ease = ease
+        self.resolution = resolution
+        self.samples = np.linspace(0, 1, resolution + 1)
+        self.table = np.asarray(ease(self.samples), dtype=float)
+        # Plain floats index much faster than a NumPy array from Python.
+        self._scalar_table = self.table.tolist()
+
+    def __call__(self, time: Times) -> Times:
+        if time.__class__ is np.ndarray:
+            return np.interp(time, self.samples, self.table)
+        table = self._scalar_table
+        position = time * self.resolution
+        if position <= 0:
+            return table[0]
+        if position >= self.resolution:
+            return table[-1]
+        index = int(position)
+        low = table[index]
+        return low + (position - index) * (table[index + 1] - low)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.ease!r}, resolution={self.resolution})"
+
+
+def compile_ease(ease: Ease, resolution: int = 256) -> LookupEase:
+    """
+    Sample an easing curve into a lookup table.
+
+    The curve must accept an ndarray, which everything in `wrathjam.utils`
+    (and anything built from them with `mix` or `crossfade`) does.
+    """
+    if isinstance(ease, LookupEase):
+        ease = ease.ease
+    return LookupEase(ease, resolution)
+
+
+def evaluate(ease: Ease, times: Times) -> np.ndarray:
+    """
+    Evaluate an easing curve over every element of times at once.
+    """
+    return np.asarray(ease(np.asarray(times, dtype=float)), dtype=float)
+
+
+smoother_step = compile_ease(utils.smoother_step)
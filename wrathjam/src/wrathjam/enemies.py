@@ -0,0 +1,162 @@
+"""
+Enemies and the behaviour trees that drive them.
+
+Trees are built from misbehave nodes and shared by every enemy; the state a
+tree needs lives on the enemy. Trees only decide: they set the enemy's
+`heading` and request attacks, and the enemy follows its heading every
+frame. That lets `systems.ai.AISystem` tick distant enemies less often
+without them stuttering. Nodes finish in one tick rather than returning
+RUNNING, so the whole tree is re-evaluated every tick.
+"""
+
+import random
+
+import ppb
+from misbehave import State
+from misbehave.common import BaseNode
+from misbehave.selector import Priority
+from misbehave.selector import Sequence
+
+from wrathjam import assets
+from wrathjam import clock
+from wrathjam import culling
+from wrathjam import damage
+from wrathjam import world
+from wrathjam.systems import ai
+from wrathjam.systems import attacks
+
+__all__ = ["Enemy", "despawn", "restore", "save", "spawn"]
+
+
+class TargetWithin(BaseNode):
+    """
+    Succeeds when the context's target is within distance of the actor.
+    """
+
+    def __init__(self, distance: float):
+        self.distance = distance
+
+    def __call__(self, actor, context: ai.AIContext) -> State:
+        target = context.target
+        if target is None:
+            return State.FAILED
+        if (target.position - actor.position).length <= self.distance:
+            return State.SUCCESS
+        return State.FAILED
+
+
+class Strike(BaseNode):
+    """
+    Asks the scene's attack table to fire the actor's attack.
+    """
+
+    def __call__(self, actor, context: ai.AIContext) -> State:
+        actor.heading = ppb.Vector(0, 0)
+        attacks.get_table(context.scene).request(actor.attack_slot)
+        return State.SUCCESS
+
+
+class Chase(BaseNode):
+    """
+    Heads toward the context's target, following the scene's flow field
+    where there is one.
+    """
+
+    def __call__(self, actor, context: ai.AIContext) -> State:
+        field = getattr(context.scene, "flow_field", None)
+        direction = None if field is None else field.direction_at(actor.position)
+        if not direction:
+            # Off the field, or already in the target's cell.
+            direction = context.target.position - actor.position
+        if direction:
+            actor.heading = direction.normalize()
+            actor.facing = actor.heading
+        return State.SUCCESS
+
+
+class Wander(BaseNode):
+    """
+    Picks a new random heading every so often.
+    """
+
+    def __init__(self, every: float = 2):
+        self.every = every
+
+    def __call__(self, actor, context: ai.AIContext) -> State:
+        if context.now >= actor.wander_until:
+            actor.wander_until = context.now + self.every
+            actor.heading = ppb.Vector(0, actor.wander_speed).rotate(
+                random.uniform(0, 360)
+            )
+        return State.SUCCESS
+
+
+brawler = Priority(
+    Sequence(TargetWithin(1.5), Strike()),
+    Sequence(TargetWithin(20), Chase()),
+    Wander(),
+)
+
+
+class Enemy(damage.Damageable, ppb.Sprite):
+    size = 1
+    image = assets.Lazy("enemy")
+    speed = 3
+    wander_speed = 0.3
+    attack = damage.Punch()
+    tree = brawler
+    # Off screen, see `culling`.
+    off_screen_update_interval = 0.25
+
+    heading = ppb.Vector(0, 0)
+    # Facing up, for ppb's facing, which follows rotation.
+    rotation = 180
+    wander_until = float("-inf")
+    attack_slot = None
+
+    def on_update(self, event, signal):
+        if self.heading:
+            self.position += self.heading * self.speed * culling.elapsed(self, event)
+
+
+def spawn(scene: ppb.Scene, **kwargs) -> Enemy:
+    """
+    Add an enemy to scene with its AI and attack registered.
+    """
+    enemy = scene.add(Enemy(**kwargs))
+    enemy.attack_slot = attacks.get_table(scene).add(enemy, enemy.attack)
+    ai.get_roster(scene).add(enemy, enemy.tree, clock.get_clock(scene).now)
+    world.track(scene, enemy)
+    return enemy
+
+
+def despawn(scene: ppb.Scene, enemy: Enemy) -> None:
+    world.untrack(scene, enemy)
+    ai.get_roster(scene).remove(enemy)
+    attacks.get_table(scene).remove_owner(enemy)
+    scene.remove(enemy)
+
+
+def save(enemy: Enemy) -> dict:
+    """
+    The enemy's state as plain values, for `restore`.
+    """
+    return {
+        "position": (enemy.position.x, enemy.position.y),
+        "heading": (enemy.heading.x, enemy.heading.y),
+        "facing": (enemy.facing.x, enemy.facing.y),
+        "wander_until": enemy.wander_until,
+    }
+
+
+def restore(scene: ppb.Scene, record: dict) -> Enemy:
+    return spawn(
+        scene,
+        position=ppb.Vector(*record["position"]),
+        heading=ppb.Vector(*record["heading"]),
+        facing=ppb.Vector(*record["facing"]),
+        wander_until=record["wander_until"],
+    )
+
+
+world.register("enemy", Enemy, save, restore, despawn)
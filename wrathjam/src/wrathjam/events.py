@@ -1,15 +1,18 @@
 from dataclasses import dataclass
 
 import ppb
+from ppb import events as ppb_events
 
 
 @dataclass
 class AddWrathLevel:
+    count: int = 1
     scene: ppb.Scene = None
 
 
 @dataclass
 class RemoveWrathLevel:
+    count: int = 1
     scene: ppb.Scene = None
 
 
@@ -23,3 +26,50 @@ class WrathLevelChanged:
 class WrathChanged:
     wrath: int
     scene: ppb.Scene = None
+
+
+@dataclass
+class ResolveDamage:
+    """
+    The hits in the scene's `ledger.DamageLedger` are ready to resolve.
+    """
+
+    scene: ppb.Scene = None
+
+
+@dataclass
+class DamageTaken:
+    """
+    Sent to a target once per frame it was hit, with the frame's totals.
+    """
+
+    damage: float
+    wrath: float
+    hits: int
+    scene: ppb.Scene = None
+
+
+# Handled by a few objects but signalled into busy scenes, so
+# `systems.routing.RoutingSystem` delivers them only to subscribers.
+ROUTED = (AddWrathLevel, RemoveWrathLevel, WrathLevelChanged, WrathChanged)
+
+# Handled by nearly everything every frame, so `systems.culling.CullingSystem`
+# skips objects off camera.
+CULLED = (ppb_events.Update, ppb_events.PreRender)
+
+# Merged by `systems.coalescing.CoalescingSystem` into one event per frame.
+# Only the last of these matters:
+LATEST = (WrathChanged, WrathLevelChanged)
+# These add up to a net change of wrath level:
+WRATH_LEVEL_DELTAS = {AddWrathLevel: 1, RemoveWrathLevel: -1}
+
+
+def wrath_level_delta(delta: int):
+    """
+    The event that changes the wrath level by delta, if any.
+    """
+    if delta > 0:
+        return AddWrathLevel(delta)
+    if delta < 0:
+        return RemoveWrathLevel(-delta)
+    return None
@@ -0,0 +1,110 @@
+"""
+Drawing between simulation steps.
+
+The simulation advances in fixed steps (see
+`systems.simulation.FixedStepUpdater`), so frames rarely land on one, and
+drawing the latest step as it is makes motion judder. Instead each step
+first records every sprite's pose in the scene's `PoseBuffer`, and the
+renderer draws each sprite that far between that pose and its current
+one, by how far the frame is into the next step. The picture runs one step
+behind the simulation, smoothly.
+
+Sprites that keep their own `previous_position` and `previous_size`, like
+hurtboxes, aren't recorded: they're drawn between those and their current
+position and size. Hurtboxes drawn from the scene's `hurtbox_batch` use
+its arrays instead.
+
+Objects with `interpolate = False` (like UI that places itself relative to
+the camera every frame) are always drawn where they are.
+"""
+
+import ppb
+
+__all__ = ["Pose", "PoseBuffer", "get_poses"]
+
+
+class Pose:
+    """
+    Where to draw a sprite, in the attributes the renderer reads.
+    """
+
+    __slots__ = ("position", "rotation", "width", "height")
+
+    def __init__(self, position: ppb.Vector, rotation: float, width, height):
+        self.position = position
+        self.rotation = rotation
+        self.width = width
+        self.height = height
+
+
+class PoseBuffer:
+    """
+    The drawn sprites' poses as of the start of the latest step.
+
+    Together with the sprites themselves, which hold the latest step's
+    result, these are the two states the renderer draws between.
+    """
+
+    def __init__(self):
+        self.previous: dict = {}
+        self.captures = 0
+
+    def capture(self, scene: ppb.Scene) -> None:
+        """
+        Record the pose of every sprite in scene that can be drawn and
+        doesn't keep its own previous pose.
+        """
+        previous = self.previous
+        previous.clear()
+        for obj in scene:
+            if (
+                hasattr(obj, "__image__")
+                and getattr(obj, "interpolate", True)
+                and getattr(obj, "previous_position", None) is None
+            ):
+                previous[obj] = (obj.position, obj.rotation, obj.width, obj.height)
+        self.captures += 1
+
+    def pose(self, obj, alpha: float):
+        """
+        obj's pose alpha of the way from its previous pose to its current
+        one, or None to draw obj as it is.
+        """
+        previous = self.previous.get(obj)
+        if previous is not None:
+            position, rotation, width, height = previous
+        elif getattr(obj, "previous_position", None) is not None and getattr(
+            obj, "interpolate", True
+        ):
+            # Kept by obj itself, which is square like any ppb.Sprite.
+            position = obj.previous_position
+            rotation = obj.rotation
+            width = height = obj.previous_size
+        else:
+            return None
+        current = obj.position
+        if (
+            position == current
+            and rotation == obj.rotation
+            and width == obj.width
+            and height == obj.height
+        ):
+            return None
+        # Turn the short way round.
+        turn = (obj.rotation - rotation + 180) % 360 - 180
+        return Pose(
+            position + (current - position) * alpha,
+            rotation + turn * alpha,
+            width + (obj.width - width) * alpha,
+            height + (obj.height - height) * alpha,
+        )
+
+
+def get_poses(scene: ppb.Scene) -> PoseBuffer:
+    """
+    The scene's pose buffer, creating it if needed.
+    """
+    poses = getattr(scene, "pose_buffer", None)
+    if poses is None:
+        poses = scene.pose_buffer = PoseBuffer()
+    return poses
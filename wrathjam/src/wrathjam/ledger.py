@@ -0,0 +1,127 @@
+"""
+Hits buffered over a frame and resolved per target.
+
+Collision reports every hurtbox touching a target to the scene's
+`DamageLedger` instead of applying it on the spot. Contacts repeated within
+the frame by the same attack from the same source (a spread of pellets,
+say) count once. When the frame's Update has been handled,
+`systems.ledger.LedgerSystem` resolves the ledger: each target's damage and
+wrath are summed in one pass and the target gets a single
+`events.DamageTaken` with the totals.
+
+How much a hit is worth comes from its attack's `damage` and `wrath_gain`.
+"""
+
+from typing import Callable
+
+import numpy as np
+import ppb
+
+from wrathjam import events
+
+__all__ = ["DamageLedger", "get_ledger"]
+
+
+class DamageLedger:
+    """
+    The hits recorded since the last `resolve`.
+
+    Targets are indexed in the order they were first hit this frame; each
+    hit keeps its target's index and its attack's damage and wrath in
+    parallel lists until resolved.
+    """
+
+    def __init__(self):
+        self.targets: list = []
+        self.target_index: dict = {}
+        self.hit_target: list[int] = []
+        self.hit_damage: list[float] = []
+        self.hit_wrath: list[float] = []
+        self.contacts: set = set()
+        self.pending = False
+        self.frames = 0
+        self.hits = 0
+        self.duplicates = 0
+        self.resolved = 0
+
+    def __len__(self):
+        return len(self.hit_target)
+
+    def record(self, hurtbox, target, signal: Callable[[object], None] = None) -> bool:
+        """
+        Buffer hurtbox hitting target.
+
+        Returns False if its attack and source already hit target this
+        frame. The first hit of a frame signals `events.ResolveDamage`.
+        """
+        attack = hurtbox.attack
+        contact = (attack, hurtbox.source, target)
+        if contact in self.contacts:
+            self.duplicates += 1
+            return False
+        self.contacts.add(contact)
+        index = self.target_index.get(target)
+        if index is None:
+            index = self.target_index[target] = len(self.targets)
+            self.targets.append(target)
+        self.hit_target.append(index)
+        self.hit_damage.append(attack.damage)
+        self.hit_wrath.append(attack.wrath_gain)
+        self.hits += 1
+        if not self.pending and signal is not None:
+            self.pending = True
+            signal(events.ResolveDamage())
+        return True
+
+    def resolve(self) -> list[tuple[object, events.DamageTaken]]:
+        """
+        Each target hit since the last resolve with its totals. The ledger
+        starts over empty.
+        """
+        targets = self.targets
+        count = len(targets)
+        hit_target = np.array(self.hit_target, dtype=np.intp)
+        damage = np.bincount(hit_target, weights=self.hit_damage, minlength=count)
+        wrath = np.bincount(hit_target, weights=self.hit_wrath, minlength=count)
+        hits = np.bincount(hit_target, minlength=count)
+        self.clear()
+        if not count:
+            return []
+        self.frames += 1
+        self.resolved += count
+        return list(
+            zip(
+                targets,
+                map(events.DamageTaken, damage.tolist(), wrath.tolist(), hits.tolist()),
+            )
+        )
+
+    def clear(self) -> None:
+        self.targets = []
+        self.target_index = {}
+        self.hit_target = []
+        self.hit_damage = []
+        self.hit_wrath = []
+        self.contacts = set()
+        self.pending = False
+
+    def stats(self) -> dict:
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "hits": self.hits,
+            "duplicates": self.duplicates,
+            "events": self.resolved,
+            "targets_per_frame": self.resolved / frames,
+            "hits_per_frame": self.hits / frames,
+        }
+
+
+def get_ledger(scene: ppb.Scene) -> DamageLedger:
+    """
+    The scene's damage ledger, creating it if needed.
+    """
+    ledger = getattr(scene, "damage_ledger", None)
+    if ledger is None:
+        ledger = scene.damage_ledger = DamageLedger()
+    return ledger
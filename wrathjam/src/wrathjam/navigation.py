@@ -0,0 +1,215 @@
+"""
+Flow field pathfinding.
+
+One `FlowField` per scene holds, for every cell of a grid over the arena,
+the number of steps to the target's cell and the direction to walk from
+there. Every agent chasing the same target samples it in O(1) instead of
+running its own search.
+
+Distances are a breadth first search from the target's cell over the
+unblocked cells, run as a vectorised wavefront over flat cell indices.
+When the target moves to another cell the old distances, raised by the
+distance between the two cells, are still an upper bound, so the update
+only lowers the cells that got closer instead of starting over.
+"""
+
+from typing import Optional
+
+import numpy as np
+import ppb
+
+__all__ = ["FlowField", "get_field"]
+
+UNREACHABLE = np.iinfo(np.int32).max // 2
+
+# Neighbour offsets as (column, row) in the order of `FlowField.directions`.
+ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+class FlowField:
+    """
+    Steps to a target and steering directions for a grid of cells.
+
+    The grid covers `left` to `left + columns * cell_size` and `bottom` to
+    `bottom + rows * cell_size`. `blocked` is a (rows, columns) boolean
+    array of cells agents can't enter.
+    """
+
+    def __init__(
+        self,
+        left: float = -50,
+        bottom: float = -50,
+        columns: int = 100,
+        rows: int = 100,
+        cell_size: float = 1,
+        blocked: Optional[np.ndarray] = None,
+    ):
+        self.left = left
+        self.bottom = bottom
+        self.columns = columns
+        self.rows = rows
+        self.cell_size = cell_size
+        # A border of blocked cells means neighbours never need bounds
+        # checks.
+        self.width = columns + 2
+        padded = np.ones((rows + 2, self.width), dtype=bool)
+        padded[1:-1, 1:-1] = False if blocked is None else blocked
+        self.blocked = padded.ravel()
+        self.offsets = np.array([dx + dy * self.width for dx, dy in ORTHOGONAL])
+        self.neighbourhood = np.array(
+            [0] + [dx + dy * self.width for dx, dy in ORTHOGONAL + DIAGONAL]
+        )
+        self.open_cells = np.flatnonzero(~self.blocked)
+        self._owner = np.zeros(self.blocked.shape, dtype=np.intp)
+        self._order = np.arange(0)
+        self.distance = np.full(self.blocked.shape, UNREACHABLE, dtype=np.int32)
+        self.directions = np.zeros(self.blocked.shape + (2,))
+        self.goal: Optional[int] = None
+        self.full_rebuilds = 0
+        self.incremental_rebuilds = 0
+        self.cells_relaxed = 0
+        # Falling back to a full rebuild is cheaper when the target jumps far.
+        self.incremental_limit = max(columns, rows) // 4
+
+    def cell(self, x: float, y: float) -> Optional[int]:
+        """
+        The flat index of the cell holding (x, y), or None off the grid.
+        """
+        column = int((x - self.left) // self.cell_size)
+        row = int((y - self.bottom) // self.cell_size)
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return (row + 1) * self.width + column + 1
+        return None
+
+    def cells(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Flat cell indices for an (n, 2) array of positions, clamped to the
+        grid.
+        """
+        columns = np.clip(
+            ((positions[:, 0] - self.left) // self.cell_size).astype(np.intp),
+            0,
+            self.columns - 1,
+        )
+        rows = np.clip(
+            ((positions[:, 1] - self.bottom) // self.cell_size).astype(np.intp),
+            0,
+            self.rows - 1,
+        )
+        return (rows + 1) * self.width + columns + 1
+
+    def update(self, target: ppb.Vector) -> bool:
+        """
+        Point the field at target. Returns whether anything was rebuilt.
+        """
+        goal = self.cell(target.x, target.y)
+        if goal is None or goal == self.goal or self.blocked[goal]:
+            return False
+        shift = None if self.goal is None else int(self.distance[goal])
+        full = shift is None or shift > self.incremental_limit
+        if full:
+            self.distance.fill(UNREACHABLE)
+            self.full_rebuilds += 1
+        else:
+            reachable = self.distance < UNREACHABLE
+            self.distance[reachable] += shift
+            self.incremental_rebuilds += 1
+        self.goal = goal
+        self.distance[goal] = 0
+        lowered = self._relax(goal)
+        if full:
+            self._steer(self.open_cells)
+        else:
+            # Everything else moved by the same amount, so only cells next
+            # to a lowered one can point somewhere new.
+            around = (lowered[:, None] + self.neighbourhood).ravel()
+            self._steer(self._distinct(around[~self.blocked[around]]))
+        return True
+
+    def _distinct(self, cells: np.ndarray) -> np.ndarray:
+        """
+        cells without repeats. Cheaper than `np.unique` since it doesn't sort.
+        """
+        if len(cells) > len(self._order):
+            self._order = np.arange(len(cells))
+        order = self._order[: len(cells)]
+        owner = self._owner
+        owner[cells] = order
+        return cells[owner[cells] == order]
+
+    def _relax(self, goal: int) -> np.ndarray:
+        """
+        Lower distances in waves out from goal. Returns the cells lowered.
+        """
+        distance = self.distance
+        blocked = self.blocked
+        frontier = np.array([goal])
+        lowered = [frontier]
+        step = 0
+        while len(frontier):
+            step += 1
+            neighbours = (frontier[:, None] + self.offsets).ravel()
+            frontier = self._distinct(
+                neighbours[~blocked[neighbours] & (distance[neighbours] > step)]
+            )
+            distance[frontier] = step
+            lowered.append(frontier)
+        lowered = np.concatenate(lowered)
+        self.cells_relaxed += len(lowered)
+        return lowered
+
+    def _steer(self, cells: np.ndarray) -> None:
+        """
+        Point cells at their closest neighbour, allowing diagonals that
+        don't cut a blocked corner.
+        """
+        distance = self.distance
+        blocked = self.blocked
+        width = self.width
+        best = distance[cells]
+        direction = np.zeros((len(cells), 2))
+        for dx, dy in ORTHOGONAL + DIAGONAL:
+            neighbour = distance[cells + dx + dy * width]
+            better = neighbour < best
+            if dx and dy:
+                better &= ~blocked[cells + dx] & ~blocked[cells + dy * width]
+            best = np.where(better, neighbour, best)
+            direction[better] = (dx, dy)
+        length = np.hypot(direction[:, 0], direction[:, 1])
+        direction /= np.maximum(length, 1)[:, None]
+        self.directions[cells] = direction
+
+    def direction_at(self, position: ppb.Vector) -> Optional[ppb.Vector]:
+        """
+        The unit direction to steer from position, or None off the grid.
+
+        The zero vector means the target's cell, or no way there.
+        """
+        cell = self.cell(position.x, position.y)
+        if cell is None:
+            return None
+        x, y = self.directions[cell]
+        return ppb.Vector(x, y)
+
+    def directions_at(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Steering directions for an (n, 2) array of positions.
+        """
+        return self.directions[self.cells(positions)]
+
+    def steps_to_target(self, position: ppb.Vector) -> Optional[int]:
+        cell = self.cell(position.x, position.y)
+        if cell is None or self.distance[cell] >= UNREACHABLE:
+            return None
+        return int(self.distance[cell])
+
+
+def get_field(scene: ppb.Scene) -> FlowField:
+    """
+    The scene's flow field, creating it if needed.
+    """
+    field = getattr(scene, "flow_field", None)
+    if field is None:
+        field = scene.flow_field = FlowField()
+    return field
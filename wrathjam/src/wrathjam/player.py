@@ -2,17 +2,19 @@ from typing import Literal
 
 import ppb
 
+from wrathjam import assets
 from wrathjam import config
 from wrathjam import controls
 from wrathjam import damage
 from wrathjam import events
+from wrathjam.systems import attacks
 
 DEBUG = config.DEBUG
 
 
 class Sprite(ppb.Sprite):
     size = 1
-    image = ppb.Circle(100, 175, 50)
+    image = assets.Lazy("player")
 
     base_speed = 6
     wrath = 0
@@ -28,6 +30,9 @@ class Sprite(ppb.Sprite):
         2: damage.Attack(),
         3: damage.Attack(),
     }
+    # The attacks above are shared definitions. Each player's cool downs
+    # live in the scene's `attacks.AttackTable`, in these slots.
+    attack_slots: dict[Literal[1, 2, 3], tuple[int, int]] = None
 
     @property
     def speed(self):
@@ -35,22 +40,33 @@ class Sprite(ppb.Sprite):
 
     def on_update(self, event, signal):
         control_state = event.controls
-        attacked = False
-
-        if not attacked and control_state[controls.PRIMARY_ATTACK]:
-            attack = self.primary_attacks[self.wrath_level]
-            attacked = attack(self, event.scene, signal)
-        if not attacked and control_state[controls.SECONDARY_ATTACK]:
-            attack = self.secondary_attacks[self.wrath_level]
-            attacked = attack(self, event.scene, signal)
+        table = attacks.get_table(event.scene)
+        # Slots are freed if this player left the scene since taking them.
+        if (
+            self.attack_slots is None
+            or table.owners[self.attack_slots[1][0]] is not self
+        ):
+            self.attack_slots = {
+                level: (
+                    table.add(self, self.primary_attacks[level]),
+                    table.add(self, self.secondary_attacks[level]),
+                )
+                for level in self.primary_attacks
+            }
+
+        primary, secondary = self.attack_slots[self.wrath_level]
+        if getattr(control_state, controls.PRIMARY_ATTACK):
+            table.request(primary)
+        if getattr(control_state, controls.SECONDARY_ATTACK):
+            table.request(secondary, unless=primary)
         self.move(event)
 
     def move(self, event):
-        vertical = event.controls[controls.VERTICAL]
-        horizontal = event.controls[controls.HORIZONTAL]
-        control_direction = ppb.Vector(horizontal, vertical)
-        if control_direction:
-            control_direction = control_direction.normalize()
+        vertical = getattr(event.controls, controls.VERTICAL)
+        horizontal = getattr(event.controls, controls.HORIZONTAL)
+        if not (vertical or horizontal):
+            return
+        control_direction = ppb.Vector(horizontal, vertical).normalize()
         self.position += control_direction * self.speed * event.time_delta
 
     def on_mouse_motion(self, event: ppb.events.MouseMotion, signal):
@@ -67,11 +83,13 @@ class Sprite(ppb.Sprite):
             return 1
 
     def on_add_wrath_level(self, event, signal):
-        if self.debug_wrath_level < 3:
-            self.debug_wrath_level += 1
-            signal(events.WrathLevelChanged(self.wrath_level))
+        self.change_debug_wrath_level(event.count, signal)
 
     def on_remove_wrath_level(self, event, signal):
-        if self.debug_wrath_level > 1:
-            self.debug_wrath_level -= 1
+        self.change_debug_wrath_level(-event.count, signal)
+
+    def change_debug_wrath_level(self, delta: int, signal):
+        wrath_level = max(1, min(3, self.debug_wrath_level + delta))
+        if wrath_level != self.debug_wrath_level:
+            self.debug_wrath_level = wrath_level
             signal(events.WrathLevelChanged(self.wrath_level))
@@ -0,0 +1,103 @@
+from typing import Callable, Generic, TypeVar
+
+import ppb
+
+__all__ = ["Pool", "get_pool", "get_pools", "report"]
+
+T = TypeVar("T")
+
+
+class Pool(Generic[T]):
+    """
+    A free list of reusable game objects.
+
+    Objects handed out by `acquire` are reset with the provided kwargs and
+    added to the scene. `release` takes them back out of the scene and
+    keeps them around for the next `acquire`.
+
+    Pooled objects must provide a `reset(**kwargs)` method.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], prewarm: int = 0):
+        self.name = name
+        self.factory = factory
+        self.free: list[T] = []
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.peak = 0
+        self.prewarm(prewarm)
+
+    def prewarm(self, count: int) -> None:
+        """
+        Build objects until at least count are waiting in the free list.
+        """
+        while len(self.free) < count:
+            item = self.factory()
+            item.pool = self
+            self.free.append(item)
+
+    def acquire(self, scene: ppb.Scene, **kwargs) -> T:
+        if self.free:
+            item = self.free.pop()
+            self.hits += 1
+        else:
+            item = self.factory()
+            item.pool = self
+            self.misses += 1
+        item.reset(**kwargs)
+        self.in_use += 1
+        if self.in_use > self.peak:
+            self.peak = self.in_use
+        scene.add(item)
+        return item
+
+    def release(self, scene: ppb.Scene, item: T) -> None:
+        scene.remove(item)
+        self.in_use -= 1
+        self.free.append(item)
+
+    @property
+    def size(self) -> int:
+        return self.in_use + len(self.free)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "peak": self.peak,
+            "in_use": self.in_use,
+            "free": len(self.free),
+        }
+
+
+def get_pools(scene: ppb.Scene) -> dict[str, Pool]:
+    """
+    The scene's pools by name, creating the dict if needed.
+
+    Pools belong to their scene, so nothing pooled outlives it or leaks
+    into another scene or engine.
+    """
+    scene_pools = getattr(scene, "object_pools", None)
+    if scene_pools is None:
+        scene_pools = scene.object_pools = {}
+    return scene_pools
+
+
+def get_pool(
+    scene: ppb.Scene, name: str, factory: Callable[[], T], prewarm: int = 0
+) -> Pool[T]:
+    """
+    Get the scene's named pool, building and prewarming it on first use.
+    """
+    scene_pools = get_pools(scene)
+    try:
+        return scene_pools[name]
+    except KeyError:
+        pool = scene_pools[name] = Pool(name, factory, prewarm)
+        return pool
+
+
+def report(scene: ppb.Scene) -> list[dict]:
+    return [pool.stats() for pool in get_pools(scene).values()]
@@ -0,0 +1,219 @@
+"""
+Timings of event dispatch, per event type and per handler.
+
+`Profiler` keeps the most recent samples in a fixed size ring buffer, plus
+running totals for everything it has seen. A sample is
+
+    frame (uint32) | event (uint16) | handler (uint16) | start (float64) | duration (float32)
+
+where event and handler index into `Profiler.names`. The dispatch of a whole
+event is recorded with handler `DISPATCH`, so adding up a frame's dispatch
+samples doesn't count handlers twice. Frames are counted in Updates.
+
+Samples can be written to a compact binary file (read back with
+`read_profile`) or to Chrome's trace format for chrome://tracing or
+Perfetto.
+"""
+
+import json
+import struct
+from typing import Iterator, Optional
+
+__all__ = ["DISPATCH", "Profiler", "read_profile"]
+
+MAGIC = b"WJPF\x01"
+HEADER = struct.Struct("<IH")
+NAME = struct.Struct("<H")
+SAMPLE = struct.Struct("<IHHdf")
+
+DISPATCH = 0
+
+Sample = tuple[int, int, int, float, float]
+
+
+class Profiler:
+    """
+    A ring buffer of timing samples and running totals per name.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.samples: list[Optional[Sample]] = [None] * capacity
+        self.head = 0
+        self.recorded = 0
+        self.frame = 0
+        self.names = ["dispatch"]
+        self.ids = {"dispatch": DISPATCH}
+        self.event_ids: set[int] = set()
+        self.total_seconds = [0.0]
+        self.max_seconds = [0.0]
+        self.calls = [0]
+        self._summary_frame = None
+        self._summary = None
+
+    def clear(self):
+        """
+        Forget every sample and total, keeping the interned names.
+        """
+        self.samples = [None] * self.capacity
+        self.head = 0
+        self.recorded = 0
+        for table in (self.total_seconds, self.max_seconds, self.calls):
+            table[:] = [0] * len(table)
+        self._summary_frame = self._summary = None
+
+    def intern(self, name: str, event: bool = False) -> int:
+        try:
+            return self.ids[name]
+        except KeyError:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.total_seconds.append(0.0)
+            self.max_seconds.append(0.0)
+            self.calls.append(0)
+            if event:
+                self.event_ids.add(index)
+            return index
+
+    def record(self, event: int, handler: int, start: float, duration: float):
+        head = self.head
+        self.samples[head] = (self.frame, event, handler, start, duration)
+        self.head = (head + 1) % self.capacity
+        self.recorded += 1
+        key = handler or event
+        self.total_seconds[key] += duration
+        self.calls[key] += 1
+        if duration > self.max_seconds[key]:
+            self.max_seconds[key] = duration
+
+    @property
+    def dropped(self) -> int:
+        """
+        Samples overwritten since recording started.
+        """
+        return max(0, self.recorded - self.capacity)
+
+    def buffered(self) -> list[Sample]:
+        """
+        The samples still in the buffer, oldest first.
+        """
+        if self.recorded < self.capacity:
+            return self.samples[: self.head]
+        return self.samples[self.head :] + self.samples[: self.head]
+
+    def _newest_first(self) -> Iterator[Sample]:
+        samples = self.samples
+        for offset in range(1, min(self.recorded, self.capacity) + 1):
+            yield samples[self.head - offset]
+
+    def frame_summary(self, frame: int) -> dict:
+        """
+        Total dispatch time and seconds per handler for one buffered frame,
+        slowest handlers first.
+        """
+        if frame == self._summary_frame:
+            return self._summary
+        total = 0.0
+        handlers = {}
+        for sample_frame, event, handler, _, duration in self._newest_first():
+            if sample_frame > frame:
+                continue
+            if sample_frame < frame:
+                break
+            if handler == DISPATCH:
+                total += duration
+            else:
+                name = self.names[handler]
+                handlers[name] = handlers.get(name, 0.0) + duration
+        summary = {
+            "frame": frame,
+            "seconds": total,
+            "handlers": sorted(handlers.items(), key=lambda item: -item[1]),
+        }
+        self._summary_frame, self._summary = frame, summary
+        return summary
+
+    def totals(self) -> dict:
+        """
+        Calls, total and worst seconds for every event type and handler
+        since recording started, slowest first.
+        """
+        events = {}
+        handlers = {}
+        for index, name in enumerate(self.names):
+            calls = self.calls[index]
+            if index == DISPATCH or not calls:
+                continue
+            table = events if index in self.event_ids else handlers
+            table[name] = {
+                "calls": calls,
+                "total_seconds": self.total_seconds[index],
+                "max_seconds": self.max_seconds[index],
+            }
+
+        def slowest_first(table):
+            return dict(
+                sorted(table.items(), key=lambda item: -item[1]["total_seconds"])
+            )
+
+        return {"events": slowest_first(events), "handlers": slowest_first(handlers)}
+
+    def export(self, path: str) -> None:
+        """
+        Write the buffered samples to path in the compact binary format.
+        """
+        samples = self.buffered()
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER.pack(len(samples), len(self.names)))
+            for name in self.names:
+                encoded = name.encode("utf-8")
+                file.write(NAME.pack(len(encoded)))
+                file.write(encoded)
+            for sample in samples:
+                file.write(SAMPLE.pack(*sample))
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Write the buffered samples to path as a Chrome trace (JSON).
+        """
+        write_chrome_trace(path, self.names, self.buffered())
+
+
+def read_profile(path: str) -> tuple[list[str], list[Sample]]:
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a profile.")
+    offset = len(MAGIC)
+    count, name_count = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+    names = []
+    for _ in range(name_count):
+        (length,) = NAME.unpack_from(data, offset)
+        offset += NAME.size
+        names.append(data[offset : offset + length].decode("utf-8"))
+        offset += length
+    end = offset + count * SAMPLE.size
+    samples = list(SAMPLE.iter_unpack(memoryview(data)[offset:end]))
+    return names, samples
+
+
+def write_chrome_trace(path: str, names: list[str], samples: list[Sample]) -> None:
+    origin = samples[0][3] if samples else 0.0
+    trace = []
+    for frame, event, handler, start, duration in samples:
+        trace.append(
+            {
+                "name": names[event] if handler == DISPATCH else names[handler],
+                "cat": "event" if handler == DISPATCH else names[event],
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {"frame": frame},
+            }
+        )
+    with open(path, "w") as file:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
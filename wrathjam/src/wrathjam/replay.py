@@ -0,0 +1,130 @@
+"""
+Recording and replaying physical input.
+
+A log is a short header followed by fixed size records, each stamped with
+the number of Updates that had been published when the input arrived:
+
+    frame (uint32) | kind (uint8) | code (uint16) | x (float32) | y (float32)
+
+Keys and mouse buttons are coded by their index in `KEYS` and `BUTTONS`.
+Mouse motion stores the held buttons as a bitmask in the code field.
+"""
+
+import struct
+from collections import defaultdict
+from typing import BinaryIO, Union
+
+import ppb
+from ppb import buttons
+from ppb import events
+from ppb import keycodes
+
+__all__ = ["InputRecorder", "InputReplay", "read_log"]
+
+MAGIC = b"WJIN\x01"
+RECORD = struct.Struct("<IBHff")
+
+KEY_PRESSED = 1
+KEY_RELEASED = 2
+BUTTON_PRESSED = 3
+BUTTON_RELEASED = 4
+MOUSE_MOTION = 5
+
+
+def _flags(module, kind):
+    return [
+        value for _, value in sorted(vars(module).items()) if isinstance(value, kind)
+    ]
+
+
+KEYS = _flags(keycodes, keycodes.KeyCode)
+BUTTONS = _flags(buttons, buttons.MouseButton)
+KEY_CODES = {key: code for code, key in enumerate(KEYS)}
+BUTTON_CODES = {button: code for code, button in enumerate(BUTTONS)}
+
+Record = tuple[int, int, int, float, float]
+
+
+class InputRecorder:
+    """
+    Appends physical input events to a log file.
+    """
+
+    def __init__(self, path: str):
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(MAGIC)
+        self.records = 0
+
+    def write(self, frame: int, kind: int, code: int, x: float = 0, y: float = 0):
+        self.file.write(RECORD.pack(frame, kind, code, x, y))
+        self.records += 1
+
+    def record(self, frame: int, event) -> None:
+        if isinstance(event, events.KeyPressed):
+            self.write(frame, KEY_PRESSED, KEY_CODES[event.key])
+        elif isinstance(event, events.KeyReleased):
+            self.write(frame, KEY_RELEASED, KEY_CODES[event.key])
+        elif isinstance(event, events.ButtonPressed):
+            x, y = event.position
+            self.write(frame, BUTTON_PRESSED, BUTTON_CODES[event.button], x, y)
+        elif isinstance(event, events.ButtonReleased):
+            x, y = event.position
+            self.write(frame, BUTTON_RELEASED, BUTTON_CODES[event.button], x, y)
+        elif isinstance(event, events.MouseMotion):
+            held = 0
+            for button in event.buttons:
+                held |= 1 << BUTTON_CODES[button]
+            x, y = event.position
+            self.write(frame, MOUSE_MOTION, held, x, y)
+
+    def close(self):
+        self.file.close()
+
+
+def read_log(path: str) -> dict[int, list[Record]]:
+    """
+    Read a log into lists of records keyed by frame.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not an input log.")
+    frames = defaultdict(list)
+    for record in RECORD.iter_unpack(memoryview(data)[len(MAGIC) :]):
+        frames[record[0]].append(record)
+    return dict(frames)
+
+
+class InputReplay:
+    """
+    Turns a recorded log back into input events, frame by frame.
+    """
+
+    def __init__(self, source: Union[str, dict[int, list[Record]]]):
+        self.frames = read_log(source) if isinstance(source, str) else source
+        self.mouse_position = ppb.Vector(0, 0)
+
+    @property
+    def finished(self):
+        return not self.frames
+
+    def events_for(self, frame: int) -> list:
+        return [self.build(record) for record in self.frames.pop(frame, ())]
+
+    def build(self, record: Record):
+        _, kind, code, x, y = record
+        if kind == KEY_PRESSED:
+            return events.KeyPressed(KEYS[code], set())
+        if kind == KEY_RELEASED:
+            return events.KeyReleased(KEYS[code], set())
+        if kind == BUTTON_PRESSED:
+            return events.ButtonPressed(BUTTONS[code], ppb.Vector(x, y))
+        if kind == BUTTON_RELEASED:
+            return events.ButtonReleased(BUTTONS[code], ppb.Vector(x, y))
+        if kind == MOUSE_MOTION:
+            position = ppb.Vector(x, y)
+            delta = position - self.mouse_position
+            self.mouse_position = position
+            held = {button for index, button in enumerate(BUTTONS) if code >> index & 1}
+            return events.MouseMotion(position, delta, held)
+        raise ValueError(f"Unknown input record kind {kind}.")
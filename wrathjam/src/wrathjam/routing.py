@@ -0,0 +1,124 @@
+"""
+Delivering events only to the objects that handle them.
+
+ppb broadcasts every event to every object in the scene and looks up the
+`on_*` handler on each one. For events only a couple of objects care about
+that's a lot of wasted lookups in a scene full of hurtboxes.
+
+A `RoutedScene` keeps a `SubscriberIndex` of its children by the handlers
+they define, updated as children are added and removed.
+`systems.routing.RoutingSystem` uses it to target events in
+`events.ROUTED` at their subscribers, and `systems.culling.CullingSystem`
+the events in `events.CULLED`.
+"""
+
+from typing import Callable
+from typing import Iterable
+
+import ppb
+from ppb.engine import _get_handler_name
+
+from wrathjam import events
+
+__all__ = ["RoutedScene", "SubscriberIndex", "handler_name"]
+
+_handler_names: dict[type, str] = {}
+
+
+def handler_name(event_type: type) -> str:
+    try:
+        return _handler_names[event_type]
+    except KeyError:
+        name = _handler_names[event_type] = _get_handler_name(event_type.__name__)
+        return name
+
+
+class SubscriberIndex:
+    """
+    Objects grouped by the routed event handlers they define.
+
+    Subscribers are kept in insertion order, matching the order a broadcast
+    would visit them.
+    """
+
+    def __init__(self, event_types: Iterable[type] = events.ROUTED):
+        self.handler_names = tuple(handler_name(kind) for kind in event_types)
+        self.subscribers: dict[str, dict] = {name: {} for name in self.handler_names}
+        self._handled: dict[type, tuple[str, ...]] = {}
+
+    def handled_by(self, kind: type) -> tuple[str, ...]:
+        """
+        The routed handlers instances of kind define.
+        """
+        try:
+            return self._handled[kind]
+        except KeyError:
+            handled = self._handled[kind] = tuple(
+                name
+                for name in self.handler_names
+                if callable(getattr(kind, name, None))
+            )
+            return handled
+
+    def add(self, obj) -> None:
+        for name in self.handled_by(type(obj)):
+            self.subscribers[name][obj] = None
+
+    def remove(self, obj) -> None:
+        for name in self.handled_by(type(obj)):
+            self.subscribers[name].pop(obj, None)
+
+    def get(self, name: str) -> Iterable:
+        return self.subscribers.get(name, {}).keys()
+
+
+class RoutedScene(ppb.Scene):
+    """
+    A scene that indexes its children for `systems.routing.RoutingSystem`.
+
+    Only direct children are indexed. Systems that keep their own index of
+    some kind of child can `watch` for them being added and removed.
+    """
+
+    _subscribers = None
+    _watchers = ()
+
+    @property
+    def subscribers(self) -> SubscriberIndex:
+        if self._subscribers is None:
+            self._subscribers = SubscriberIndex(events.ROUTED + events.CULLED)
+            for child in self.children:
+                self._subscribers.add(child)
+        return self._subscribers
+
+    def watch(
+        self,
+        kind: type,
+        added: Callable[[object], None],
+        removed: Callable[[object], None],
+    ) -> None:
+        """
+        Call added with every child of kind, now and as they're added, and
+        removed as they're removed.
+        """
+        self._watchers = (*self._watchers, (kind, added, removed))
+        for child in self.get(kind=kind):
+            added(child)
+
+    def add(self, child, tags=()):
+        child = super().add(child, tags)
+        if self._subscribers is not None:
+            self._subscribers.add(child)
+        for kind, added, _ in self._watchers:
+            if isinstance(child, kind):
+                added(child)
+        return child
+
+    def remove(self, child):
+        child = super().remove(child)
+        if self._subscribers is not None:
+            self._subscribers.remove(child)
+        for kind, _, removed in self._watchers:
+            if isinstance(child, kind):
+                removed(child)
+        return child
@@ -1,19 +1,19 @@
 import ppb
 
+from wrathjam import assets
+
 
 class Scene(ppb.Scene):
     background_color = 200, 50, 50
-    title_font = ppb.Font("wrathjam/resources/EvilEmpire-4BBVK.ttf", size=256)
+    assets = ("title_text",)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.add(
-            ppb.Sprite(
-                image=ppb.Text("WRATH", font=self.title_font, color=(14, 0, 51)), size=4
-            )
-        )
+        self.add(ppb.Sprite(image=assets.registry.asset("title_text"), size=4))
 
     def on_update(self, event, signal):
+        if not event.controls.changed:
+            return
         for value in event.controls.values():
             if value:
                 from wrathjam.scenes import sandbox
@@ -1,15 +1,17 @@
-import ppb
-
 from wrathjam import player
+from wrathjam import routing
 from wrathjam import ui
+from wrathjam import world
 
 
-class Scene(ppb.Scene):
+class Scene(routing.RoutedScene):
     background_color = (0, 0, 0)
+    assets = ("ui_font", "player", "hurtbox")
     camera_set = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.world = world.ChunkedWorld()
 
         self.add(player.Sprite())
         self.add(ui.WrathIndicator())
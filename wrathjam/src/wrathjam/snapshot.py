@@ -0,0 +1,698 @@
+"""
+Binary snapshots of a sandbox scene.
+
+`capture` reads a scene's state into a `Snapshot`: a few NumPy structured
+arrays plus the names they refer to. It covers the simulation clock, the
+players (position, facing, wrath, wrath level and attack slots), the
+enemies (live, and stored in the scene's world), any other target or
+attacker (by class, placement and size, like bench's turrets and dummies),
+the attack table's cool downs, and the hurtbox batch's timing, easing,
+placement and which targets each hurtbox already hit. Other objects aren't
+captured.
+
+`restore` rebuilds a `scenes.sandbox.Scene` from one, ready to hand to the
+engine as its first scene.
+
+On disk a snapshot is a magic number, a JSON header naming each section's
+dtype, offset and length, then the sections' raw bytes, each aligned to
+ALIGNMENT. `Snapshot.open` memory maps a file and reads the sections as
+views of it, without copying.
+"""
+
+import importlib
+import json
+import struct
+from typing import Optional
+
+import numpy as np
+import ppb
+
+from wrathjam import clock
+from wrathjam import damage
+from wrathjam import easing
+from wrathjam import enemies
+from wrathjam import player
+from wrathjam import ui
+from wrathjam import utils
+from wrathjam import world
+from wrathjam.scenes import sandbox
+from wrathjam.systems import ai
+from wrathjam.systems import attacks
+from wrathjam.systems import hurtboxes
+
+__all__ = ["Snapshot", "capture", "load", "restore", "save"]
+
+MAGIC = b"WJSNAP\x02\x00"
+HEADER_LENGTH = struct.Struct("<Q")
+ALIGNMENT = 64
+
+# Owners of attack slots, sources of hurtboxes and targets they hit, as
+# (kind, index).
+NOBODY = 0
+PLAYER = 1
+ENEMY = 2
+OTHER = 3
+
+CLOCK = np.dtype(
+    [("now", "<f8"), ("frame", "<i8"), ("time_scale", "<f8"), ("paused", "?")]
+)
+PLAYERS = np.dtype(
+    [
+        ("position", "<f8", 2),
+        ("facing", "<f8", 2),
+        ("wrath", "<f8"),
+        ("wrath_level", "<i1"),
+        # (primary, secondary) attack table rows per wrath level, or -1.
+        ("attack_slots", "<i4", (3, 2)),
+    ]
+)
+ENEMIES = np.dtype(
+    [
+        ("position", "<f8", 2),
+        ("heading", "<f8", 2),
+        ("facing", "<f8", 2),
+        ("wander_until", "<f8"),
+        ("attack_slot", "<i4"),
+        # Stored enemies are in the world, not the scene.
+        ("live", "?"),
+    ]
+)
+ATTACKS = np.dtype(
+    [
+        ("definition", "<i2"),
+        ("cool_down", "<f8"),
+        ("last_used", "<f8"),
+        ("auto_fire", "?"),
+        ("owner_kind", "<i1"),
+        ("owner", "<i4"),
+    ]
+)
+HURTBOXES = np.dtype(
+    [
+        ("spawn_time", "<f8"),
+        ("life_span", "<f8"),
+        ("start_position", "<f8", 2),
+        ("final_position", "<f8", 2),
+        ("starting_size", "<f8"),
+        ("grow_end", "<f8"),
+        ("grow_start_time", "<f8"),
+        ("grow_end_time", "<f8"),
+        ("movement_ease", "<i2"),
+        ("growth_ease", "<i2"),
+        ("position", "<f8", 2),
+        ("size", "<f8"),
+        ("rotation", "<f8"),
+        ("visual", "<i2"),
+        ("definition", "<i2"),
+        ("source_kind", "<i1"),
+        ("source", "<i4"),
+    ]
+)
+# Targets and attackers that are neither players nor enemies, rebuilt from
+# their class with these attributes.
+OTHERS = np.dtype(
+    [
+        ("kind", "<i2"),
+        ("position", "<f8", 2),
+        ("rotation", "<f8"),
+        ("size", "<f8"),
+    ]
+)
+# One row per target a hurtbox has hit.
+HURTBOX_HITS = np.dtype([("hurtbox", "<i4"), ("target_kind", "<i1"), ("target", "<i4")])
+CHUNKS = np.dtype([("chunk", "<i4", 2)])
+
+SECTIONS = {
+    "clock": CLOCK,
+    "players": PLAYERS,
+    "enemies": ENEMIES,
+    "others": OTHERS,
+    "attacks": ATTACKS,
+    "hurtboxes": HURTBOXES,
+    "hurtbox_hits": HURTBOX_HITS,
+    "generated_chunks": CHUNKS,
+}
+
+# Where eases are looked up by name.
+EASE_MODULES = (utils, easing)
+
+
+class Snapshot:
+    """
+    A scene's state as structured arrays, one per section in `SECTIONS`.
+
+    `names` holds what the arrays refer to by index: attack `definitions`
+    (a class and its instance attributes), the `kinds` of other objects,
+    `eases` and hurtbox `visuals`.
+    """
+
+    def __init__(self, sections: dict[str, np.ndarray], names: dict):
+        self.sections = sections
+        self.names = names
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.sections[name]
+
+    def to_bytes(self) -> bytes:
+        table = []
+        offset = 0
+        for name, dtype in SECTIONS.items():
+            array = self.sections[name]
+            table.append(
+                [name, np.lib.format.dtype_to_descr(dtype), offset, len(array)]
+            )
+            offset += _aligned(array.nbytes)
+        header = json.dumps({"names": self.names, "sections": table}).encode()
+        start = _aligned(len(MAGIC) + HEADER_LENGTH.size + len(header))
+        buffer = bytearray(start + offset)
+        buffer[: len(MAGIC)] = MAGIC
+        HEADER_LENGTH.pack_into(buffer, len(MAGIC), len(header))
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        buffer[header_start : header_start + len(header)] = header
+        view = memoryview(buffer)
+        for (name, _, section_offset, _), dtype in zip(table, SECTIONS.values()):
+            data = np.ascontiguousarray(self.sections[name], dtype=dtype)
+            position = start + section_offset
+            view[position : position + data.nbytes] = data.view(np.uint8).ravel()
+        return bytes(buffer)
+
+    def write(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "Snapshot":
+        """
+        Read a snapshot whose sections are views of buffer.
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        if bytes(data[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a wrathjam snapshot.")
+        (header_length,) = HEADER_LENGTH.unpack_from(data, len(MAGIC))
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        header = json.loads(bytes(data[header_start : header_start + header_length]))
+        start = _aligned(header_start + header_length)
+        sections = {}
+        for name, descr, offset, count in header["sections"]:
+            dtype = np.lib.format.descr_to_dtype(descr)
+            sections[name] = np.frombuffer(
+                data, dtype=dtype, count=count, offset=start + offset
+            )
+        return cls(sections, header["names"])
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """
+        Memory map the snapshot at path.
+        """
+        return cls.from_buffer(np.memmap(path, dtype=np.uint8, mode="r"))
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class _Names:
+    """
+    Indexes objects by identity, in the order they're first seen.
+    """
+
+    def __init__(self):
+        self.objects: list = []
+        self.indices: dict[int, int] = {}
+
+    def index(self, obj) -> int:
+        if obj is None:
+            return -1
+        try:
+            return self.indices[id(obj)]
+        except KeyError:
+            self.objects.append(obj)
+            index = self.indices[id(obj)] = len(self.objects) - 1
+            return index
+
+
+def _name_ease(ease) -> str:
+    for module in EASE_MODULES:
+        for name, value in vars(module).items():
+            if value is ease:
+                return f"{module.__name__}:{name}"
+    raise ValueError(f"Can't snapshot ease {ease!r}: it isn't a module global.")
+
+
+def _name_definition(attack: damage.Attack) -> dict:
+    return {"class": _name_kind(type(attack)), "vars": vars(attack)}
+
+
+def _name_kind(kind: type) -> str:
+    return f"{kind.__module__}:{kind.__qualname__}"
+
+
+def _resolve(name: str):
+    module, _, attribute = name.partition(":")
+    value = importlib.import_module(module)
+    for part in attribute.split("."):
+        value = getattr(value, part)
+    return value
+
+
+def _build_definition(named: dict) -> damage.Attack:
+    kind = _resolve(named["class"])
+    attack = kind.__new__(kind)
+    attack.__dict__.update(named["vars"])
+    return attack
+
+
+def _vectors(vectors) -> np.ndarray:
+    return np.array([(vector.x, vector.y) for vector in vectors]).reshape(-1, 2)
+
+
+def _in_stable_order(objs, table: attacks.AttackTable) -> list:
+    """
+    objs, which come from the scene's unordered kind index, sorted the same
+    way in every process and after restoring: owners of attack slots by
+    their first slot, which restoring keeps in order, then everything else
+    by what's captured of it.
+    """
+
+    def key(obj):
+        slots = table.slots_by_owner.get(obj)
+        return (
+            min(slots) if slots else table.capacity,
+            _name_kind(type(obj)),
+            tuple(obj.position),
+            obj.rotation,
+            obj.size,
+        )
+
+    return sorted(objs, key=key)
+
+
+def capture(scene: ppb.Scene) -> Snapshot:
+    """
+    Read scene's state into a snapshot.
+    """
+    definitions = _Names()
+    simulation_clock = clock.get_clock(scene)
+    clock_section = np.array(
+        [
+            (
+                simulation_clock.now,
+                simulation_clock.frame,
+                simulation_clock.time_scale,
+                simulation_clock.paused,
+            )
+        ],
+        dtype=CLOCK,
+    )
+
+    # Owners first, so attack rows and hurtbox sources can refer to them.
+    table = attacks.get_table(scene)
+    players = _in_stable_order(scene.get(kind=player.Sprite), table)
+    # In roster order, which restoring keeps, rather than the scene's
+    # unordered kind index.
+    roster = ai.get_roster(scene)
+    live_enemies = [
+        actor
+        for actor in roster.actors[: roster.high_water]
+        if isinstance(actor, enemies.Enemy)
+    ]
+    owners = {obj: (PLAYER, index) for index, obj in enumerate(players)}
+    owners.update({obj: (ENEMY, index) for index, obj in enumerate(live_enemies)})
+    others = _in_stable_order(
+        (
+            obj
+            for obj in {
+                *scene.get(kind=damage.Damageable),
+                *table.slots_by_owner,
+            }
+            if obj not in owners and obj in scene.children
+        ),
+        table,
+    )
+    owners.update({obj: (OTHER, index) for index, obj in enumerate(others)})
+    kinds = _Names()
+    other_section = np.zeros(len(others), dtype=OTHERS)
+    other_section["kind"] = [kinds.index(type(obj)) for obj in others]
+    other_section["position"] = _vectors(obj.position for obj in others)
+    other_section["rotation"] = [obj.rotation for obj in others]
+    other_section["size"] = [obj.size for obj in others]
+
+    slots = [
+        slot
+        for slot in np.flatnonzero(table.alive[: table.high_water]).tolist()
+        if table.owners[slot] in owners
+    ]
+    rows = {slot: row for row, slot in enumerate(slots)}
+    attack_section = np.zeros(len(slots), dtype=ATTACKS)
+    attack_section["definition"] = [
+        definitions.index(table.definitions[table.kind[slot]]) for slot in slots
+    ]
+    attack_section["cool_down"] = table.cool_down[slots]
+    attack_section["last_used"] = table.last_used[slots]
+    attack_section["auto_fire"] = table.auto_fire[slots]
+    attack_section["owner_kind"], attack_section["owner"] = (
+        np.array([owners[table.owners[slot]] for slot in slots]).reshape(-1, 2).T
+    )
+
+    player_section = np.zeros(len(players), dtype=PLAYERS)
+    player_section["position"] = _vectors(obj.position for obj in players)
+    player_section["facing"] = _vectors(obj.facing for obj in players)
+    player_section["wrath"] = [obj.wrath for obj in players]
+    player_section["wrath_level"] = [obj.debug_wrath_level for obj in players]
+    player_section["attack_slots"] = -1
+    for index, obj in enumerate(players):
+        for level, pair in (obj.attack_slots or {}).items():
+            player_section["attack_slots"][index, level - 1] = [
+                rows.get(slot, -1) for slot in pair
+            ]
+
+    chunked_world = world.get_world(scene)
+    stored = []
+    if chunked_world is not None:
+        stored = [
+            record
+            for records in chunked_world.stored.values()
+            for name, record in records
+            if name == "enemy"
+        ]
+    enemy_section = np.zeros(len(live_enemies) + len(stored), dtype=ENEMIES)
+    live = enemy_section[: len(live_enemies)]
+    live["position"] = _vectors(obj.position for obj in live_enemies)
+    live["heading"] = _vectors(obj.heading for obj in live_enemies)
+    live["facing"] = _vectors(obj.facing for obj in live_enemies)
+    live["wander_until"] = [obj.wander_until for obj in live_enemies]
+    live["attack_slot"] = [rows.get(obj.attack_slot, -1) for obj in live_enemies]
+    live["live"] = True
+    rest = enemy_section[len(live_enemies) :]
+    for field in ("position", "heading", "facing", "wander_until"):
+        rest[field] = np.array([record[field] for record in stored]).reshape(
+            rest[field].shape
+        )
+    rest["attack_slot"] = -1
+    generated = sorted(chunked_world.generated) if chunked_world is not None else []
+    chunk_section = np.array(generated, dtype=np.int32).reshape(-1, 2).view(CHUNKS)
+    chunk_section = chunk_section.reshape(-1)
+
+    hurtbox_section, hit_section, eases, visuals = _capture_hurtboxes(
+        scene, owners, definitions
+    )
+    return Snapshot(
+        {
+            "clock": clock_section,
+            "players": player_section,
+            "enemies": enemy_section,
+            "others": other_section,
+            "attacks": attack_section,
+            "hurtboxes": hurtbox_section,
+            "hurtbox_hits": hit_section,
+            "generated_chunks": chunk_section,
+        },
+        {
+            "definitions": [_name_definition(obj) for obj in definitions.objects],
+            "kinds": [_name_kind(kind) for kind in kinds.objects],
+            "eases": eases,
+            "visuals": visuals,
+        },
+    )
+
+
+def _capture_hurtboxes(scene: ppb.Scene, owners: dict, definitions: _Names):
+    batch = getattr(scene, "hurtbox_batch", None)
+    if batch is None:
+        return np.zeros(0, dtype=HURTBOXES), np.zeros(0, dtype=HURTBOX_HITS), [], []
+    live = np.flatnonzero(batch.alive[: batch.high_water])
+    section = np.zeros(len(live), dtype=HURTBOXES)
+    for field in (
+        "spawn_time",
+        "life_span",
+        "start_position",
+        "final_position",
+        "starting_size",
+        "grow_end",
+        "grow_start_time",
+        "grow_end_time",
+        "movement_ease",
+        "growth_ease",
+        "position",
+        "size",
+        "rotation",
+        "visual",
+    ):
+        section[field] = getattr(batch, field)[live]
+    sprites = [batch.sprites[slot] for slot in live.tolist()]
+    section["definition"] = [definitions.index(sprite.attack) for sprite in sprites]
+    sources = np.array(
+        [owners.get(sprite.source, (NOBODY, -1)) for sprite in sprites]
+    ).reshape(-1, 2)
+    section["source_kind"] = sources[:, 0]
+    section["source"] = sources[:, 1]
+    # Targets that have left the scene can't be hit again anyway.
+    # Sorted, since hit sets are unordered.
+    hits = np.array(
+        sorted(
+            (row, *owners[target])
+            for row, sprite in enumerate(sprites)
+            for target in sprite.hits
+            if target in owners
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    hit_section = np.zeros(len(hits), dtype=HURTBOX_HITS)
+    hit_section["hurtbox"] = hits[:, 0]
+    hit_section["target_kind"] = hits[:, 1]
+    hit_section["target"] = hits[:, 2]
+    eases = [_name_ease(ease) for ease in batch.eases]
+    return section, hit_section, eases, [list(visual) for visual in batch.visuals]
+
+
+def save(scene: ppb.Scene, path: str) -> Snapshot:
+    snapshot = capture(scene)
+    snapshot.write(path)
+    return snapshot
+
+
+def load(path: str) -> ppb.Scene:
+    """
+    A sandbox scene restored from the snapshot at path.
+    """
+    return restore(Snapshot.open(path))
+
+
+def restore(snapshot: Snapshot, scene: Optional[ppb.Scene] = None) -> ppb.Scene:
+    """
+    Rebuild a scene from snapshot, by default into a new sandbox scene.
+    """
+    if scene is None:
+        scene = sandbox.Scene()
+    definitions = [_build_definition(named) for named in snapshot.names["definitions"]]
+
+    (clock_row,) = snapshot["clock"].tolist()
+    now, frame, time_scale, paused = clock_row
+    simulation_clock = scene.clock = clock.SimulationClock(time_scale)
+    simulation_clock.now = now
+    simulation_clock.frame = frame
+    simulation_clock.paused = paused
+
+    player_section = snapshot["players"]
+    players = list(scene.get(kind=player.Sprite))
+    while len(players) < len(player_section):
+        players.append(scene.add(player.Sprite()))
+    for obj, (x, y), (facing_x, facing_y), wrath, wrath_level in zip(
+        players,
+        player_section["position"].tolist(),
+        player_section["facing"].tolist(),
+        player_section["wrath"].tolist(),
+        player_section["wrath_level"].tolist(),
+    ):
+        obj.position = ppb.Vector(x, y)
+        obj.facing = ppb.Vector(facing_x, facing_y)
+        obj.wrath = wrath
+        obj.debug_wrath_level = wrath_level
+
+    enemy_section = snapshot["enemies"]
+    live = enemy_section[enemy_section["live"]]
+    live_enemies = [
+        enemies.spawn(
+            scene,
+            position=ppb.Vector(*position),
+            heading=ppb.Vector(*heading),
+            facing=ppb.Vector(*facing),
+            wander_until=wander_until,
+        )
+        for position, heading, facing, wander_until in zip(
+            live["position"].tolist(),
+            live["heading"].tolist(),
+            live["facing"].tolist(),
+            live["wander_until"].tolist(),
+        )
+    ]
+    _restore_world(scene, snapshot, enemy_section[~enemy_section["live"]])
+
+    kinds = [_resolve(name) for name in snapshot.names["kinds"]]
+    other_section = snapshot["others"]
+    others = [
+        scene.add(
+            kinds[kind](position=ppb.Vector(*position), rotation=rotation, size=size)
+        )
+        for kind, position, rotation, size in zip(
+            other_section["kind"].tolist(),
+            other_section["position"].tolist(),
+            other_section["rotation"].tolist(),
+            other_section["size"].tolist(),
+        )
+    ]
+
+    # The spawns above took slots of their own; replace the whole table.
+    owners = {PLAYER: players, ENEMY: live_enemies, OTHER: others}
+    table = scene.attack_table = attacks.AttackTable(max(64, len(snapshot["attacks"])))
+    attack_section = snapshot["attacks"]
+    for definition, cool_down, auto_fire, owner_kind, owner in zip(
+        attack_section["definition"].tolist(),
+        attack_section["cool_down"].tolist(),
+        attack_section["auto_fire"].tolist(),
+        attack_section["owner_kind"].tolist(),
+        attack_section["owner"].tolist(),
+    ):
+        table.add(
+            owners[owner_kind][owner], definitions[definition], auto_fire, cool_down
+        )
+    table.last_used[: len(attack_section)] = attack_section["last_used"]
+    # A fresh table hands out slots in row order.
+    for obj, row in zip(live_enemies, live["attack_slot"].tolist()):
+        obj.attack_slot = row if row >= 0 else table.add(obj, obj.attack)
+    for obj, slots in zip(players, player_section["attack_slots"].tolist()):
+        if any(slot < 0 for pair in slots for slot in pair):
+            # Assigned on the player's next Update.
+            obj.attack_slots = None
+        else:
+            obj.attack_slots = {
+                level: tuple(pair) for level, pair in enumerate(slots, start=1)
+            }
+
+    _restore_hurtboxes(scene, snapshot, definitions, owners)
+
+    if players:
+        for indicator in scene.get(kind=ui.WrathIndicator):
+            indicator.wrath = players[0].wrath
+        for indicator in scene.get(kind=ui.WrathLevelIndicator):
+            indicator.wrath_level = players[0].wrath_level
+    return scene
+
+
+def _restore_world(scene: ppb.Scene, snapshot: Snapshot, stored: np.ndarray) -> None:
+    chunked_world = world.get_world(scene)
+    if chunked_world is None:
+        return
+    chunked_world.generated.update(
+        map(tuple, snapshot["generated_chunks"]["chunk"].tolist())
+    )
+    for position, heading, facing, wander_until in zip(
+        stored["position"].tolist(),
+        stored["heading"].tolist(),
+        stored["facing"].tolist(),
+        stored["wander_until"].tolist(),
+    ):
+        record = {
+            "position": tuple(position),
+            "heading": tuple(heading),
+            "facing": tuple(facing),
+            "wander_until": wander_until,
+        }
+        chunk = chunked_world.chunk_of(ppb.Vector(*position))
+        chunked_world.stored.setdefault(chunk, []).append(("enemy", record))
+
+
+def _restore_hurtboxes(
+    scene: ppb.Scene, snapshot: Snapshot, definitions: list, owners: dict
+) -> None:
+    section = snapshot["hurtboxes"]
+    batch = scene.hurtbox_batch = hurtboxes.HurtboxBatch(max(256, len(section)))
+    batch.eases = [_resolve(name) for name in snapshot.names["eases"]]
+    batch.visuals = [tuple(visual) for visual in snapshot.names["visuals"]]
+    eases = batch.eases
+    Vector = ppb.Vector
+    for (
+        spawn_time,
+        life_span,
+        start,
+        final,
+        starting_size,
+        grow_end,
+        grow_start_time,
+        grow_end_time,
+        movement_ease,
+        growth_ease,
+        rotation,
+        definition,
+        source_kind,
+        source,
+    ) in zip(
+        *(
+            section[field].tolist()
+            for field in (
+                "spawn_time",
+                "life_span",
+                "start_position",
+                "final_position",
+                "starting_size",
+                "grow_end",
+                "grow_start_time",
+                "grow_end_time",
+                "movement_ease",
+                "growth_ease",
+                "rotation",
+                "definition",
+                "source_kind",
+                "source",
+            )
+        )
+    ):
+        attack = definitions[definition] if definition >= 0 else None
+        fields = dict(
+            spawn_time=spawn_time,
+            position=Vector(*start),
+            final_position=Vector(*final),
+            life_span=life_span,
+            size=starting_size,
+            grow_end=grow_end,
+            grow_start=grow_start_time - spawn_time,
+            grow_time=grow_end_time - grow_start_time,
+            movement_ease=eases[movement_ease],
+            growth_ease=eases[growth_ease],
+            rotation=rotation,
+            attack=attack,
+            source=owners[source_kind][source] if source_kind != NOBODY else None,
+        )
+        if attack is None:
+            hurtbox = scene.add(damage.Hurtbox(**fields))
+        else:
+            hurtbox = attack.hurtbox_pool(scene).acquire(scene, **fields)
+        batch.add(hurtbox)
+
+    # Slots were handed out in row order, so the rest copies straight over.
+    count = len(section)
+    for field in (
+        "grow_start_time",
+        "grow_end_time",
+        "position",
+        "size",
+        "visual",
+    ):
+        getattr(batch, field)[:count] = section[field]
+    batch.previous_position[:count] = section["position"]
+    batch.previous_size[:count] = section["size"]
+    for hurtbox, (x, y), size in zip(
+        batch.sprites[:count],
+        section["position"].tolist(),
+        section["size"].tolist(),
+    ):
+        hurtbox.position = hurtbox.previous_position = Vector(x, y)
+        hurtbox.size = hurtbox.previous_size = size
+    hits = snapshot["hurtbox_hits"]
+    for row, target_kind, target in zip(
+        hits["hurtbox"].tolist(),
+        hits["target_kind"].tolist(),
+        hits["target"].tolist(),
+    ):
+        batch.sprites[row].hits.add(owners[target_kind][target])
@@ -0,0 +1,210 @@
+"""
+Where the time goes between launching the game and its first frame.
+
+`begin` starts a `StartupProfile`: from then on every module imported is
+timed, and `mark` records named points along the way (the engine starting,
+the first frame being presented, ...). `systems.startup.StartupSystem`
+marks the engine's milestones and reports the profile once the deferred
+systems are running. Run ``python -m wrathjam --profile-startup`` for a
+report on stderr, or give it a path to write one as JSON.
+
+Without `begin`, `mark` does nothing.
+
+`resolve` turns ``"package.module:attribute"`` names into objects, so
+anything the splash doesn't need can be named now and imported later.
+"""
+
+import importlib
+import sys
+import threading
+from time import perf_counter
+from typing import Optional
+
+__all__ = ["StartupProfile", "begin", "mark", "profile", "resolve"]
+
+
+def resolve(name):
+    """
+    Import and return the object named ``"package.module:attribute"``.
+
+    Anything that isn't a string is returned as it is.
+    """
+    if not isinstance(name, str):
+        return name
+    module, _, attribute = name.partition(":")
+    found = importlib.import_module(module)
+    for part in attribute.split(".") if attribute else ():
+        found = getattr(found, part)
+    return found
+
+
+class _TimedLoader:
+    """
+    Wraps a module's loader to time executing it.
+    """
+
+    def __init__(self, loader, profile: "StartupProfile"):
+        self._loader = loader
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._profile._stack()
+        start = perf_counter()
+        stack.append(0.0)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            children = stack.pop()
+            cumulative = perf_counter() - start
+            if stack:
+                stack[-1] += cumulative
+            self._profile.imported(module.__name__, start, cumulative - children)
+
+
+class _TimingFinder:
+    """
+    A meta path finder that finds nothing itself, but wraps the loader of
+    whatever the finders after it find.
+    """
+
+    def __init__(self, profile: "StartupProfile"):
+        self.profile = profile
+
+    def find_spec(self, fullname, path, target=None):
+        finders = sys.meta_path
+        for finder in finders[finders.index(self) + 1 :]:
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self.profile)
+            return spec
+        return None
+
+
+class StartupProfile:
+    """
+    Import times per module and named marks, in seconds since `started`.
+
+    A module's self time excludes the modules it imported. Imports on other
+    threads (deferred systems loading, say) are timed separately.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.marks: list[tuple[str, float]] = []
+        # (module, seconds since started, self seconds, thread name)
+        self.modules: list[tuple[str, float, float, str]] = []
+        self.systems: list[tuple[str, float]] = []
+        self._local = threading.local()
+        self._finder = _TimingFinder(self)
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _stack(self) -> list[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def imported(self, name: str, start: float, self_seconds: float) -> None:
+        self.modules.append(
+            (name, start - self.started, self_seconds, threading.current_thread().name)
+        )
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, perf_counter() - self.started))
+
+    def system(self, name: str, seconds: float) -> None:
+        """
+        Record the time to build and start a system.
+        """
+        self.systems.append((name, seconds))
+
+    def when(self, name: str) -> Optional[float]:
+        return next((at for mark, at in self.marks if mark == name), None)
+
+    def report(self) -> dict:
+        return {
+            "marks": dict(self.marks),
+            "modules": [
+                {"name": name, "at": at, "self_seconds": seconds, "thread": thread}
+                for name, at, seconds, thread in self.modules
+            ],
+            "systems": dict(self.systems),
+        }
+
+    def write(self, path: str) -> None:
+        import json
+
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def format(self, top: int = 20) -> list[str]:
+        """
+        The report as lines of text: marks, then the slowest imports and
+        system starts.
+        """
+        first_frame = self.when("first frame")
+        lines = ["Startup marks:"]
+        previous = 0.0
+        for name, at in self.marks:
+            lines.append(
+                f"  {at * 1000:9.1f} ms  (+{(at - previous) * 1000:7.1f})  {name}"
+            )
+            previous = at
+        before = [
+            module
+            for module in self.modules
+            if first_frame is None or module[1] < first_frame
+        ]
+        lines.append(
+            f"Imports before the first frame: {len(before)} modules, "
+            f"{sum(module[2] for module in before) * 1000:.1f} ms"
+        )
+        for name, at, seconds, thread in sorted(
+            self.modules, key=lambda module: -module[2]
+        )[:top]:
+            when = "before" if first_frame is None or at < first_frame else "after"
+            lines.append(
+                f"  {seconds * 1000:9.2f} ms  {name} ({when} first frame, {thread})"
+            )
+        if self.systems:
+            lines.append("Deferred systems:")
+            for name, seconds in self.systems:
+                lines.append(f"  {seconds * 1000:9.2f} ms  {name}")
+        return lines
+
+
+profile: Optional[StartupProfile] = None
+
+
+def begin() -> StartupProfile:
+    """
+    Start profiling, timing every import from here on.
+    """
+    global profile
+    if profile is None:
+        profile = StartupProfile()
+        profile.install()
+        profile.mark("profiling")
+    return profile
+
+
+def mark(name: str) -> None:
+    if profile is not None:
+        profile.mark(name)
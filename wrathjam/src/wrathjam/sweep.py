@@ -0,0 +1,427 @@
+"""
+Headless balance sweeps of the attacks.
+
+Simulates an attacker firing the swept attacks at rings of orbiting
+targets, once per combination of a grid of attack parameters, on a process
+pool using every core::
+
+    python -m wrathjam sweep results --param punch.cool_down=0.5,0.75,1 \\
+        --param rapid_fire.step=1,2,4 --seconds 30
+
+Parameters are named ``<attack>.<attribute>``, where attack is one of
+`ATTACKS` and attribute any `damage.Attack` attribute (cool_down, reach,
+life_span, size, grow_end, or RapidFire's min, max and step). A run fires
+every attack named in the grid.
+
+Each combination adds a row to the results directory as soon as it
+finishes (see `Results`), so a large sweep can be stopped at any point and
+picks up where it left off when run again with the same grid. Read the
+results back with `read_results`.
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from itertools import product
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterator, get_type_hints
+
+import numpy as np
+import ppb
+from ppb import events
+
+from wrathjam import clock as simulation_clock
+from wrathjam import damage
+from wrathjam import routing
+from wrathjam.systems import attacks
+from wrathjam.systems import clock
+from wrathjam.systems import collision
+from wrathjam.systems import hurtboxes
+from wrathjam.systems import ledger
+
+__all__ = ["ATTACKS", "Results", "read_results", "simulate"]
+
+ATTACKS: dict[str, Callable[[], damage.Attack]] = {
+    "punch": damage.Punch,
+    "kick": damage.Kick,
+    "rapid_fire": lambda: damage.RapidFire(-26, 26, 2),
+}
+DEFAULT_GRID = {
+    "punch.cool_down": [0.5, 0.75, 1],
+    "kick.cool_down": [0.3, 0.4, 0.5],
+    "rapid_fire.step": [1, 2, 4],
+}
+# Targets orbit the attacker at each radius, alternating direction by ring.
+RING_RADII = (1.5, 3, 6)
+TARGETS_PER_RING = 8
+ORBIT_SPEED = 30
+# Coverage is sampled on a grid of points this far apart, this far out.
+COVERAGE_CELL = 0.25
+COVERAGE_EXTENT = 10
+
+VALUE = struct.Struct("<d")
+
+
+class Attacker(ppb.Sprite):
+    """
+    Stands in the middle and sweeps around. Firing is left to its auto
+    firing slots in the scene's attack table.
+    """
+
+    image = None
+    turn_rate = 90
+
+    def on_update(self, event, signal):
+        self.rotate(self.turn_rate * event.time_delta)
+
+
+class Target(damage.Damageable, ppb.Sprite):
+    """
+    Circles the origin on a scripted path.
+    """
+
+    image = None
+    radius = 1
+    speed = ORBIT_SPEED
+    phase = 0
+
+    def on_update(self, event, signal):
+        now = simulation_clock.get_clock(event.scene).now
+        self.position = ppb.Vector(self.radius, 0).rotate(self.phase + self.speed * now)
+
+
+class Results:
+    """
+    A columnar results directory, appended to a row at a time.
+
+    ``columns.json`` names the columns and records the grid they came from;
+    each column is a file of little endian float64s. A row interrupted part
+    way through writing is dropped when the directory is next opened.
+    """
+
+    def __init__(self, path, columns: list[str], grid: dict):
+        self.path = Path(path)
+        self.columns = columns
+        self.grid = grid
+        self.path.mkdir(parents=True, exist_ok=True)
+        schema = self.path / "columns.json"
+        expected = {"columns": columns, "grid": grid}
+        if schema.exists():
+            found = json.loads(schema.read_text())
+            if found != expected:
+                raise ValueError(
+                    f"{self.path} holds results for a different grid or columns."
+                )
+        else:
+            schema.write_text(json.dumps(expected, indent=2))
+        files = [self.path / f"{name}.f8" for name in columns]
+        self.rows = min(
+            (file.stat().st_size // VALUE.size if file.exists() else 0)
+            for file in files
+        )
+        self.files = []
+        for file in files:
+            handle = open(file, "ab")
+            handle.truncate(self.rows * VALUE.size)
+            self.files.append(handle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        for handle in self.files:
+            handle.close()
+
+    def append(self, row: dict) -> None:
+        for name, handle in zip(self.columns, self.files):
+            handle.write(VALUE.pack(row[name]))
+            handle.flush()
+        self.rows += 1
+
+    def jobs(self) -> set[int]:
+        """
+        The jobs already recorded.
+        """
+        return {int(job) for job in read_column(self.path, "job", self.rows)}
+
+
+def read_column(path, name: str, rows: int = None) -> np.ndarray:
+    return np.fromfile(
+        Path(path) / f"{name}.f8", dtype="<f8", count=-1 if rows is None else rows
+    )
+
+
+def read_results(path) -> dict[str, np.ndarray]:
+    """
+    Every complete row of a results directory, as a column per name.
+    """
+    path = Path(path)
+    columns = json.loads((path / "columns.json").read_text())["columns"]
+    data = {name: read_column(path, name) for name in columns}
+    rows = min(len(column) for column in data.values())
+    return {name: column[:rows] for name, column in data.items()}
+
+
+def metric_columns(attack_names: list[str]) -> list[str]:
+    return [
+        "hits_per_second",
+        *(f"{name}.hits_per_second" for name in attack_names),
+        "fired_per_second",
+        "area_covered",
+        "live_mean",
+        "live_peak",
+        "wall_seconds",
+    ]
+
+
+def attack_names(grid: dict) -> list[str]:
+    return sorted({name.split(".", 1)[0] for name in grid})
+
+
+def is_int_attribute(attack: damage.Attack, attribute: str) -> bool:
+    """
+    Whether attack's attribute holds whole numbers: by its annotation, or
+    for attributes set in `__init__`, by its value.
+    """
+    hint = get_type_hints(type(attack)).get(attribute)
+    if hint is None:
+        hint = type(getattr(attack, attribute))
+    return hint is int
+
+
+def build_attacks(params: dict) -> dict[str, damage.Attack]:
+    built = {name: ATTACKS[name]() for name in attack_names(params)}
+    for key, value in params.items():
+        name, attribute = key.split(".", 1)
+        if is_int_attribute(built[name], attribute):
+            # parse_param only lets whole numbers through.
+            value = int(value)
+        setattr(built[name], attribute, value)
+    return built
+
+
+def coverage_points() -> np.ndarray:
+    axis = np.arange(-COVERAGE_EXTENT, COVERAGE_EXTENT, COVERAGE_CELL)
+    axis += COVERAGE_CELL / 2
+    x, y = np.meshgrid(axis, axis)
+    return np.column_stack([x.ravel(), y.ravel()])
+
+
+def simulate(job: int, params: dict, settings: argparse.Namespace) -> dict:
+    """
+    Run one combination of parameters and measure it.
+    """
+    started = perf_counter()
+    random.seed(settings.seed + job)
+    # The firing log would dominate the run.
+    damage.DEBUG = False
+    built = build_attacks(params)
+    engine = ppb.GameEngine(
+        # Routed, so collision tracks the targets as they're added.
+        routing.RoutedScene,
+        basic_systems=(),
+        systems=[
+            clock.ClockSystem,
+            attacks.AttackSystem,
+            hurtboxes.HurtboxSystem,
+            collision.CollisionSystem,
+            ledger.LedgerSystem,
+        ],
+        scene_kwargs={},
+    )
+    points = coverage_points()
+    covered = np.zeros(len(points), dtype=bool)
+    live_total = 0
+    live_peak = 0
+    frames = round(settings.seconds / settings.time_step)
+    with engine:
+        engine.start()
+        while engine.events:
+            engine.publish()
+        scene = engine.current_scene
+        attacker = scene.add(Attacker(turn_rate=settings.turn_rate))
+        table = attacks.get_table(scene)
+        for attack in built.values():
+            table.add(attacker, attack, auto_fire=True)
+        for ring, radius in enumerate(RING_RADII):
+            for index in range(TARGETS_PER_RING):
+                scene.add(
+                    Target(
+                        radius=radius,
+                        speed=ORBIT_SPEED if ring % 2 else -ORBIT_SPEED,
+                        phase=360 * index / TARGETS_PER_RING,
+                        size=1,
+                    )
+                )
+        batch = scene.hurtbox_batch
+        for _ in range(frames):
+            engine.signal(events.Update(settings.time_step))
+            while engine.events:
+                engine.publish()
+            live = batch.alive[: batch.high_water]
+            count = int(live.sum())
+            live_total += count
+            live_peak = max(live_peak, count)
+            if count:
+                centers = batch.position[: batch.high_water][live]
+                radii = batch.size[: batch.high_water][live] / 2
+                offsets = points[:, None, :] - centers[None, :, :]
+                inside = (offsets**2).sum(axis=2) <= radii**2
+                covered |= inside.any(axis=1)
+        seconds = simulation_clock.get_clock(scene).now
+        (collisions,) = (
+            child
+            for child in engine.children
+            if isinstance(child, collision.CollisionSystem)
+        )
+        hits = collisions.stats()
+        fired = table.fired
+
+    row = {"job": job, **params}
+    row["hits_per_second"] = sum(hits.values()) / seconds
+    for name, attack in built.items():
+        row[f"{name}.hits_per_second"] = hits.get(attack.name, 0) / seconds
+    row["fired_per_second"] = fired / seconds
+    row["area_covered"] = covered.sum() * COVERAGE_CELL**2
+    row["live_mean"] = live_total / max(frames, 1)
+    row["live_peak"] = live_peak
+    row["wall_seconds"] = perf_counter() - started
+    return row
+
+
+def combinations(grid: dict) -> Iterator[tuple[int, dict]]:
+    names = list(grid)
+    for job, values in enumerate(product(*grid.values())):
+        yield job, dict(zip(names, values))
+
+
+def parse_param(text: str) -> tuple[str, list[float]]:
+    try:
+        key, values = text.split("=", 1)
+        name, attribute = key.split(".", 1)
+        parsed = [float(value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"{text!r} isn't <attack>.<attribute>=<value>[,<value>...]"
+        )
+    if name not in ATTACKS:
+        raise argparse.ArgumentTypeError(
+            f"Unknown attack {name!r}, expected one of {', '.join(ATTACKS)}."
+        )
+    attack = ATTACKS[name]()
+    if not hasattr(attack, attribute):
+        raise argparse.ArgumentTypeError(f"{name} has no attribute {attribute!r}.")
+    if is_int_attribute(attack, attribute):
+        fractional = [value for value in parsed if not value.is_integer()]
+        if fractional:
+            raise argparse.ArgumentTypeError(
+                f"{key} takes whole numbers, not {fractional[0]:g}."
+            )
+    return key, parsed
+
+
+def print_top(data: dict[str, np.ndarray], grid: dict, count: int) -> None:
+    order = np.argsort(-data["hits_per_second"])[:count]
+    shown = [*grid, "hits_per_second", "area_covered", "live_mean", "live_peak"]
+    print("".join(f"{name:>24}" for name in shown))
+    for row in order.tolist():
+        print("".join(f"{data[name][row]:>24.3f}" for name in shown))
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m wrathjam sweep", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("output", help="The results directory, created if needed.")
+    parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        help="<attack>.<attribute>=<value>[,<value>...], repeatable.",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=30, help="Simulated seconds per run."
+    )
+    parser.add_argument("--time-step", type=float, default=0.016)
+    parser.add_argument(
+        "--turn-rate",
+        type=float,
+        default=90,
+        help="Degrees per second the attacker sweeps around.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Defaults to every core."
+    )
+    parser.add_argument("--top", type=int, default=10, help="Rows to print when done.")
+    return parser
+
+
+def main(argv=None):
+    options = parser().parse_args(argv)
+    grid = dict(options.param) if options.param else DEFAULT_GRID
+    columns = ["job", *grid, *metric_columns(attack_names(grid))]
+    settings = argparse.Namespace(
+        seconds=options.seconds,
+        time_step=options.time_step,
+        turn_rate=options.turn_rate,
+        seed=options.seed,
+    )
+    total = 1
+    for values in grid.values():
+        total *= len(values)
+    try:
+        results = Results(options.output, columns, {**vars(settings), "params": grid})
+    except ValueError as error:
+        sys.exit(str(error))
+
+    with results:
+        done = results.jobs()
+        if done:
+            print(f"Resuming: {len(done)} of {total} runs done.", file=sys.stderr)
+
+        def record(future):
+            row = future.result()
+            results.append(row)
+            print(
+                f"[{results.rows}/{total}] job {row['job']}: "
+                f"{row['hits_per_second']:.2f} hits/s, "
+                f"{row['area_covered']:.1f} area, "
+                f"{row['live_mean']:.1f} live",
+                file=sys.stderr,
+            )
+
+        try:
+            with ProcessPoolExecutor(options.workers) as pool:
+                running = set()
+                for job, params in combinations(grid):
+                    if job in done:
+                        continue
+                    running.add(pool.submit(simulate, job, params, settings))
+                    # Keep the queue short so huge grids aren't submitted up front.
+                    if len(running) >= options.workers * 2:
+                        finished, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future)
+                for future in as_completed(running):
+                    record(future)
+        except KeyboardInterrupt:
+            sys.exit(
+                f"Stopped with {results.rows} of {total} runs recorded, "
+                "run again to resume."
+            )
+
+    print_top(read_results(options.output), grid, options.top)
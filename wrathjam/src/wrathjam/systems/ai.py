@@ -0,0 +1,239 @@
+from time import perf_counter
+from typing import Any, Callable, NamedTuple, Optional
+
+import numpy as np
+import ppb
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import clock
+
+__all__ = ["AIContext", "AIRoster", "AISystem", "get_roster"]
+
+NEAR = 0
+FAR = 1
+OFF_CAMERA = 2
+LEVELS = ("near", "far", "off_camera")
+
+
+class AIContext(NamedTuple):
+    """
+    The world as behaviour trees see it for one frame.
+    """
+
+    scene: ppb.Scene
+    now: float
+    target: Optional[ppb.Sprite]
+
+
+class AIRoster:
+    """
+    The behaviour trees ticking in a scene.
+
+    Each slot holds an actor and the tree that controls it. When each slot
+    last ticked, when it's next due and its level of detail are parallel
+    NumPy arrays, so finding the due slots is one pass.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        self.high_water = 0
+        self.actors: list = []
+        self.trees: list = []
+        self.free: list[int] = []
+        self.slots: dict = {}
+        self.last_tick = np.zeros(0)
+        self.next_tick = np.zeros(0)
+        self.level = np.zeros(0, dtype=np.int8)
+        self.alive = np.zeros(0, dtype=bool)
+        self.cursor = 0
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.high_water - len(self.free)
+
+    def _grow(self, capacity):
+        def extend(array, fill):
+            extended = np.full(capacity, fill, dtype=array.dtype)
+            extended[: self.capacity] = array
+            return extended
+
+        self.last_tick = extend(self.last_tick, np.nan)
+        self.next_tick = extend(self.next_tick, np.inf)
+        self.level = extend(self.level, NEAR)
+        self.alive = extend(self.alive, False)
+        self.actors.extend([None] * (capacity - self.capacity))
+        self.trees.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def add(self, actor, tree: Callable[[Any, Any], Any], now: float) -> int:
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.high_water == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.high_water
+            self.high_water += 1
+        self.actors[slot] = actor
+        self.trees[slot] = tree
+        self.last_tick[slot] = now
+        self.next_tick[slot] = now
+        self.level[slot] = NEAR
+        self.alive[slot] = True
+        self.slots[actor] = slot
+        return slot
+
+    def remove(self, actor) -> None:
+        slot = self.slots.pop(actor)
+        self.actors[slot] = None
+        self.trees[slot] = None
+        self.next_tick[slot] = np.inf
+        self.last_tick[slot] = np.nan
+        self.alive[slot] = False
+        self.free.append(slot)
+
+    def due(self, now: float) -> np.ndarray:
+        """
+        The slots due a tick, starting at the round robin cursor.
+        """
+        due = np.flatnonzero(self.next_tick[: self.high_water] <= now)
+        if not len(due):
+            return due
+        split = np.searchsorted(due, self.cursor)
+        return np.concatenate((due[split:], due[:split]))
+
+    def staleness(self, now: float) -> np.ndarray:
+        """
+        Seconds since each live slot last ticked.
+        """
+        alive = self.alive[: self.high_water]
+        return now - self.last_tick[: self.high_water][alive]
+
+
+def get_roster(scene: ppb.Scene) -> AIRoster:
+    """
+    The scene's AI roster, creating it if needed.
+    """
+    roster = getattr(scene, "ai_roster", None)
+    if roster is None:
+        roster = scene.ai_roster = AIRoster()
+    return roster
+
+
+class AISystem(System):
+    """
+    Ticks misbehave trees for the actors in the scene's `AIRoster`.
+
+    Each Update it ticks the due actors round robin, starting after the last
+    one it reached, until `ai_budget` seconds of wall time are spent. Actors
+    it didn't get to stay due and go first next frame.
+
+    How often an actor is due depends on its level of detail: every frame
+    when it's within `near_distance` of the target (the first
+    `ai_target_kind` sprite in the scene), every `far_interval` seconds
+    further away, and every `off_camera_interval` seconds off the main
+    camera. Trees should set intent (like a heading) that the actor
+    follows every frame, rather than move the actor themselves.
+
+    `stats` reports budget overruns and how stale ticks are.
+    """
+
+    near_distance = 12
+    far_interval = 0.1
+    off_camera_interval = 0.3
+
+    def __init__(
+        self, *, ai_budget: float = 0.002, ai_target_kind: type = None, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.budget = ai_budget
+        self.target_kind = ai_target_kind
+        self.frames = 0
+        self.ticks = 0
+        self.overrun_frames = 0
+        self.deferred_ticks = 0
+        self.max_staleness = 0.0
+        self.last_roster = None
+
+    def find_target(self, scene: ppb.Scene) -> Optional[ppb.Sprite]:
+        if self.target_kind is None:
+            return None
+        return next(iter(scene.get(kind=self.target_kind)), None)
+
+    def on_update(self, event: events.Update, signal):
+        roster = getattr(event.scene, "ai_roster", None)
+        if roster is None or not len(roster):
+            return
+        self.last_roster = roster
+        self.frames += 1
+        scene = event.scene
+        now = clock.get_clock(scene).now
+        due = roster.due(now)
+        if not len(due):
+            return
+
+        context = AIContext(scene, now, self.find_target(scene))
+        camera = getattr(scene, "main_camera", None)
+        deadline = perf_counter() + self.budget
+        actors = roster.actors
+        trees = roster.trees
+        ticked = 0
+        for slot in due.tolist():
+            actor = actors[slot]
+            trees[slot](actor, context)
+            level = self.level_of_detail(actor, context.target, camera)
+            staleness = now - roster.last_tick[slot]
+            if staleness > self.max_staleness:
+                self.max_staleness = staleness
+            roster.last_tick[slot] = now
+            roster.level[slot] = level
+            roster.next_tick[slot] = now + self.interval(level)
+            roster.cursor = slot + 1
+            ticked += 1
+            if perf_counter() > deadline:
+                break
+        self.ticks += ticked
+        if ticked < len(due):
+            self.overrun_frames += 1
+            self.deferred_ticks += len(due) - ticked
+
+    def level_of_detail(self, actor, target, camera) -> int:
+        if camera is not None and not camera.point_is_visible(actor.position):
+            return OFF_CAMERA
+        if target is None:
+            return NEAR
+        if (actor.position - target.position).length > self.near_distance:
+            return FAR
+        return NEAR
+
+    def interval(self, level: int) -> float:
+        if level == NEAR:
+            return 0.0
+        if level == FAR:
+            return self.far_interval
+        return self.off_camera_interval
+
+    def stats(self, now: Optional[float] = None) -> dict:
+        report = {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "budget_ms": self.budget * 1000,
+            "overrun_frames": self.overrun_frames,
+            "deferred_ticks": self.deferred_ticks,
+            "max_staleness_ms": self.max_staleness * 1000,
+        }
+        roster = self.last_roster
+        if roster is not None and len(roster):
+            alive = roster.alive[: roster.high_water]
+            levels = roster.level[: roster.high_water][alive]
+            report["level_of_detail"] = {
+                name: int((levels == level).sum()) for level, name in enumerate(LEVELS)
+            }
+            if now is not None:
+                staleness = roster.staleness(now)
+                report["staleness_ms"] = {
+                    "mean": float(staleness.mean() * 1000),
+                    "p95": float(np.percentile(staleness, 95) * 1000),
+                    "max": float(staleness.max() * 1000),
+                }
+        return report
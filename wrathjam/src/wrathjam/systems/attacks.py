@@ -0,0 +1,201 @@
+from typing import Optional
+
+import numpy as np
+import ppb
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import clock
+from wrathjam import damage
+
+__all__ = ["AttackSystem", "AttackTable", "get_table"]
+
+
+class AttackTable:
+    """
+    Attack state for every attacking entity in a scene.
+
+    Each slot pairs an owner sprite with a `damage.Attack` definition. The
+    definitions are shared and stateless here: cool down and last use live
+    in parallel NumPy arrays indexed by slot, so one pass finds every slot
+    that can fire this frame and only those call `Attack.initiate`.
+
+    Owners `request` their slots each frame they want to attack. Slots
+    added with `auto_fire` fire whenever they're ready. An owner's slots
+    are freed by `remove_owner`, or when they're ready to fire after it has
+    left the scene.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        self.high_water = 0
+        self.owners: list = []
+        self.free: list[int] = []
+        self.definitions: list[damage.Attack] = []
+        self.slots_by_owner: dict = {}
+        self.kind = np.zeros(0, dtype=np.intp)
+        self.cool_down = np.zeros(0)
+        self.last_used = np.zeros(0)
+        self.requested = np.zeros(0, dtype=bool)
+        self.auto_fire = np.zeros(0, dtype=bool)
+        self.unless = np.zeros(0, dtype=np.intp)
+        self.alive = np.zeros(0, dtype=bool)
+        self.fired = 0
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.high_water - len(self.free)
+
+    def _grow(self, capacity):
+        def extend(array, fill):
+            extended = np.full(capacity, fill, dtype=array.dtype)
+            extended[: self.capacity] = array
+            return extended
+
+        self.kind = extend(self.kind, 0)
+        self.cool_down = extend(self.cool_down, 0)
+        self.last_used = extend(self.last_used, -np.inf)
+        self.requested = extend(self.requested, False)
+        self.auto_fire = extend(self.auto_fire, False)
+        self.unless = extend(self.unless, -1)
+        self.alive = extend(self.alive, False)
+        self.owners.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _kind(self, attack: damage.Attack) -> int:
+        for index, definition in enumerate(self.definitions):
+            if definition is attack:
+                return index
+        self.definitions.append(attack)
+        return len(self.definitions) - 1
+
+    def add(
+        self,
+        owner: ppb.Sprite,
+        attack: damage.Attack,
+        auto_fire: bool = False,
+        cool_down: Optional[float] = None,
+    ) -> int:
+        """
+        Give owner a slot for attack. cool_down defaults to the attack's.
+        """
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.high_water == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.high_water
+            self.high_water += 1
+
+        self.kind[slot] = self._kind(attack)
+        self.cool_down[slot] = attack.cool_down if cool_down is None else cool_down
+        self.last_used[slot] = -np.inf
+        self.requested[slot] = False
+        self.auto_fire[slot] = auto_fire
+        self.unless[slot] = -1
+        self.alive[slot] = True
+        self.owners[slot] = owner
+        self.slots_by_owner.setdefault(owner, []).append(slot)
+        return slot
+
+    def remove(self, slot: int) -> None:
+        owner = self.owners[slot]
+        self.slots_by_owner[owner].remove(slot)
+        if not self.slots_by_owner[owner]:
+            del self.slots_by_owner[owner]
+        self.owners[slot] = None
+        self.alive[slot] = False
+        self.requested[slot] = False
+        self.free.append(slot)
+
+    def remove_owner(self, owner: ppb.Sprite) -> None:
+        for slot in list(self.slots_by_owner.get(owner, ())):
+            self.remove(slot)
+
+    def slot(self, owner: ppb.Sprite, attack: damage.Attack) -> int:
+        """
+        owner's slot for attack, adding one if it has none.
+        """
+        for slot in self.slots_by_owner.get(owner, ()):
+            if self.definitions[self.kind[slot]] is attack:
+                return slot
+        return self.add(owner, attack)
+
+    def use(self, owner: ppb.Sprite, attack: damage.Attack, now: float) -> bool:
+        """
+        Mark owner's slot for attack used now, unless it's cooling down.
+
+        For attacks fired outside `update`, like `damage.Attack.__call__`.
+        """
+        slot = self.slot(owner, attack)
+        if now <= self.last_used[slot] + self.cool_down[slot]:
+            return False
+        self.last_used[slot] = now
+        return True
+
+    def request(self, slot: int, unless: int = -1) -> None:
+        """
+        Ask for slot to fire this frame, but not if slot unless fires.
+        """
+        self.requested[slot] = True
+        self.unless[slot] = unless
+
+    def update(self, now: float, scene: ppb.Scene, signal) -> None:
+        """
+        Fire every requested or auto firing slot that is off cool down.
+        """
+        end = self.high_water
+        wanted = (self.requested[:end] | self.auto_fire[:end]) & self.alive[:end]
+        ready = wanted & (now > self.last_used[:end] + self.cool_down[:end])
+        # A slot gives way to the slot it was requested unless.
+        unless = self.unless[:end]
+        blocked = ready & (unless >= 0)
+        if blocked.any():
+            ready[blocked] = ~ready[unless[blocked]]
+        self.requested[:end] = False
+        self.unless[:end] = -1
+
+        slots = np.flatnonzero(ready)
+        if not len(slots):
+            return
+        owners = self.owners
+        children = scene.children
+        gone = [slot for slot in slots.tolist() if owners[slot] not in children]
+        if gone:
+            for owner in {owners[slot] for slot in gone}:
+                self.remove_owner(owner)
+            slots = slots[self.alive[slots]]
+            if not len(slots):
+                return
+        self.last_used[slots] = now
+        self.fired += len(slots)
+        definitions = self.definitions
+        for slot, kind in zip(slots.tolist(), self.kind[slots].tolist()):
+            attack = definitions[kind]
+            if damage.DEBUG:
+                print(f"{attack.name} fired at {now}.")
+            attack.initiate(owners[slot], scene, signal)
+
+
+def get_table(scene: ppb.Scene) -> AttackTable:
+    """
+    The scene's attack table, creating it if needed.
+    """
+    table = getattr(scene, "attack_table", None)
+    if table is None:
+        table = scene.attack_table = AttackTable()
+    return table
+
+
+class AttackSystem(System):
+    """
+    Resolves the running scene's `AttackTable` once per Update.
+
+    Runs before the scene's sprites handle the Update, so requests made in
+    one frame fire at the start of the next.
+    """
+
+    def on_update(self, event: events.Update, signal):
+        table = getattr(event.scene, "attack_table", None)
+        if table is not None and table.high_water:
+            table.update(clock.get_clock(event.scene).now, event.scene, signal)
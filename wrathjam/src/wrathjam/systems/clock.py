@@ -0,0 +1,26 @@
+from ppb import GameEngine
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import clock
+
+__all__ = ["ClockSystem"]
+
+
+class ClockSystem(System):
+    """
+    Advances the running scene's `clock.SimulationClock` once per Update.
+
+    Runs as an Update extension, so every handler sees the new time. The
+    event's `time_delta` is replaced with the scaled simulation delta (zero
+    while paused) and the wall delta is kept as `real_time_delta`.
+    """
+
+    def __init__(self, *, engine: GameEngine, **kwargs):
+        super().__init__(**kwargs)
+        engine.register(events.Update, self.extend_update)
+
+    def extend_update(self, update_event: events.Update):
+        simulation_clock = clock.get_clock(update_event.scene)
+        update_event.real_time_delta = update_event.time_delta
+        update_event.time_delta = simulation_clock.advance(update_event.time_delta)
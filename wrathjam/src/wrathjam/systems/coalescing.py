@@ -0,0 +1,89 @@
+from collections import Counter
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from wrathjam import events
+
+__all__ = ["CoalescingSystem"]
+
+
+class CoalescingSystem(System):
+    """
+    Merges the game's state events into at most one of each per frame.
+
+    Runs as an extension of each coalesced event type. Events signalled
+    during a frame are held back (targeted at nothing) and remembered: the
+    last of each type in `events.LATEST`, and the sum of the deltas in
+    `events.WRATH_LEVEL_DELTAS`. When the next Update is published the
+    merged events are signalled, each with `merged` set to how many events
+    it stands for.
+
+    `received` counts the events held back per type and `delivered` the
+    merged events signalled in their place; see `stats`.
+    """
+
+    def __init__(self, *, engine: GameEngine, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.latest = {}
+        self.merged = Counter()
+        self.wrath_level_delta = 0
+        self.received = Counter()
+        self.delivered = Counter()
+        for event_type in events.LATEST:
+            engine.register(event_type, self.extend_latest)
+        for event_type in events.WRATH_LEVEL_DELTAS:
+            engine.register(event_type, self.extend_wrath_level)
+        engine.register(ppb_events.Update, self.extend_update)
+
+    def extend_latest(self, event):
+        if hasattr(event, "merged"):
+            return
+        self.latest[type(event)] = event
+        self.hold(event, type(event))
+
+    def extend_wrath_level(self, event):
+        if hasattr(event, "merged"):
+            return
+        self.wrath_level_delta += events.WRATH_LEVEL_DELTAS[type(event)] * event.count
+        self.hold(event, events.AddWrathLevel)
+
+    def hold(self, event, group: type):
+        event.__targets__ = ()
+        self.merged[group] += 1
+        self.received[type(event).__name__] += 1
+
+    def extend_update(self, update_event: ppb_events.Update):
+        if not self.merged:
+            return
+        merged_events = list(self.latest.values())
+        self.latest.clear()
+        delta_event = events.wrath_level_delta(self.wrath_level_delta)
+        if delta_event is not None:
+            merged_events.insert(0, delta_event)
+            self.merged[type(delta_event)] = self.merged.pop(events.AddWrathLevel)
+        self.wrath_level_delta = 0
+
+        for event in merged_events:
+            event_type = type(event)
+            event.merged = self.merged[event_type]
+            self.delivered[event_type.__name__] += 1
+            self.engine.signal(event)
+        self.merged.clear()
+
+    def on_scene_stopped(self, event: ppb_events.SceneStopped, signal):
+        self.latest.clear()
+        self.merged.clear()
+        self.wrath_level_delta = 0
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "received": received,
+                "delivered": self.delivered[name],
+                "folded": received - self.delivered[name],
+            }
+            for name, received in self.received.items()
+        }
@@ -0,0 +1,120 @@
+from collections import Counter
+
+import numpy as np
+import ppb
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import collision
+from wrathjam import damage
+from wrathjam import ledger
+from wrathjam import routing
+
+__all__ = ["CollisionSystem"]
+
+
+class CollisionSystem(System):
+    """
+    Detects hurtboxes touching `damage.Damageable` sprites and records the
+    hits in the scene's `ledger.DamageLedger`.
+
+    Targets are kept in a per-scene `collision.TargetIndex`. In a
+    `routing.RoutedScene` targets join and leave it as they're added to and
+    removed from the scene, and each Update only rebuckets the ones that
+    moved; other scenes are rescanned each Update. Each hurtbox queries the
+    cells around the path it swept since the last Update, and every
+    candidate pair is tested in one `collision.swept_circle_hits` call, so
+    fast hurtboxes can't skip over small targets between frames. A hurtbox
+    hits a given target at most once over its life, and never hits its own
+    source. Hits the ledger keeps are counted by attack name in `hits`.
+    """
+
+    cell_size = 2
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.indexes: dict[ppb.Scene, collision.TargetIndex] = {}
+        self.hits: Counter = Counter()
+
+    def on_scene_started(self, event: events.SceneStarted, signal):
+        scene = event.scene
+        index = self.indexes[scene] = collision.TargetIndex(self.cell_size)
+        if isinstance(scene, routing.RoutedScene):
+            scene.watch(damage.Damageable, index.add, index.remove)
+
+    def on_scene_stopped(self, event: events.SceneStopped, signal):
+        self.indexes.pop(event.scene, None)
+
+    def on_update(self, event: events.Update, signal):
+        scene = event.scene
+        index = self.indexes.get(scene)
+        if index is None:
+            return
+        if isinstance(scene, routing.RoutedScene):
+            index.refresh()
+        else:
+            index.sync(scene.get(kind=damage.Damageable))
+        self.detect_hits(scene, index.grid, index.max_radius, signal)
+
+    def detect_hits(
+        self,
+        scene: ppb.Scene,
+        grid: collision.SpatialHash,
+        max_radius: float,
+        signal,
+    ):
+        if not grid.members:
+            return
+
+        pairs = []
+        segments = []
+        targets = []
+        for hurtbox in scene.get(kind=damage.Hurtbox):
+            if hurtbox.attack is None:
+                continue
+            start_x, start_y = hurtbox.previous_position
+            end_x, end_y = hurtbox.position
+            start_radius = hurtbox.previous_size / 2
+            end_radius = hurtbox.size / 2
+            # Query the box around the whole swept path.
+            pad = max(start_radius, end_radius) + max_radius
+            candidates = grid.query_box(
+                min(start_x, end_x) - pad,
+                min(start_y, end_y) - pad,
+                max(start_x, end_x) + pad,
+                max(start_y, end_y) + pad,
+            )
+            segment = (start_x, start_y, end_x, end_y, start_radius, end_radius)
+            source = hurtbox.source
+            hits = hurtbox.hits
+            for target in candidates:
+                if target is source or target in hits:
+                    continue
+                pairs.append((hurtbox, target))
+                segments.append(segment)
+                target_x, target_y = target.position
+                targets.append((target_x, target_y, target.hit_radius))
+        if not pairs:
+            return
+
+        segments = np.array(segments)
+        targets = np.array(targets)
+        hit = collision.swept_circle_hits(
+            segments[:, 0:2],
+            segments[:, 2:4],
+            segments[:, 4],
+            segments[:, 5],
+            targets[:, 0:2],
+            targets[:, 2],
+        )
+        damage_ledger = ledger.get_ledger(scene)
+        for index in np.flatnonzero(hit).tolist():
+            hurtbox, target = pairs[index]
+            # A contact the ledger drops as a duplicate doesn't use up the
+            # hurtbox's hit on target.
+            if damage_ledger.record(hurtbox, target, signal):
+                hurtbox.hits.add(target)
+                self.hits[hurtbox.attack.name] += 1
+
+    def stats(self) -> dict:
+        return dict(self.hits)
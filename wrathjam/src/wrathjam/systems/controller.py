@@ -1,6 +1,7 @@
 from functools import singledispatchmethod
 from typing import Iterable
 from typing import NamedTuple
+from typing import Sequence
 from typing import Union
 
 from ppb import GameEngine
@@ -9,7 +10,16 @@ from ppb import events
 from ppb import keycodes as key
 from ppb.systemslib import System
 
-__all__ = ["ButtonAxis", "MomentarySwitch", "FireEvent", "ControllerSystem"]
+from wrathjam import replay
+
+__all__ = [
+    "ButtonAxis",
+    "MomentarySwitch",
+    "FireEvent",
+    "ControlState",
+    "ControllerSystem",
+    "control_state_type",
+]
 
 
 PhysicalInput = Union[buttons.MouseButton, key.KeyCode]
@@ -50,6 +60,80 @@ class MomentarySwitch(NamedTuple):
 SoftwareInput = Union[ButtonAxis, MomentarySwitch, FireEvent]
 
 
+class ControlState:
+    """
+    The value of every control for one frame.
+
+    Concrete types are generated by `control_state_type` with one slot per
+    control, so `state.horizontal` is a plain attribute read. Dict style
+    access (`state["horizontal"]`, `values()`, ...) still works.
+
+    `changed` is a bitmask of the controls that received input since the
+    previous frame (see `bit`) and `version` counts the frames where
+    anything changed.
+    """
+
+    __slots__ = ()
+    _names: tuple = ()
+    _bits: dict = {}
+
+    def __getitem__(self, name: str):
+        if name not in self._bits:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._bits
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def get(self, name: str, default=None):
+        return getattr(self, name) if name in self._bits else default
+
+    def keys(self):
+        return self._names
+
+    def values(self):
+        return [getattr(self, name) for name in self._names]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self._names]
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    @classmethod
+    def bit(cls, name: str) -> int:
+        return cls._bits[name]
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({values})"
+
+
+def control_state_type(names: Sequence[str]) -> type[ControlState]:
+    """
+    Build a `ControlState` subclass with a slot for each control name.
+    """
+    names = tuple(names)
+    for name in names:
+        if not name.isidentifier() or name in ("changed", "version"):
+            raise ValueError(f"{name!r} can't be used as a control name.")
+    return type(
+        "ControlState",
+        (ControlState,),
+        {
+            "__slots__": names + ("changed", "version"),
+            "_names": names,
+            "_bits": {name: 1 << index for index, name in enumerate(names)},
+        },
+    )
+
+
 class ControllerSystem(System):
     """
     A controller subsystem for translating inputs into events or single
@@ -61,9 +145,18 @@ class ControllerSystem(System):
     An option kwarg to add to `GameEngine` is `key_config` which can
     override your default controls.
     To access controls:
-    In your on_update handlers, look for a controls dict, using the names
-    defined in your config objects. Impulses do not have associated values,
-    they emit the event you declared.
+    In your on_update handlers, look for a controls attribute, a
+    `ControlState` with an attribute for each name defined in your config
+    objects. It also supports dict style access. Impulses do not have
+    associated values, they emit the event you declared.
+
+    The controls object is one of two preallocated buffers that alternate
+    between frames, so it is only valid until the next Update. Call
+    `copy()` to keep the values around.
+
+    Pass `record_inputs` (a file path) to log every physical input, or
+    `replay_inputs` (a path) to feed a previously recorded log back in,
+    frame for frame. See `wrathjam.replay`.
     """
 
     def __init__(
@@ -72,6 +165,8 @@ class ControllerSystem(System):
         engine: GameEngine,
         inputs: Iterable[SoftwareInput],
         key_config: dict = None,
+        record_inputs: str = None,
+        replay_inputs: str = None,
         **kwargs,
     ):
         """
@@ -82,14 +177,34 @@ class ControllerSystem(System):
         :param inputs: An iterable of Axis, Switch, or Impulse objects.
         :param key_config: A dictionary of string names and key or button
         values.
+        :param record_inputs: A path to record physical inputs to.
+        :param replay_inputs: A path to a recording to replay.
         :param kwargs: Additional kwargs, required in ppb Systems.
         """
         super().__init__(inputs=inputs, key_config=key_config, **kwargs)
+        self.__frame = 0
+        self.__signal = engine.signal
+        self.__recorder = None
+        self.__replay = None
+        if record_inputs:
+            self.__recorder = replay.InputRecorder(record_inputs)
+        if replay_inputs:
+            self.__replay = replay.InputReplay(replay_inputs)
+            for event in self.__replay.events_for(0):
+                engine.signal(event)
         self.__values = {}
         self.__inputs = {}
         self.__key_config = key_config or {}
         for i in inputs:
             self.add_control(i)
+        state_type = control_state_type(self.__values)
+        self.__buffers = state_type(), state_type()
+        for buffer in self.__buffers:
+            for name, value in self.__values.items():
+                setattr(buffer, name, value)
+            buffer.changed = 0
+            buffer.version = 0
+        self.__pending, self.__published = self.__buffers
         engine.register(events.Update, self.extend_update)
 
     @singledispatchmethod
@@ -120,7 +235,32 @@ class ControllerSystem(System):
         self.__inputs[key_value] = switch.name, 1
 
     def extend_update(self, update_event: events.Update):
-        update_event.controls = self.__values.copy()
+        # Publish the buffer input has been writing to, and carry its values
+        # over to the other buffer, which takes the next frame's input.
+        published, pending = self.__pending, self.__published
+        for name in published._names:
+            setattr(pending, name, getattr(published, name))
+        if published.changed:
+            published.version += 1
+        pending.version = published.version
+        pending.changed = 0
+        self.__pending, self.__published = pending, published
+        update_event.controls = published
+
+        self.__frame += 1
+        if self.__replay is not None:
+            # Queued behind this Update, so replayed input lands between it
+            # and the next one, the same as when it was recorded.
+            for event in self.__replay.events_for(self.__frame):
+                self.__signal(event)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.__recorder is not None:
+            self.__recorder.close()
+
+    def record(self, event):
+        if self.__recorder is not None:
+            self.__recorder.record(self.__frame, event)
 
     def handle_input_activated(
         self, input_value: PhysicalInput, signal_function, position=None
@@ -134,23 +274,35 @@ class ControllerSystem(System):
             else:
                 signal_function(value())
         elif name is not None:
-            self.__values[name] += value
+            self.__change(name, value)
 
     def handle_input_deactivated(self, input_value: PhysicalInput):
         name: str
         value: Union[int, type]
         name, value = self.__inputs.get(input_value, (None, None))
         if name is not None:
-            self.__values[name] -= value
+            self.__change(name, -value)
+
+    def __change(self, name: str, delta: int):
+        pending = self.__pending
+        setattr(pending, name, getattr(pending, name) + delta)
+        pending.changed |= pending.bit(name)
 
     def on_key_pressed(self, key_event: events.KeyPressed, signal):
+        self.record(key_event)
         self.handle_input_activated(key_event.key, signal)
 
     def on_button_pressed(self, button_event: events.ButtonPressed, signal):
+        self.record(button_event)
         self.handle_input_activated(button_event.button, signal, button_event.position)
 
     def on_key_released(self, key_event: events.KeyPressed, signal):
+        self.record(key_event)
         self.handle_input_deactivated(key_event.key)
 
     def on_button_released(self, button_event: events.ButtonReleased, signal):
+        self.record(button_event)
         self.handle_input_deactivated(button_event.button)
+
+    def on_mouse_motion(self, motion_event: events.MouseMotion, signal):
+        self.record(motion_event)
@@ -0,0 +1,78 @@
+from itertools import chain
+
+from ppb import events as ppb_events
+
+from wrathjam import clock
+from wrathjam import culling
+from wrathjam import events
+from wrathjam import routing
+from wrathjam.systems.routing import RoutingSystem
+
+__all__ = ["CullingSystem"]
+
+
+class CullingSystem(RoutingSystem):
+    """
+    Leaves objects the main camera can't see out of the events in
+    `events.CULLED`.
+
+    Each PreRender it refreshes the scene's `culling.Visibility` from the
+    main camera, padded by `cull_margin` game units, and targets the event
+    at the visible subscribers only. Every subscriber still gets Updates,
+    except off screen objects with an `off_screen_update_interval`: those
+    get one Update per interval of scene time, with `update_elapsed` set to
+    the scene time since their last.
+
+    Only `routing.RoutedScene`s with a main camera are culled.
+    """
+
+    routed_events = events.CULLED
+
+    def __init__(self, *, cull_margin: float = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.margin = cull_margin
+
+    def on_scene_started(self, event: ppb_events.SceneStarted, signal):
+        event.scene.visibility = culling.Visibility(self.margin)
+
+    def extend_routed(self, event):
+        scene = event.scene
+        if event.__targets__ is not None or not isinstance(scene, routing.RoutedScene):
+            return
+        camera = getattr(scene, "main_camera", None)
+        if camera is None:
+            return
+        visibility = culling.get_visibility(scene)
+        name = routing.handler_name(type(event))
+        subscribers = scene.subscribers.get(name)
+        if type(event) is ppb_events.PreRender:
+            updating = scene.subscribers.get(routing.handler_name(ppb_events.Update))
+            visibility.refresh(dict.fromkeys(chain(subscribers, updating)), camera)
+            off_screen = visibility.off_screen
+            shown = [obj for obj in subscribers if obj not in off_screen]
+            visibility.skipped_pre_renders += len(subscribers) - len(shown)
+        else:
+            shown = self.due_updates(scene, subscribers, visibility)
+        event.__targets__ = self.targets(scene, name, shown)
+
+    def due_updates(self, scene, subscribers, visibility: culling.Visibility) -> list:
+        """
+        The subscribers to Update this frame, stamping the ones with an
+        interval.
+        """
+        now = clock.get_clock(scene).now
+        off_screen = visibility.off_screen
+        due = []
+        for obj in subscribers:
+            interval = getattr(obj, "off_screen_update_interval", None)
+            if interval is None:
+                due.append(obj)
+                continue
+            last = getattr(obj, "last_update_time", None)
+            if last is not None and obj in off_screen and now - last < interval:
+                visibility.deferred_updates += 1
+                continue
+            obj.update_elapsed = None if last is None else now - last
+            obj.last_update_time = now
+            due.append(obj)
+        return due
@@ -0,0 +1,253 @@
+import numpy as np
+import ppb
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import clock
+from wrathjam import easing
+
+__all__ = ["HurtboxBatch", "HurtboxSystem", "track"]
+
+
+class HurtboxBatch:
+    """
+    Movement, growth and expiry state for every live hurtbox in a scene.
+
+    State is kept as parallel NumPy arrays indexed by slot so the whole set
+    advances in one pass. Results are written back to the sprites so
+    anything else reading `position` or `size` sees no difference.
+
+    With `particles` set the sprites don't draw themselves: the current
+    `position`, `size` and `rotation` arrays are drawn a visual at a time by
+    `systems.particles.ParticleRenderer` (see `visual_groups`), between
+    `previous_position` and `previous_size`, as of the start of the latest
+    `update`, and the current ones.
+    """
+
+    def __init__(self, capacity: int = 256, particles: bool = False):
+        self.capacity = 0
+        self.high_water = 0
+        self.particles = particles
+        self.sprites: list = []
+        self.free: list[int] = []
+        self.eases: list = []
+        # (layer, asset name) pairs, indexed by the visual array.
+        self.visuals: list = []
+        self.spawn_time = np.zeros(0)
+        self.life_span = np.zeros(0)
+        self.start_position = np.zeros((0, 2))
+        self.final_position = np.zeros((0, 2))
+        self.starting_size = np.zeros(0)
+        self.grow_end = np.zeros(0)
+        self.grow_start_time = np.zeros(0)
+        self.grow_end_time = np.zeros(0)
+        self.movement_ease = np.zeros(0, dtype=np.intp)
+        self.growth_ease = np.zeros(0, dtype=np.intp)
+        self.position = np.zeros((0, 2))
+        self.size = np.zeros(0)
+        self.previous_position = np.zeros((0, 2))
+        self.previous_size = np.zeros(0)
+        self.rotation = np.zeros(0)
+        self.visual = np.zeros(0, dtype=np.intp)
+        self.alive = np.zeros(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.high_water - len(self.free)
+
+    def _grow(self, capacity):
+        def extend(array):
+            extended = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            extended[: self.capacity] = array
+            return extended
+
+        for name in (
+            "spawn_time",
+            "life_span",
+            "start_position",
+            "final_position",
+            "starting_size",
+            "grow_end",
+            "grow_start_time",
+            "grow_end_time",
+            "movement_ease",
+            "growth_ease",
+            "position",
+            "size",
+            "previous_position",
+            "previous_size",
+            "rotation",
+            "visual",
+            "alive",
+        ):
+            setattr(self, name, extend(getattr(self, name)))
+        self.sprites.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _ease_index(self, ease) -> int:
+        try:
+            return self.eases.index(ease)
+        except ValueError:
+            self.eases.append(ease)
+            return len(self.eases) - 1
+
+    def _visual_index(self, hurtbox) -> int:
+        name = hurtbox.drawn_as()
+        if name is None:
+            return -1
+        key = (hurtbox.layer, name)
+        try:
+            return self.visuals.index(key)
+        except ValueError:
+            self.visuals.append(key)
+            return len(self.visuals) - 1
+
+    def add(self, hurtbox) -> int:
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.high_water == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.high_water
+            self.high_water += 1
+
+        start = hurtbox._start_position
+        final = hurtbox.final_position
+        if final is None:
+            final = start
+        self.spawn_time[slot] = hurtbox._spawn_time
+        self.life_span[slot] = hurtbox.life_span
+        self.start_position[slot] = start.x, start.y
+        self.final_position[slot] = final.x, final.y
+        self.starting_size[slot] = hurtbox._starting_size
+        self.movement_ease[slot] = self._ease_index(hurtbox.movement_ease)
+        if hurtbox.grow_end is None:
+            # Growing from starting_size to starting_size is a no-op.
+            self.grow_end[slot] = hurtbox._starting_size
+            self.grow_start_time[slot] = hurtbox._spawn_time
+            self.grow_end_time[slot] = hurtbox._spawn_time + hurtbox.life_span
+        else:
+            self.grow_end[slot] = hurtbox.grow_end
+            self.grow_start_time[slot] = hurtbox._grow_start_time
+            self.grow_end_time[slot] = hurtbox._grow_end_time
+        self.growth_ease[slot] = self._ease_index(hurtbox.growth_ease)
+        self.position[slot] = self.previous_position[slot] = start.x, start.y
+        self.size[slot] = self.previous_size[slot] = hurtbox._starting_size
+        self.rotation[slot] = hurtbox.rotation
+        self.visual[slot] = self._visual_index(hurtbox)
+        self.alive[slot] = True
+        self.sprites[slot] = hurtbox
+        hurtbox.batch = self
+        hurtbox._slot = slot
+        return slot
+
+    def remove(self, slot: int) -> None:
+        hurtbox = self.sprites[slot]
+        hurtbox.batch = None
+        hurtbox._slot = None
+        self.sprites[slot] = None
+        self.alive[slot] = False
+        self.free.append(slot)
+
+    def _ease(self, ease_ids, times):
+        if len(self.eases) == 1:
+            return easing.evaluate(self.eases[0], times)
+        eased = np.empty_like(times)
+        for index, ease in enumerate(self.eases):
+            selected = ease_ids == index
+            if selected.any():
+                eased[selected] = easing.evaluate(ease, times[selected])
+        return eased
+
+    def update(self, now: float, scene: ppb.Scene) -> None:
+        live = np.flatnonzero(self.alive[: self.high_water])
+        if not len(live):
+            return
+        self.previous_position[live] = self.position[live]
+        self.previous_size[live] = self.size[live]
+
+        run_time = now - self.spawn_time[live]
+        life_span = self.life_span[live]
+        expired = run_time >= life_span
+        if expired.any():
+            for slot in live[expired].tolist():
+                self.sprites[slot].expire(scene)
+            keep = ~expired
+            live = live[keep]
+            run_time = run_time[keep]
+            life_span = life_span[keep]
+            if not len(live):
+                return
+
+        t = self._ease(self.movement_ease[live], np.clip(run_time / life_span, 0, 1))
+        start = self.start_position[live]
+        position = start + t[:, None] * (self.final_position[live] - start)
+
+        grow_start_time = self.grow_start_time[live]
+        grow_t = np.clip(
+            (now - grow_start_time) / (self.grow_end_time[live] - grow_start_time),
+            0,
+            1,
+        )
+        grow_t = self._ease(self.growth_ease[live], grow_t)
+        starting_size = self.starting_size[live]
+        size = starting_size + grow_t * (self.grow_end[live] - starting_size)
+        self.position[live] = position
+        self.size[live] = size
+
+        sprites = self.sprites
+        Vector = ppb.Vector
+        for slot, (x, y), s in zip(live.tolist(), position.tolist(), size.tolist()):
+            sprite = sprites[slot]
+            sprite.previous_position = sprite.position
+            sprite.previous_size = sprite.size
+            sprite.position = Vector(x, y)
+            sprite.size = s
+
+    def visual_groups(self):
+        """
+        Yield (layer, asset name, slots) for each visual with live slots.
+        """
+        end = self.high_water
+        live = self.alive[:end]
+        visual = self.visual[:end]
+        for index, (layer, name) in enumerate(self.visuals):
+            slots = np.flatnonzero(live & (visual == index))
+            if len(slots):
+                yield layer, name, slots
+
+
+class HurtboxSystem(System):
+    """
+    Advances every hurtbox in the running scene in one batched pass.
+
+    Each scene gets a `hurtbox_batch` when it starts, unless it already has
+    one (restored from a snapshot, say). Hurtboxes spawned by
+    attacks register with it (see `track`) and skip their own `on_update`.
+    Pass `particle_rendering` when the engine's renderer is a
+    `systems.particles.ParticleRenderer` to draw them from the batch.
+    """
+
+    def __init__(self, *, particle_rendering: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.particle_rendering = particle_rendering
+
+    def on_scene_started(self, event: events.SceneStarted, signal):
+        batch = getattr(event.scene, "hurtbox_batch", None)
+        if batch is None:
+            batch = event.scene.hurtbox_batch = HurtboxBatch()
+        batch.particles = self.particle_rendering
+
+    def on_update(self, event: events.Update, signal):
+        batch = getattr(event.scene, "hurtbox_batch", None)
+        if batch is not None:
+            batch.update(clock.get_clock(event.scene).now, event.scene)
+
+
+def track(scene: ppb.Scene, hurtbox) -> None:
+    """
+    Hand a freshly spawned hurtbox to the scene's batch, if it has one.
+    """
+    batch = getattr(scene, "hurtbox_batch", None)
+    if batch is not None:
+        batch.add(hurtbox)
@@ -0,0 +1,23 @@
+from ppb.systemslib import System
+
+from wrathjam import events
+from wrathjam import ledger
+
+__all__ = ["LedgerSystem"]
+
+
+class LedgerSystem(System):
+    """
+    Resolves the running scene's `ledger.DamageLedger` once a frame.
+
+    The ledger signals `events.ResolveDamage` with the frame's first hit, so
+    it's handled after every handler of the Update that made the hits. Each
+    target hit gets one `events.DamageTaken`, delivered only to it.
+    """
+
+    def on_resolve_damage(self, event: events.ResolveDamage, signal):
+        damage_ledger = getattr(event.scene, "damage_ledger", None)
+        if damage_ledger is None:
+            return
+        for target, damage_taken in damage_ledger.resolve():
+            signal(damage_taken, targets=[target])
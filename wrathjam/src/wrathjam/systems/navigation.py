@@ -0,0 +1,28 @@
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import navigation
+
+__all__ = ["NavigationSystem"]
+
+
+class NavigationSystem(System):
+    """
+    Keeps the running scene's `navigation.FlowField` pointed at the first
+    `ai_target_kind` sprite.
+
+    Only scenes with AI actors (see `systems.ai.AIRoster`) get a field. The
+    field only rebuilds when the target crosses into another cell.
+    """
+
+    def __init__(self, *, ai_target_kind: type = None, **kwargs):
+        super().__init__(**kwargs)
+        self.target_kind = ai_target_kind
+
+    def on_update(self, event: events.Update, signal):
+        roster = getattr(event.scene, "ai_roster", None)
+        if self.target_kind is None or roster is None or not len(roster):
+            return
+        target = next(iter(event.scene.get(kind=self.target_kind)), None)
+        if target is not None:
+            navigation.get_field(event.scene).update(target.position)
@@ -0,0 +1,203 @@
+import ctypes
+
+import numpy as np
+import sdl2
+from ppb import events
+from ppb.systems import Renderer
+from ppb.systems.renderer import SmartPointer
+from ppb.systems.sdl_utils import sdl_call
+
+from wrathjam import assets
+from wrathjam import interpolation
+
+__all__ = ["ParticleRenderer"]
+
+# Matches SDL_Vertex: a float position, RGBA color and float texture
+# coordinate.
+VERTEX = np.dtype([("position", "<f4", 2), ("color", "u1", 4), ("tex_coord", "<f4", 2)])
+assert VERTEX.itemsize == ctypes.sizeof(sdl2.SDL_Vertex)
+
+# Corners of a quad as (x, y) in half extents, counterclockwise from the
+# bottom left, with the texture coordinate of each.
+CORNERS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float32)
+TEX_COORDS = np.array([(0, 1), (1, 1), (1, 0), (0, 0)], dtype=np.float32)
+# Two triangles per quad.
+QUAD_INDICES = np.array([0, 1, 2, 0, 2, 3], dtype=np.int32)
+
+
+class ParticleRenderer(Renderer):
+    """
+    ppb's renderer, plus one batched draw per hurtbox visual.
+
+    Sprites are drawn as ppb draws them: one copy each. The running scene's
+    `hurtbox_batch` is drawn from its arrays instead of its sprites, every
+    live hurtbox sharing a visual in a single `SDL_RenderGeometry` call,
+    slotted in among the sprites by layer.
+
+    When the Render comes from a `systems.simulation.FixedStepUpdater`,
+    everything is drawn between its last two steps (see `interpolation`),
+    and the simulation is let go on while the frame is presented.
+
+    `stats` reports the draw calls made per frame.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.frames = 0
+        self.sprite_draws = 0
+        self.batch_draws = 0
+        self.particles = 0
+        self._indices = np.zeros(0, dtype=np.int32)
+
+    def on_render(self, render_event: events.Render, signal):
+        scene = render_event.scene
+        camera = scene.main_camera
+        self.render_background(scene)
+        self.frames += 1
+
+        simulation = getattr(render_event, "simulation", None)
+        alpha = None
+        poses = None
+        if simulation is not None and simulation.interpolate:
+            alpha = simulation.interpolation
+            poses = interpolation.get_poses(scene)
+
+        batch = getattr(scene, "hurtbox_batch", None)
+        groups = []
+        if batch is not None and batch.particles:
+            groups = sorted(batch.visual_groups(), key=lambda group: group[0])
+        else:
+            batch = None
+        pending = iter(groups)
+        group = next(pending, None)
+
+        for game_object in scene.sprite_layers():
+            layer = getattr(game_object, "layer", 0)
+            while group is not None and group[0] < layer:
+                self.draw_group(batch, group, camera, alpha)
+                group = next(pending, None)
+            if batch is not None and getattr(game_object, "batch", None) is batch:
+                continue
+            texture = self.prepare_resource(game_object)
+            if texture is None:
+                continue
+            drawn = game_object
+            if poses is not None:
+                drawn = poses.pose(game_object, alpha) or game_object
+            src_rect, dest_rect, angle = self.compute_rectangles(
+                texture.inner, drawn, camera
+            )
+            sdl_call(
+                sdl2.SDL_RenderCopyEx,
+                self.renderer,
+                texture.inner,
+                ctypes.byref(src_rect),
+                ctypes.byref(dest_rect),
+                angle,
+                None,
+                sdl2.SDL_FLIP_NONE,
+                _check_error=lambda rv: rv < 0,
+            )
+            self.sprite_draws += 1
+        while group is not None:
+            self.draw_group(batch, group, camera, alpha)
+            group = next(pending, None)
+        if simulation is None:
+            self.present()
+        else:
+            with simulation.unlocked():
+                self.present()
+
+    def present(self) -> None:
+        sdl_call(sdl2.SDL_RenderPresent, self.renderer)
+
+    def visual_texture(self, name: str):
+        """
+        The texture for a registry asset, and its size in pixels.
+        """
+        surface = assets.registry.asset(name).load()
+        try:
+            texture = self._texture_cache[surface]
+        except KeyError:
+            texture = self._texture_cache[surface] = SmartPointer(
+                sdl_call(
+                    sdl2.SDL_CreateTextureFromSurface,
+                    self.renderer,
+                    surface,
+                    _check_error=lambda rv: not rv,
+                ),
+                sdl2.SDL_DestroyTexture,
+            )
+        # Sprites drawn from the same texture may have left it tinted.
+        for call, *arguments in (
+            (sdl2.SDL_SetTextureBlendMode, sdl2.SDL_BLENDMODE_BLEND),
+            (sdl2.SDL_SetTextureAlphaMod, 255),
+            (sdl2.SDL_SetTextureColorMod, 255, 255, 255),
+        ):
+            sdl_call(call, texture.inner, *arguments, _check_error=lambda rv: rv < 0)
+        return texture, (surface.contents.w, surface.contents.h)
+
+    def quad_indices(self, quads: int) -> np.ndarray:
+        if len(self._indices) < quads * 6:
+            count = max(quads, len(self._indices) // 3)
+            self._indices = (
+                QUAD_INDICES + 4 * np.arange(count, dtype=np.int32)[:, None]
+            ).ravel()
+        return self._indices[: quads * 6]
+
+    def draw_group(self, batch, group, camera, alpha: float = None) -> None:
+        """
+        Draw every slot in group with one call, alpha of the way from the
+        previous update if given.
+        """
+        _, name, slots = group
+        texture, (image_width, image_height) = self.visual_texture(name)
+
+        position = batch.position[slots]
+        size = batch.size[slots]
+        if alpha is not None:
+            previous_position = batch.previous_position[slots]
+            previous_size = batch.previous_size[slots]
+            position = previous_position + alpha * (position - previous_position)
+            size = previous_size + alpha * (size - previous_size)
+        # Sized like ppb sizes sprites: the image's short side spans size.
+        scale = size * camera.pixel_ratio / min(image_width, image_height)
+        half = np.stack((scale * image_width / 2, scale * image_height / 2), axis=1)
+        radians = np.radians(batch.rotation[slots])
+        cos = np.cos(radians)[:, None]
+        sin = np.sin(radians)[:, None]
+        offset = CORNERS * half[:, None, :]
+        # Rotate in game space, where y points up, then flip y for the
+        # screen.
+        dx = offset[..., 0] * cos - offset[..., 1] * sin
+        dy = offset[..., 0] * sin + offset[..., 1] * cos
+        center_x = (position[:, 0] - camera.left) * camera.pixel_ratio
+        center_y = (camera.top - position[:, 1]) * camera.pixel_ratio
+
+        vertices = np.empty((len(slots), 4), dtype=VERTEX)
+        vertices["position"][..., 0] = center_x[:, None] + dx
+        vertices["position"][..., 1] = center_y[:, None] - dy
+        vertices["color"] = 255
+        vertices["tex_coord"] = TEX_COORDS
+        indices = self.quad_indices(len(slots))
+        sdl_call(
+            sdl2.SDL_RenderGeometry,
+            self.renderer,
+            texture.inner,
+            vertices.ctypes.data_as(ctypes.POINTER(sdl2.SDL_Vertex)),
+            vertices.size,
+            indices.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+            len(indices),
+            _check_error=lambda rv: rv < 0,
+        )
+        self.batch_draws += 1
+        self.particles += len(slots)
+
+    def stats(self) -> dict:
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "sprite_draws_per_frame": self.sprite_draws / frames,
+            "batch_draws_per_frame": self.batch_draws / frames,
+            "particles_per_frame": self.particles / frames,
+        }
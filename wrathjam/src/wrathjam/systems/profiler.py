@@ -0,0 +1,163 @@
+from inspect import signature
+from itertools import chain
+from time import perf_counter
+from typing import Optional
+
+import ppb
+from ppb import GameEngine
+from ppb import events
+from ppb.errors import BadEventHandlerException
+from ppb.gomlib import walk
+from ppb.systemslib import System
+
+from wrathjam import config
+from wrathjam import profiler
+from wrathjam import ui
+from wrathjam.systems import startup
+
+__all__ = ["ProfilerSystem"]
+
+
+class ProfilerSystem(System):
+    """
+    Opt-in timing of event dispatch.
+
+    Disabled (the default) it does nothing, so the engine publishes exactly
+    as it would without it. With `profile=True` or a `profile_output` path it
+    replaces the engine's `publish` with one that times every extension and
+    handler into a `profiler.Profiler`.
+
+    On exit the buffered samples are written to `profile_output`: Chrome's
+    trace format if the path ends in `.json`, the compact binary format
+    otherwise. With `profile_overlay` on (it follows `config.DEBUG` by
+    default) every scene gets an overlay of the slowest handlers.
+    """
+
+    overlay_lines = 4
+
+    def __init__(
+        self,
+        *,
+        engine: GameEngine,
+        profile: bool = False,
+        profile_output: Optional[str] = None,
+        profile_capacity: int = 1 << 16,
+        profile_overlay: bool = config.DEBUG,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.profile_output = profile_output
+        self.profile_overlay = profile_overlay
+        self.profiler = None
+        if profile or profile_output:
+            self.profiler = profiler.Profiler(profile_capacity)
+            self.extension_ids = {}
+            self.handler_ids = {}
+            self.event_ids = {}
+            engine.publish = self.publish
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.profiler is None or not self.profile_output:
+            return
+        if self.profile_output.endswith(".json"):
+            self.profiler.export_chrome_trace(self.profile_output)
+        else:
+            self.profiler.export(self.profile_output)
+
+    def on_scene_started(self, event: events.SceneStarted, signal):
+        if self.profiler is None or not self.profile_overlay:
+            return
+        for rank in range(self.overlay_lines):
+            event.scene.add(ui.ProfilerOverlay(profiler=self.profiler, rank=rank))
+
+    def event_id(self, event_type: type) -> int:
+        try:
+            return self.event_ids[event_type]
+        except KeyError:
+            index = self.event_ids[event_type] = self.profiler.intern(
+                event_type.__name__, event=True
+            )
+            return index
+
+    def extension_id(self, callback) -> int:
+        try:
+            return self.extension_ids[callback]
+        except KeyError:
+            name = getattr(callback, "__qualname__", repr(callback))
+            index = self.extension_ids[callback] = self.profiler.intern(name)
+            return index
+
+    def handler_id(self, kind: type, handler_name: str) -> int:
+        try:
+            return self.handler_ids[kind, handler_name]
+        except KeyError:
+            name = f"{kind.__qualname__}.{handler_name}"
+            index = self.handler_ids[kind, handler_name] = self.profiler.intern(name)
+            return index
+
+    def handlers(self, targets, handler_name: str):
+        """
+        Yield (object, handler) for each target handling handler_name.
+
+        A `startup.StartupSystem` forwards events to the systems it started,
+        so their handlers are yielded in its place, each under its own
+        system.
+        """
+        for obj in targets:
+            if isinstance(obj, startup.StartupSystem) and obj.installed:
+                for handler in obj.handlers.get(handler_name, ()):
+                    yield handler.__self__, handler
+                continue
+            method = getattr(obj, handler_name, None)
+            if callable(method):
+                yield obj, method
+
+    def publish(self):
+        """
+        `GameEngine.publish`, timing each step.
+
+        Like ppb's, a handler that can't take (event, signal) raises
+        `BadEventHandlerException`.
+        """
+        engine = self.engine
+        record = self.profiler.record
+        event = engine.events.popleft()
+        event_start = perf_counter()
+        event_type = type(event)
+        event_id = self.event_id(event_type)
+        if event_type is events.Update:
+            self.profiler.frame += 1
+        event.scene = engine.current_scene
+
+        for callback in chain(
+            engine.event_extensions[event_type], engine.event_extensions[...]
+        ):
+            start = perf_counter()
+            callback(event)
+            record(event_id, self.extension_id(callback), start, perf_counter() - start)
+
+        handler_name = ppb.engine._get_handler_name(event_type.__name__)
+        if event.__targets__ is not None:
+            targets = list(event.__targets__)
+        else:
+            targets = walk(engine)
+        handler_ids = self.handler_ids
+        signal = engine.signal
+        for obj, method in self.handlers(targets, handler_name):
+            start = perf_counter()
+            try:
+                method(event, signal)
+            except TypeError as ex:
+                try:
+                    signature(method).bind(event, signal)
+                except TypeError:
+                    raise BadEventHandlerException(obj, handler_name, event) from ex
+                raise
+            duration = perf_counter() - start
+            kind = type(obj)
+            handler = handler_ids.get((kind, handler_name))
+            if handler is None:
+                handler = self.handler_id(kind, handler_name)
+            record(event_id, handler, start, duration)
+        record(event_id, profiler.DISPATCH, event_start, perf_counter() - event_start)
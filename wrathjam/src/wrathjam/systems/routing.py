@@ -0,0 +1,56 @@
+from ppb import GameEngine
+from ppb.systemslib import System
+
+from wrathjam import events
+from wrathjam import routing
+
+__all__ = ["RoutingSystem"]
+
+
+class RoutingSystem(System):
+    """
+    Targets the events in `events.ROUTED` at the objects that handle them.
+
+    Runs as an extension of each routed event. In a `routing.RoutedScene`
+    the event's targets become the systems, the scene and the children that
+    define the handler, in the order a broadcast would have visited them.
+    Events in other scenes, or already signalled with targets, are left
+    alone.
+    """
+
+    routed_events = events.ROUTED
+
+    def __init__(self, *, engine: GameEngine, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.system_subscribers = {}
+        for event_type in self.routed_events:
+            engine.register(event_type, self.extend_routed)
+
+    def systems_handling(self, name: str) -> list:
+        try:
+            return self.system_subscribers[name]
+        except KeyError:
+            systems = self.system_subscribers[name] = [
+                child
+                for child in self.engine.children
+                if isinstance(child, System) and callable(getattr(child, name, None))
+            ]
+            return systems
+
+    def targets(self, scene: routing.RoutedScene, name: str, subscribers) -> list:
+        """
+        The systems and scene handling name, followed by subscribers.
+        """
+        targets = list(self.systems_handling(name))
+        if callable(getattr(scene, name, None)):
+            targets.append(scene)
+        targets.extend(subscribers)
+        return targets
+
+    def extend_routed(self, event):
+        scene = event.scene
+        if event.__targets__ is not None or not isinstance(scene, routing.RoutedScene):
+            return
+        name = routing.handler_name(type(event))
+        event.__targets__ = self.targets(scene, name, scene.subscribers.get(name))
@@ -0,0 +1,218 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import ppb
+from ppb import GameEngine
+from ppb import events
+from ppb.systems import Updater
+
+from wrathjam import interpolation
+
+__all__ = ["FixedStepUpdater"]
+
+# Left for the main thread when the simulation has its own: the renderer
+# handles them, and it has to stay on the thread that made the window.
+MAIN_THREAD_EVENTS = (
+    events.StartScene,
+    events.ReplaceScene,
+    events.StopScene,
+    events.SceneStarted,
+    events.SceneStopped,
+    events.ScenePaused,
+    events.SceneContinued,
+)
+
+
+class FixedStepUpdater(Updater):
+    """
+    ppb's Updater at `simulation_rate` steps a second, drawn interpolated.
+
+    Updates are `1 / simulation_rate` seconds apart however often frames
+    are drawn. They're signalled from an Idle extension, so a frame's
+    Updates are always handled before its Render. After a stall at most
+    `max_catch_up` seconds are made up; the rest is dropped.
+
+    Unless `interpolate_rendering` is off, each Update first records the
+    scene's poses (see `interpolation`), and each Render gets `simulation`,
+    this system, whose `interpolation` is how far the frame is into the
+    next step.
+
+    With `threaded_simulation` the Updates are published from a worker
+    thread instead, on their own schedule, so a slow frame doesn't hold
+    them up. One thread publishes at a time: the main thread holds `lock`
+    for each turn of the engine's loop, except while the renderer waits to
+    present the frame (see `unlocked`). The worker stops publishing at the
+    first scene change, which stays at the front of the queue, ahead of
+    everything signalled after it, for the main thread.
+    """
+
+    # Updates are signalled by extend_idle instead.
+    on_idle = None
+
+    def __init__(
+        self,
+        *,
+        engine: GameEngine,
+        simulation_rate: Optional[float] = None,
+        max_catch_up: float = 0.25,
+        threaded_simulation: bool = False,
+        interpolate_rendering: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if simulation_rate:
+            self.time_step = 1 / simulation_rate
+        self.engine = engine
+        self.max_catch_up = max_catch_up
+        self.threaded = threaded_simulation
+        self.interpolate = interpolate_rendering
+        self.interpolation = 1.0
+        self.lock = threading.Lock()
+        self.holder: Optional[int] = None
+        self.waiting = False
+        self.stopping = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+        self.last_step: Optional[float] = None
+        self.steps = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.dropped = 0.0
+        engine.register(events.Idle, self.extend_idle)
+        engine.register(events.Update, self.extend_update)
+        engine.register(events.Render, self.extend_render)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.worker is not None:
+            self.stopping.set()
+            self.worker.join()
+
+    def extend_idle(self, idle_event: events.Idle):
+        if self.threaded:
+            if self.worker is None:
+                self.start_worker()
+            return
+        now = ppb.get_time()
+        if self.last_tick is None:
+            self.last_tick = now
+        self.accumulated_time += now - self.last_tick
+        self.last_tick = now
+        if self.accumulated_time > self.max_catch_up:
+            self.dropped += self.accumulated_time - self.max_catch_up
+            self.accumulated_time = self.max_catch_up
+        steps = 0
+        while self.accumulated_time >= self.time_step:
+            self.accumulated_time -= self.time_step
+            self.engine.signal(events.Update(self.time_step))
+            steps += 1
+        self.count(steps)
+        self.interpolation = self.accumulated_time / self.time_step
+
+    def extend_update(self, update_event: events.Update):
+        if self.interpolate and update_event.scene is not None:
+            interpolation.get_poses(update_event.scene).capture(update_event.scene)
+
+    def extend_render(self, render_event: events.Render):
+        if self.threaded:
+            if self.last_step is None:
+                self.interpolation = 1.0
+            else:
+                behind = ppb.get_time() - self.last_step
+                self.interpolation = min(max(behind / self.time_step, 0.0), 1.0)
+        render_event.simulation = self
+
+    def count(self, steps: int) -> None:
+        if steps:
+            self.steps += steps
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, steps)
+
+    def start_worker(self) -> None:
+        """
+        Move the Updates to a worker thread, once the engine is running.
+        """
+        engine = self.engine
+        loop_once = engine.loop_once
+
+        def locked_loop_once():
+            if self.error is not None:
+                raise self.error
+            # Let a due step in before taking the lock back.
+            while self.waiting:
+                time.sleep(0)
+            with self.lock:
+                self.holder = threading.get_ident()
+                try:
+                    loop_once()
+                finally:
+                    self.holder = None
+
+        engine.loop_once = locked_loop_once
+        self.worker = threading.Thread(
+            target=self.simulate, name="simulation", daemon=True
+        )
+        self.worker.start()
+
+    def simulate(self) -> None:
+        try:
+            next_step = ppb.get_time() + self.time_step
+            while not self.stopping.is_set():
+                now = ppb.get_time()
+                if now < next_step:
+                    self.stopping.wait(next_step - now)
+                    continue
+                if now - next_step > self.max_catch_up:
+                    self.dropped += now - next_step - self.max_catch_up
+                    next_step = now - self.max_catch_up
+                steps = 0
+                self.waiting = True
+                with self.lock:
+                    self.waiting = False
+                    while next_step <= now:
+                        self.step()
+                        self.last_step = next_step
+                        next_step += self.time_step
+                        steps += 1
+                self.count(steps)
+        except BaseException as error:
+            self.error = error
+
+    def step(self) -> None:
+        """
+        Publish one Update, and everything it leads to up to the first scene
+        change.
+        """
+        engine = self.engine
+        queue = engine.events
+        engine.signal(events.Update(self.time_step))
+        while queue and not isinstance(queue[0], MAIN_THREAD_EVENTS):
+            engine.publish()
+
+    @contextmanager
+    def unlocked(self):
+        """
+        Let the simulation run while the main thread waits on something
+        that doesn't touch the game, like presenting a frame.
+        """
+        if self.holder != threading.get_ident():
+            yield
+            return
+        self.holder = None
+        self.lock.release()
+        try:
+            yield
+        finally:
+            self.lock.acquire()
+            self.holder = threading.get_ident()
+
+    def stats(self) -> dict:
+        return {
+            "time_step": self.time_step,
+            "threaded": self.threaded,
+            "steps": self.steps,
+            "steps_per_batch": self.steps / max(self.batches, 1),
+            "largest_batch": self.largest_batch,
+            "dropped_seconds": self.dropped,
+        }
@@ -0,0 +1,191 @@
+import sys
+import threading
+from contextlib import ExitStack
+from time import perf_counter
+from typing import Iterable, Optional
+
+from ppb import GameEngine
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import startup
+
+__all__ = ["StartupSystem"]
+
+
+class StartupSystem(System):
+    """
+    Gets the first frame on screen before loading the rest of the game.
+
+    `deferred_systems` names systems as ``"package.module:Class"``. Once the
+    first frame has been presented they're imported on a background thread,
+    then built (with the engine's kwargs, plus `deferred_kwargs` resolved
+    the same way) and started on the main thread. From then on this system
+    passes every event on to them, in the order given. Only instances of
+    `splash_scenes` run without them: starting any other scene, the first
+    one included, waits for them, so they never miss a scene. With
+    `load_eagerly` they're loaded before the first frame instead.
+
+    It also marks the startup milestones in `startup.profile`. Once the
+    deferred systems are running the profile is written to
+    `startup_report` as JSON, or printed to stderr, and with
+    `quit_after_startup` the engine quits.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: GameEngine,
+        deferred_systems: Iterable[str] = (),
+        deferred_kwargs: Optional[dict] = None,
+        load_eagerly: bool = False,
+        splash_scenes: tuple[type, ...] = (),
+        startup_report: Optional[str] = None,
+        quit_after_startup: bool = False,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.engine_kwargs = kwargs
+        self.deferred_names = list(deferred_systems)
+        self.deferred_kwargs = dict(deferred_kwargs or {})
+        self.splash_scenes = tuple(splash_scenes)
+        self.startup_report = startup_report
+        self.quit_after_startup = quit_after_startup
+        self.systems: list[System] = []
+        self.handlers: dict[str, list] = {}
+        self.exit_stack = ExitStack()
+        self.loader: Optional[threading.Thread] = None
+        self.loaded = None
+        self.load_error = None
+        self.rendered = False
+        self.presented = False
+        self.installed = False
+        self.finished = False
+        engine.register(events.SceneStarted, self.extend_scene_started)
+        engine.register(events.Render, self.extend_render)
+        engine.register(events.Idle, self.extend_idle)
+        for event_type in (events.StartScene, events.ReplaceScene):
+            engine.register(event_type, self.extend_scene_change)
+        startup.mark("systems built")
+        if load_eagerly:
+            self.load()
+            self.install(scene=None)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.exit_stack.__exit__(exc_type, exc_val, exc_tb)
+
+    def __getattr__(self, name):
+        # Only called for handlers this class doesn't define itself.
+        if not name.startswith("on_") or not self.__dict__.get("installed"):
+            raise AttributeError(name)
+        handlers = self.handlers.get(name)
+        if handlers:
+
+            def forward(event, signal):
+                for handler in handlers:
+                    handler(event, signal)
+
+        else:
+            forward = None
+        # The handlers are fixed once installed, so look them up only once.
+        setattr(self, name, forward)
+        return forward
+
+    def load(self) -> None:
+        """
+        Import the deferred systems and their kwargs.
+        """
+        try:
+            self.loaded = (
+                [startup.resolve(name) for name in self.deferred_names],
+                {
+                    key: startup.resolve(value)
+                    for key, value in self.deferred_kwargs.items()
+                },
+            )
+        except BaseException:
+            self.load_error = sys.exc_info()[1]
+        startup.mark("deferred systems imported")
+
+    def install(self, scene) -> None:
+        """
+        Build and start the loaded systems, as if scene just started.
+        """
+        if self.loader is not None:
+            self.loader.join()
+        if self.load_error is not None:
+            raise self.load_error
+        classes, resolved_kwargs = self.loaded
+        kwargs = {**self.engine_kwargs, **resolved_kwargs}
+        for kind in classes:
+            start = perf_counter()
+            system = kind(engine=self.engine, **kwargs)
+            self.exit_stack.enter_context(system)
+            self.systems.append(system)
+            if startup.profile is not None:
+                startup.profile.system(kind.__name__, perf_counter() - start)
+        for system in self.systems:
+            for name in dir(type(system)):
+                if name.startswith("on_"):
+                    self.handlers.setdefault(name, []).append(getattr(system, name))
+        self.installed = True
+        startup.mark("deferred systems started")
+        if scene is not None:
+            started = events.SceneStarted(scene)
+            for handler in self.handlers.get("on_scene_started", ()):
+                handler(started, self.engine.signal)
+
+    def finish_startup(self) -> None:
+        self.finished = True
+        profile = startup.profile
+        if profile is not None:
+            profile.uninstall()
+            if self.startup_report:
+                profile.write(self.startup_report)
+            else:
+                print("\n".join(profile.format()), file=sys.stderr)
+        if self.quit_after_startup:
+            self.engine.signal(events.Quit())
+
+    def extend_scene_started(self, event: events.SceneStarted):
+        if not self.finished:
+            startup.mark(f"{type(event.scene).__name__} started")
+        if not self.installed and not isinstance(event.scene, self.splash_scenes):
+            # Installed before the handlers run, so this SceneStarted
+            # reaches the deferred systems like any other.
+            if self.loader is None:
+                self.load()
+            self.install(scene=None)
+
+    def extend_render(self, event: events.Render):
+        if not self.rendered:
+            self.rendered = True
+            startup.mark("first render")
+
+    def extend_idle(self, event: events.Idle):
+        if self.finished:
+            return
+        if self.rendered and not self.presented:
+            # The Render before this Idle has been presented.
+            self.presented = True
+            startup.mark("first frame")
+            if not self.installed:
+                self.loader = threading.Thread(
+                    target=self.load, name="deferred-systems", daemon=True
+                )
+                self.loader.start()
+        elif (
+            not self.installed
+            and self.loader is not None
+            and not self.loader.is_alive()
+        ):
+            self.install(event.scene)
+        if self.presented and self.installed:
+            self.finish_startup()
+
+    def extend_scene_change(self, event):
+        if not self.installed:
+            if self.loader is None:
+                self.load()
+            self.install(event.scene)
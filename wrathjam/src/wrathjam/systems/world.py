@@ -0,0 +1,41 @@
+from typing import Optional
+
+import ppb
+from ppb import events
+from ppb.systemslib import System
+
+from wrathjam import clock
+from wrathjam import world
+
+__all__ = ["WorldSystem"]
+
+
+class WorldSystem(System):
+    """
+    Streams the running scene's `world.ChunkedWorld` around a focus once
+    per Update.
+
+    The focus is the first `world_focus_kind` sprite in the scene, or the
+    main camera without one. Scenes without a world are left alone.
+    """
+
+    def __init__(self, *, world_focus_kind: type = None, **kwargs):
+        super().__init__(**kwargs)
+        self.focus_kind = world_focus_kind
+
+    def find_focus(self, scene: ppb.Scene) -> Optional[ppb.Vector]:
+        if self.focus_kind is not None:
+            focus = next(iter(scene.get(kind=self.focus_kind)), None)
+            if focus is not None:
+                return focus.position
+        camera = getattr(scene, "main_camera", None)
+        return None if camera is None else camera.position
+
+    def on_update(self, event: events.Update, signal):
+        scene = event.scene
+        chunked_world = world.get_world(scene)
+        if chunked_world is None:
+            return
+        focus = self.find_focus(scene)
+        if focus is not None:
+            chunked_world.update(scene, focus, clock.get_clock(scene).now)
@@ -1,52 +1,274 @@
+from collections import OrderedDict
+
 import ppb
 
+from wrathjam import assets
+
+
+def surface_bytes(text: ppb.Text) -> int:
+    surface = text.load().contents
+    return surface.pitch * surface.h
+
+
+class TextCache:
+    """
+    A least recently used cache of rendered text.
+
+    Keyed by (message, font, color) so indicators flipping between a few
+    values don't re-rasterize them every time.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, ppb.Text] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, message: str, font: ppb.Font, color) -> ppb.Text:
+        key = message, font, color
+        try:
+            text = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            text = self.entries[key] = ppb.Text(message, font=font, color=color)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return text
+
+    @property
+    def texture_bytes(self) -> int:
+        return sum(
+            surface_bytes(text) for text in self.entries.values() if text.is_loaded()
+        )
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "texture_bytes": self.texture_bytes,
+        }
+
+
+text_cache = TextCache()
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered single character images for one font and color.
+    """
+
+    def __init__(self, font: ppb.Font, color, glyphs: str = "-0123456789"):
+        self.font = font
+        self.color = color
+        self.glyphs = {
+            glyph: ppb.Text(glyph, font=font, color=color) for glyph in glyphs
+        }
+        self.aspects = {}
+
+    def aspect(self, glyph: str) -> float:
+        """
+        The width of a glyph when its height is 1.
+        """
+        try:
+            return self.aspects[glyph]
+        except KeyError:
+            surface = self.glyphs[glyph].load().contents
+            aspect = self.aspects[glyph] = surface.w / surface.h
+            return aspect
+
+    @property
+    def texture_bytes(self) -> int:
+        return sum(
+            surface_bytes(text) for text in self.glyphs.values() if text.is_loaded()
+        )
+
+
+atlases: dict[tuple, GlyphAtlas] = {}
+
+
+def get_atlas(font: ppb.Font, color) -> GlyphAtlas:
+    try:
+        return atlases[font, color]
+    except KeyError:
+        atlas = atlases[font, color] = GlyphAtlas(font, color)
+        return atlas
+
+
+def stats() -> dict:
+    return {
+        "text_cache": text_cache.stats(),
+        "atlas_texture_bytes": sum(atlas.texture_bytes for atlas in atlases.values()),
+    }
+
 
 class TextIndicator(ppb.RectangleSprite):
     image = None
+    # Placed relative to the camera every frame.
+    cull = False
+    interpolate = False
     left_offset = 1
     top_offset = 1
     preferred_height = 1
 
     last_rendered = None
-    font = ppb.Font("wrathjam/resources/EvilEmpire-4BBVK.ttf", size=64)
+    font = assets.Lazy("ui_font")
     color = (180, 180, 180)
 
     def on_pre_render(self, event, signal):
-        message = self.message
+        self.render(self.message)
+        camera = event.scene.main_camera
+        self.left = camera.left + self.left_offset
+        self.top = camera.top - self.top_offset
+
+    def render(self, message):
         if message != self.last_rendered:
-            self.image = ppb.Text(message, color=self.color, font=self.font)
+            self.image = text_cache.get(message, self.font, self.color)
             image = self.image.load().contents
             horizontal = image.w
             vertical = image.h
             self.height = self.preferred_height
             self.width = horizontal / vertical * self.height
             self.last_rendered = message
-        camera = event.scene.main_camera
-        self.left = camera.left + self.left_offset
-        self.top = camera.top - self.top_offset
 
     @property
     def message(self):
         return "No message provided."
 
 
-class WrathIndicator(TextIndicator):
+class Glyph(ppb.RectangleSprite):
+    image = None
+    # Laid out by its indicator every frame.
+    interpolate = False
+    indicator = None
+
+    def on_pre_render(self, event, signal):
+        # Nothing else removes the glyphs of an indicator that left the scene.
+        if self.indicator not in event.scene.children:
+            self.indicator.remove_glyphs(event.scene)
+
+
+class NumericIndicator(TextIndicator):
+    """
+    A fixed label followed by a number.
+
+    The label is rendered once. The number is laid out from a `GlyphAtlas`
+    as one `Glyph` sprite per character, so changing the value never
+    rasterizes text. The glyphs leave the scene with the indicator, or when
+    the scene stops.
+    """
+
+    label = ""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.glyph_sprites = []
+
+    @property
+    def value(self) -> int:
+        return 0
+
+    @property
+    def message(self):
+        return f"{self.label}{self.value}"
+
+    def on_pre_render(self, event, signal):
+        self.render(self.label)
+        camera = event.scene.main_camera
+        self.left = camera.left + self.left_offset
+        self.top = camera.top - self.top_offset
+        self.layout_glyphs(event.scene, str(self.value))
+
+    def layout_glyphs(self, scene: ppb.Scene, digits: str):
+        atlas = get_atlas(self.font, self.color)
+        glyph_sprites = self.glyph_sprites
+        while len(glyph_sprites) < len(digits):
+            glyph_sprites.append(scene.add(Glyph(layer=self.layer, indicator=self)))
+        while len(glyph_sprites) > len(digits):
+            scene.remove(glyph_sprites.pop())
+
+        left = self.right
+        height = self.height
+        for glyph, sprite in zip(digits, glyph_sprites):
+            sprite.image = atlas.glyphs[glyph]
+            sprite.height = height
+            sprite.width = atlas.aspect(glyph) * height
+            sprite.left = left
+            sprite.top = self.top
+            left += sprite.width
+
+    def remove_glyphs(self, scene: ppb.Scene):
+        while self.glyph_sprites:
+            scene.remove(self.glyph_sprites.pop())
+
+    def on_scene_stopped(self, event, signal):
+        self.remove_glyphs(event.scene)
+
+
+class WrathIndicator(NumericIndicator):
+    label = "Wrath: "
     wrath = 0
 
     def on_wrath_changed(self, event, signal):
-        wrath = event.wrath
+        self.wrath = event.wrath
 
     @property
-    def message(self):
-        return f"Wrath: {self.wrath}"
+    def value(self):
+        return self.wrath
 
 
-class WrathLevelIndicator(TextIndicator):
+class WrathLevelIndicator(NumericIndicator):
+    label = "Wrath Level: "
     wrath_level = 1
 
     def on_wrath_level_changed(self, event, signal):
         self.wrath_level = event.wrath_level
 
+    @property
+    def value(self):
+        return self.wrath_level
+
+
+class ProfilerOverlay(TextIndicator):
+    """
+    One line of a `profiler.Profiler` summary.
+
+    Rank 0 shows the frame time, the others the slowest handlers of that
+    frame. Only refreshes every `refresh_frames` so it isn't rendering new
+    text every frame.
+    """
+
+    profiler = None
+    rank = 0
+    refresh_frames = 30
+    preferred_height = 0.6
+    color = (120, 220, 120)
+    text = "Profiling..."
+    refreshed_frame = 0
+
+    @property
+    def top_offset(self):
+        return 5 + self.rank * 0.75
+
     @property
     def message(self):
-        return f"Wrath Level: {self.wrath_level}"
+        frame = self.profiler.frame
+        if frame - self.refreshed_frame >= self.refresh_frames:
+            self.refreshed_frame = frame
+            self.text = self.describe(self.profiler.frame_summary(frame - 1))
+        return self.text
+
+    def describe(self, summary: dict) -> str:
+        if not self.rank:
+            return f"Frame {summary['frame']}: {summary['seconds'] * 1000:.2f} ms"
+        try:
+            name, seconds = summary["handlers"][self.rank - 1]
+        except IndexError:
+            return " "
+        return f"{name}: {seconds * 1000:.2f} ms"
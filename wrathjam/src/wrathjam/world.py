@@ -0,0 +1,221 @@
+"""
+A world split into square chunks, streamed in and out of a scene.
+
+Only the chunks around a focus (usually the player) are live. Objects of a
+registered streamable kind that end up further away are saved to plain
+records, kept with the chunk they were in, and removed from the scene;
+when the focus comes back the records are spawned again. However big the
+world gets, the scene only holds what's near the focus, so per object
+costs like event dispatch stay bounded.
+
+Kinds opt in with `register`, giving a name plus functions to save an
+object to a record (a dict of plain values), spawn one from a record and
+despawn one. `systems.world.WorldSystem` moves the focus each Update.
+"""
+
+import math
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import ppb
+
+__all__ = ["ChunkedWorld", "Streamer", "get_world", "register", "track", "untrack"]
+
+Chunk = tuple[int, int]
+Record = dict
+
+
+class Streamer(NamedTuple):
+    """
+    How to take objects of one kind out of a scene and put them back.
+    """
+
+    name: str
+    kind: type
+    save: Callable[[object], Record]
+    spawn: Callable[[ppb.Scene, Record], object]
+    despawn: Callable[[ppb.Scene, object], None]
+
+
+streamers: dict[str, Streamer] = {}
+_streamers_by_kind: dict[type, Optional[Streamer]] = {}
+
+
+def register(
+    name: str,
+    kind: type,
+    save: Callable[[object], Record],
+    spawn: Callable[[ppb.Scene, Record], object],
+    despawn: Callable[[ppb.Scene, object], None],
+) -> Streamer:
+    streamer = streamers[name] = Streamer(name, kind, save, spawn, despawn)
+    _streamers_by_kind.clear()
+    return streamer
+
+
+def streamer_for(kind: type) -> Optional[Streamer]:
+    try:
+        return _streamers_by_kind[kind]
+    except KeyError:
+        found = _streamers_by_kind[kind] = next(
+            (
+                streamer
+                for streamer in streamers.values()
+                if issubclass(kind, streamer.kind)
+            ),
+            None,
+        )
+        return found
+
+
+class ChunkedWorld:
+    """
+    The stored contents of every chunk not near the focus.
+
+    Chunks within `load_radius` chunks of the focus's chunk are live. Live
+    objects are only saved once they're more than `unload_radius` chunks
+    away, so something on a chunk border doesn't flicker in and out.
+    Objects are checked when the focus changes chunk, and otherwise every
+    `check_interval` seconds of scene time to catch ones that wandered off.
+
+    `generate`, if given, is called with a chunk the first time it goes
+    live and returns the (streamer name, record) pairs it starts with.
+    """
+
+    def __init__(
+        self,
+        chunk_size: float = 25,
+        load_radius: int = 1,
+        unload_radius: int = 2,
+        check_interval: float = 0.5,
+        generate: Callable[[Chunk], list[tuple[str, Record]]] = None,
+    ):
+        self.chunk_size = chunk_size
+        self.load_radius = load_radius
+        self.unload_radius = max(unload_radius, load_radius)
+        self.check_interval = check_interval
+        self.generate = generate
+        self.stored: dict[Chunk, list[tuple[str, Record]]] = {}
+        self.generated: set[Chunk] = set()
+        self.live_chunks: set[Chunk] = set()
+        self.live: dict[object, Streamer] = {}
+        self.focus: Optional[Chunk] = None
+        self.next_check = -math.inf
+        self.chunks_loaded = 0
+        self.chunks_unloaded = 0
+        self.objects_saved = 0
+        self.objects_spawned = 0
+
+    def __len__(self):
+        """
+        Streamed objects, live and stored.
+        """
+        return len(self.live) + sum(len(records) for records in self.stored.values())
+
+    def chunk_of(self, position: ppb.Vector) -> Chunk:
+        return (
+            math.floor(position.x / self.chunk_size),
+            math.floor(position.y / self.chunk_size),
+        )
+
+    def around(self, chunk: Chunk, radius: int) -> Iterator[Chunk]:
+        x, y = chunk
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                yield x + dx, y + dy
+
+    def track(self, obj) -> bool:
+        """
+        Stream obj from now on, if its kind is registered.
+        """
+        streamer = streamer_for(type(obj))
+        if streamer is None:
+            return False
+        self.live[obj] = streamer
+        return True
+
+    def untrack(self, obj) -> None:
+        self.live.pop(obj, None)
+
+    def update(self, scene: ppb.Scene, focus: ppb.Vector, now: float) -> None:
+        """
+        Stream chunks in and out around focus.
+        """
+        chunk = self.chunk_of(focus)
+        if chunk == self.focus and now < self.next_check:
+            return
+        self.focus = chunk
+        self.next_check = now + self.check_interval
+        self.save_distant(scene, chunk)
+        wanted = set(self.around(chunk, self.load_radius))
+        for key in wanted - self.live_chunks:
+            self.load(scene, key)
+        self.live_chunks = wanted
+
+    def save_distant(self, scene: ppb.Scene, focus: Chunk) -> None:
+        fx, fy = focus
+        radius = self.unload_radius
+        size = self.chunk_size
+        floor = math.floor
+        unloaded = set()
+        for obj, streamer in list(self.live.items()):
+            position = obj.position
+            x = floor(position.x / size)
+            y = floor(position.y / size)
+            if abs(x - fx) <= radius and abs(y - fy) <= radius:
+                continue
+            self.stored.setdefault((x, y), []).append(
+                (streamer.name, streamer.save(obj))
+            )
+            del self.live[obj]
+            streamer.despawn(scene, obj)
+            self.objects_saved += 1
+            unloaded.add((x, y))
+        self.chunks_unloaded += len(unloaded)
+
+    def load(self, scene: ppb.Scene, chunk: Chunk) -> None:
+        records = self.stored.pop(chunk, [])
+        if chunk not in self.generated:
+            self.generated.add(chunk)
+            if self.generate is not None:
+                records.extend(self.generate(chunk))
+        if not records:
+            return
+        for name, record in records:
+            streamer = streamers[name]
+            self.live[streamer.spawn(scene, record)] = streamer
+        self.objects_spawned += len(records)
+        self.chunks_loaded += 1
+
+    def stats(self) -> dict:
+        return {
+            "live_objects": len(self.live),
+            "stored_objects": sum(len(records) for records in self.stored.values()),
+            "stored_chunks": len(self.stored),
+            "generated_chunks": len(self.generated),
+            "chunks_loaded": self.chunks_loaded,
+            "chunks_unloaded": self.chunks_unloaded,
+            "objects_saved": self.objects_saved,
+            "objects_spawned": self.objects_spawned,
+        }
+
+
+def get_world(scene: ppb.Scene) -> Optional[ChunkedWorld]:
+    """
+    The scene's world, if it's streamed.
+    """
+    return getattr(scene, "world", None)
+
+
+def track(scene: ppb.Scene, obj) -> None:
+    """
+    Hand a freshly spawned object to the scene's world, if it has one.
+    """
+    chunked_world = get_world(scene)
+    if chunked_world is not None:
+        chunked_world.track(obj)
+
+
+def untrack(scene: ppb.Scene, obj) -> None:
+    chunked_world = get_world(scene)
+    if chunked_world is not None:
+        chunked_world.untrack(obj)